@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Run from a checkout, without installing the package
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pylogger import Logger, Config
+
+
+
+"""
+Benchmark of many threads logging at once
+----------------
+Compares the throughput of the default mode, where each record is written under the lock of each sink,
+against the thread buffers mode, where each thread buffers its records and a combiner writes them together,
+and against the async mode, with the terminal (redirected to os.devnull) and a log file as sinks
+Run with: python benchmarks/bench_contention.py --threads 64
+"""
+
+
+
+RECORDS = 100_000
+REPEAT = 3
+
+
+
+def run(threads: int, records: int) -> float:
+    """
+    Logs the records from multiple threads started together, and waits until they have been written
+
+    Returns:
+        float - the records per second
+    """
+    barrier = threading.Barrier(threads + 1)
+    per_thread = records // threads
+
+    def worker() -> None:
+        barrier.wait()
+        for index in range(per_thread):
+            Logger.info("request %d served in %d ms", index, 7)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    Logger.flush()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark of many threads logging at once")
+    parser.add_argument("--threads", type=int, default=16, help="amount of logging threads")
+    parser.add_argument("--records", type=int, default=RECORDS, help="records logged per measurement, by all the threads")
+    args = parser.parse_args()
+
+    modes = {
+        "locking (default)": lambda: None,
+        "thread buffers": lambda: Config.set_thread_buffers(),
+        "async": lambda: Config.set_async(),
+    }
+
+    results = {}
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        for name, enable in modes.items():
+            Config.set_log_file(Path(directory) / f"{len(results)}.log")
+            enable()
+
+            sys.stdout = devnull
+            try:
+                results[name] = max(run(args.threads, args.records) for _ in range(REPEAT))
+            finally:
+                Config.set_thread_buffers(False)
+                Config.set_async(False)
+                Logger.shutdown()
+                sys.stdout = stdout
+
+    print(f"{args.threads} threads, terminal + file")
+    for name, result in results.items():
+        print(f"{name:<20}{result:>12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import inspect
+import sys
+import timeit
+from pathlib import Path
+
+# Run from a checkout, without installing the package
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pylogger.config import Config
+from pylogger.format import Formatting, THIS_MODULE_NAME
+
+
+
+"""
+Benchmark of the caller location resolution (Formatting.locate_caller)
+----------------
+Compares the previous implementation (stat and relative path on every call)
+with the cached one, called directly and through Formatting.raw_format
+Run with: python benchmarks/bench_file_info.py
+"""
+
+
+
+NUMBER = 20_000
+REPEAT = 5
+
+
+
+def legacy_locate_caller(cls) -> tuple[str, int]:
+    "Previous implementation, kept for comparison"
+    try:
+        # Start from the caller, this function does not live in the module directory
+        frame = inspect.currentframe().f_back
+
+        while Path(frame.f_code.co_filename).parent.name == THIS_MODULE_NAME:
+            frame = frame.f_back
+
+        file_path = frame.f_code.co_filename
+
+        if file_path == '<stdin>' or not Path(file_path).exists():
+            return str(file_path), frame.f_lineno
+
+        try:
+            rel_file_path = Path(file_path).relative_to(Config.ROOT_PATH)
+            f_file_path = '/'.join(rel_file_path.parts)
+        except ValueError:
+            f_file_path = str(Path(file_path))
+
+        return f_file_path, frame.f_lineno
+    finally:
+        del frame
+
+
+def per_call_ns(statement) -> float:
+    "Best per call time over the repeats, in nanoseconds"
+    return min(timeit.repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def measure() -> dict[str, float]:
+    return {
+        "locate_caller": per_call_ns(Formatting.locate_caller),
+        "raw_format": per_call_ns(lambda: Formatting.raw_format("message", level=Config.MIN_LEVEL)),
+    }
+
+
+def main() -> None:
+    cached = measure()
+
+    # Swap in the previous implementation
+    current = Formatting.__dict__["locate_caller"]
+    Formatting.locate_caller = classmethod(legacy_locate_caller)
+    try:
+        legacy = measure()
+    finally:
+        Formatting.locate_caller = current
+
+    print(f"{'call':<20}{'before (ns)':>14}{'after (ns)':>14}{'speedup':>10}")
+    for name in cached:
+        print(f"{name:<20}{legacy[name]:>14.0f}{cached[name]:>14.0f}{legacy[name] / cached[name]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+# Run from a checkout, without installing the package
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pylogger import Logger, Config, Levels
+
+
+
+"""
+Benchmark of the flight recorder
+----------------
+Compares the per call cost of a DEBUG record below the level threshold, with and without the flight recorder,
+against a DEBUG record fully formatted and written to the terminal (redirected to os.devnull) and a log file
+Run with: python benchmarks/bench_flight_recorder.py
+"""
+
+
+
+NUMBER = 100_000
+REPEAT = 5
+
+
+
+def per_call_ns(statement) -> float:
+    "Best per call time over the repeats, in nanoseconds"
+    return min(timeit.repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def debug_call() -> None:
+    Logger.debug("request %d served in %d ms", 42, 7)
+
+
+def main() -> None:
+    results = {}
+
+    # Below the threshold, dropped
+    Config.set_level(Levels.WARNING)
+    results["below threshold"] = per_call_ns(debug_call)
+
+    # Below the threshold, captured by the flight recorder
+    Config.set_flight_recorder(capacity=4096, trigger=None)
+    results["below threshold, flight recorder"] = per_call_ns(debug_call)
+    Config.set_flight_recorder(None)
+
+    # Fully formatted and written
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        Config.set_level(Levels.DEBUG)
+        Config.set_log_file(Path(directory) / "bench.log")
+
+        sys.stdout = devnull
+        try:
+            results["formatted write (terminal + file)"] = per_call_ns(debug_call)
+        finally:
+            sys.stdout = stdout
+            Logger.shutdown()
+
+    for name, result in results.items():
+        print(f"{name:<36}{result:>10.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Optional
+
+# Run from a checkout, without installing the package
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pylogger import Logger, Config, Levels
+from pylogger.colors import Colors, ColorCombo
+from pylogger.levels import LevelModel
+
+
+
+"""
+Benchmark of the level and color models
+----------------
+Measures the 'import pylogger' time of a fresh interpreter,
+and the per call cost of the level comparisons and color rendering
+Compared with the previous pydantic models (kept below), when pydantic is installed:
+the import time of the package with them, and their per call cost
+Run with: python benchmarks/bench_models.py
+"""
+
+
+
+NUMBER = 100_000
+REPEAT = 5
+IMPORT_RUNS = 10
+
+# Previous implementation, kept for comparison: the pydantic models and the default colors and levels they were built with
+LEGACY_MODELS = """
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ColorModel(BaseModel):
+    r: int = Field(default=255, ge=0, le=255)
+    g: int = Field(default=255, ge=0, le=255)
+    b: int = Field(default=255, ge=0, le=255)
+
+
+class ColorCombo(BaseModel):
+    fg: Optional[ColorModel] = None
+    bg: Optional[ColorModel] = None
+
+    def colorize(self, text: str) -> str:
+        result = ""
+        if self.bg is not None:
+            text = f" {text} "
+            result += f"\\033[48;2;{self.bg.r};{self.bg.g};{self.bg.b}m"
+        if self.fg is not None:
+            result += f"\\033[38;2;{self.fg.r};{self.fg.g};{self.fg.b}m"
+        result += f"{text}\\033[0m"
+        return result
+
+
+class LevelModel(BaseModel):
+    name: str
+    color: ColorCombo
+    value: int
+
+    def __lt__(self, other: 'LevelModel') -> bool:
+        if isinstance(other, LevelModel):
+            return self.value < other.value
+        return NotImplemented
+
+
+red = ColorModel(r=255, g=0, b=0)
+white = ColorModel(r=255, g=255, b=255)
+DEBUG = LevelModel(name="DEBUG", color=ColorCombo(fg=white), value=0)
+INFO = LevelModel(name="INFO", color=ColorCombo(fg=red), value=1)
+"""
+
+
+
+def interpreter_ms(code: str) -> float:
+    "Best wall time of a fresh interpreter running the code, in milliseconds"
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), environment.get("PYTHONPATH")]))
+
+    best = float("inf")
+    for _ in range(IMPORT_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=environment, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def per_call_ns(statement) -> float:
+    "Best per call time over the repeats, in nanoseconds"
+    return min(timeit.repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def legacy_calls() -> Optional[dict[str, Callable[[], object]]]:
+    "Calls of the previous pydantic models, None if pydantic is not installed"
+    try:
+        import pydantic
+    except ImportError:
+        return None
+
+    models: dict = {}
+    exec(LEGACY_MODELS, models)
+    combo = models["ColorCombo"](fg=models["red"], bg=models["white"])
+    debug, info = models["DEBUG"], models["INFO"]
+    return {
+        "level comparison": lambda: debug < info,
+        "ColorCombo.colorize": lambda: combo.colorize("message"),
+        "ColorCombo construction": lambda: models["ColorCombo"](fg=models["red"]),
+        "LevelModel construction": lambda: models["LevelModel"](name="CUSTOM", color=combo, value=5),
+    }
+
+
+def main() -> None:
+    legacy = legacy_calls()
+    baseline_ms = interpreter_ms("pass")
+
+    print(f"{'call':<36}{'before':>12}{'after':>12}{'speedup':>10}")
+
+    import_ms = interpreter_ms("import pylogger") - baseline_ms
+    if legacy is None:
+        print(f"{'import pylogger (ms)':<36}{'-':>12}{import_ms:>12.1f}")
+    else:
+        # The package with the previous models instead
+        legacy_ms = interpreter_ms("import pylogger\n" + LEGACY_MODELS) - baseline_ms
+        print(f"{'import pylogger (ms)':<36}{legacy_ms:>12.1f}{import_ms:>12.1f}{legacy_ms / import_ms:>9.1f}x")
+
+    # Only the threshold check runs
+    Config.set_level(Levels.WARNING)
+    combo = ColorCombo(fg=Colors.red, bg=Colors.white)
+
+    calls = {
+        "level comparison": lambda: Levels.DEBUG < Levels.INFO,
+        "Logger.debug (below threshold)": lambda: Logger.debug("message"),
+        "ColorCombo.colorize": lambda: combo.colorize("message"),
+        "ColorCombo construction": lambda: ColorCombo(fg=Colors.red),
+        "LevelModel construction": lambda: LevelModel(name="CUSTOM", color=combo, value=5),
+    }
+    for name, statement in calls.items():
+        after = per_call_ns(statement)
+        if legacy is None or name not in legacy:
+            print(f"{name + ' (ns)':<36}{'-':>12}{after:>12.0f}")
+            continue
+
+        before = per_call_ns(legacy[name])
+        print(f"{name + ' (ns)':<36}{before:>12.0f}{after:>12.0f}{before / after:>9.1f}x")
+
+    if legacy is None:
+        print("Install pydantic to compare with the previous models")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+
+
+"""
+Benchmark suite of the logging hot path
+----------------
+Runs each scenario in a fresh interpreter, with the terminal output redirected to os.devnull (or a pipe),
+and measures the records per second and the per call latency percentiles
+The results are written as JSON, compare them between versions to track regressions
+Run with:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --output new.json --compare results.json
+"""
+
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Messages logged per measurement, and measurements per scenario
+DEFAULT_RECORDS = 20_000
+DEFAULT_REPEAT = 5
+WARMUP = 1_000
+
+THREADS = 4
+STACK_DEPTH = 50
+
+PERCENTILES = {"p50": 50, "p90": 90, "p99": 99, "p99.9": 99.9}
+
+
+
+"Scenarios, run in the child process"
+
+def setup_below_threshold(directory: Path) -> Callable[[], None]:
+    from pylogger import Logger, Config, Levels
+
+    Config.set_level(Levels.WARNING)
+    return lambda: Logger.debug("request %d served in %d ms", 42, 7)
+
+
+def setup_stdout(directory: Path) -> Callable[[], None]:
+    from pylogger import Logger
+
+    return lambda: Logger.info("request %d served in %d ms", 42, 7)
+
+
+def setup_stdout_file(directory: Path) -> Callable[[], None]:
+    from pylogger import Logger, Config
+
+    Config.set_log_file(directory / "bench.log")
+    return lambda: Logger.info("request %d served in %d ms", 42, 7)
+
+
+def setup_prefix_file(directory: Path) -> Callable[[], None]:
+    from pylogger import PrefixLogger
+
+    logger = PrefixLogger("worker-1", log_file=directory / "prefix.log")
+    return lambda: logger.info("request %d served in %d ms", 42, 7)
+
+
+def setup_thread_buffers(directory: Path) -> Callable[[], None]:
+    from pylogger import Logger, Config
+
+    Config.set_log_file(directory / "bench.log")
+    Config.set_thread_buffers()
+    return lambda: Logger.info("request %d served in %d ms", 42, 7)
+
+
+def setup_deep_stack(directory: Path) -> Callable[[], None]:
+    from pylogger import Logger
+
+    def nested(depth: int) -> None:
+        if depth:
+            nested(depth - 1)
+        else:
+            Logger.info("request %d served in %d ms", 42, 7)
+
+    return lambda: nested(STACK_DEPTH)
+
+
+# Name: setup, amount of threads
+SCENARIOS: dict[str, tuple[Callable[[Path], Callable[[], None]], int]] = {
+    "below_threshold": (setup_below_threshold, 1),
+    "stdout": (setup_stdout, 1),
+    "stdout_file": (setup_stdout_file, 1),
+    "prefix_file": (setup_prefix_file, 1),
+    "threaded_contention": (setup_stdout, THREADS),
+    "thread_buffers": (setup_thread_buffers, THREADS),
+    "deep_stack": (setup_deep_stack, 1),
+}
+
+
+
+"Measurements"
+
+def timer_overhead_ns(samples: int = 10_000) -> int:
+    "Median cost of timing an empty call, subtracted from the latencies"
+    noop = lambda: None
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        noop()
+        latencies.append(time.perf_counter_ns() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2]
+
+
+def timed_calls(call: Callable[[], None], count: int, latencies: list[int]) -> None:
+    "Calls the function, appending the latency of each call"
+    clock = time.perf_counter_ns
+    append = latencies.append
+    for _ in range(count):
+        start = clock()
+        call()
+        append(clock() - start)
+
+
+def untimed_calls(call: Callable[[], None], count: int) -> None:
+    for _ in range(count):
+        call()
+
+
+def run_threads(target: Callable, count: int, threads: int, *args) -> float:
+    """
+    Runs the target on multiple threads, started together
+
+    Returns:
+        float - the wall time, in seconds
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(*worker_args) -> None:
+        barrier.wait()
+        target(*worker_args)
+
+    workers = [threading.Thread(target=worker, args=(count // threads, *args[index:index + 1])) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def measure(call: Callable[[], None], records: int, repeat: int, threads: int) -> dict:
+    """
+    Measures the throughput with untimed calls, then the latencies with timed calls
+
+    Returns:
+        dict - the results of the scenario
+    """
+    untimed_calls(call, WARMUP)
+    overhead = timer_overhead_ns()
+
+    throughputs = []
+    latencies: list[int] = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            if threads == 1:
+                start = time.perf_counter()
+                untimed_calls(call, records)
+                elapsed = time.perf_counter() - start
+            else:
+                elapsed = run_threads(lambda count: untimed_calls(call, count), records, threads)
+            throughputs.append(records / elapsed)
+
+            if threads == 1:
+                timed_calls(call, records, latencies)
+            else:
+                per_thread = [[] for _ in range(threads)]
+                run_threads(lambda count, thread_latencies: timed_calls(call, count, thread_latencies), records, threads, *per_thread)
+                for thread_latencies in per_thread:
+                    latencies += thread_latencies
+        finally:
+            gc.enable()
+
+    latencies = sorted(max(latency - overhead, 0) for latency in latencies)
+    throughputs.sort()
+
+    return {
+        "threads": threads,
+        "records": records,
+        "repeat": repeat,
+        "records_per_second": throughputs[len(throughputs) // 2],
+        "records_per_second_best": throughputs[-1],
+        "latency_ns": {
+            **{name: latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)] for name, percentile in PERCENTILES.items()},
+            "max": latencies[-1],
+        },
+        "timer_overhead_ns": overhead,
+    }
+
+
+def run_scenario(name: str, records: int, repeat: int, output: str) -> dict:
+    """
+    Runs a scenario in the current process, with the terminal output redirected
+
+    Returns:
+        dict - the results of the scenario
+    """
+    setup, threads = SCENARIOS[name]
+
+    # The terminal would measure its own speed
+    if output == "pipe":
+        read_fd, write_fd = os.pipe()
+        reader = threading.Thread(target=lambda: [None for _ in iter(lambda: os.read(read_fd, 1 << 16), b"")], daemon=True)
+        reader.start()
+        sink = os.fdopen(write_fd, 'w')
+    else:
+        sink = open(os.devnull, 'w')
+
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as directory:
+        sys.stdout = sink
+        try:
+            call = setup(Path(directory))
+            result = measure(call, records, repeat, threads)
+        finally:
+            from pylogger import Logger
+
+            Logger.shutdown()
+            sys.stdout = stdout
+            sink.close()
+
+    return result
+
+
+
+"Runner, in the parent process"
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_child(name: str, args: argparse.Namespace) -> dict:
+    "Runs a scenario in a fresh interpreter, so that the scenarios don't affect each other"
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), environment.get("PYTHONPATH")]))
+
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", name, "--records", str(args.records), "--repeat", str(args.repeat), "--stdout", args.stdout],
+        env=environment, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def compare(results: dict, baseline: dict) -> None:
+    "Prints the change of each scenario against a baseline"
+    print()
+    print(f"Against {baseline['meta'].get('commit')} ({baseline['meta'].get('time')})")
+    for name, result in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+
+        throughput = result["records_per_second"] / previous["records_per_second"] - 1
+        p99 = result["latency_ns"]["p99"] / max(previous["latency_ns"]["p99"], 1) - 1
+        print(f"{name:<22}{throughput:>+12.1%} records/s{p99:>+14.1%} p99")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark suite of the logging hot path")
+    parser.add_argument("--output", help="path of the JSON results")
+    parser.add_argument("--compare", help="path of previous JSON results to compare with")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="scenario to run, all by default")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS, help="messages logged per measurement")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="measurements per scenario")
+    parser.add_argument("--stdout", choices=["devnull", "pipe"], default="devnull", help="where the terminal output goes")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.records, args.repeat, args.stdout)))
+        return
+
+    results = {"meta": {**metadata(), "stdout": args.stdout}, "scenarios": {}}
+    for name in args.scenario or SCENARIOS:
+        result = results["scenarios"][name] = run_child(name, args)
+        latency = result["latency_ns"]
+        print(f"{name:<22}{result['records_per_second']:>12,.0f} records/s"
+              f"{latency['p50']:>14,} ns p50{latency['p99']:>14,} ns p99{latency['p99.9']:>14,} ns p99.9")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=4))
+
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
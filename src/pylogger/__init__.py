@@ -1,3 +1,15 @@
 from .logger import Logger, PrefixLogger
 from .config import Config
-from .levels import Levels
\ No newline at end of file
+from .levels import Levels
+from .colors import ColorModes
+from .encoders import FileFormats
+from .reader import read
+
+
+def __getattr__(name: str):
+    # Only needed once the standard logging is bridged, slow to import
+    if name == "StdlibHandler":
+        from .bridge import StdlibHandler
+
+        return StdlibHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,64 @@
+import argparse
+import sys
+from datetime import datetime
+from typing import Optional
+
+
+
+"""
+Command line tools
+----------------
+query: prints the records of a log file in the text format matching a time range, a minimum level and/or source paths,
+using a sidecar index updated incrementally
+Run with: python -m pylogger query <file> [--since TIME] [--until TIME] [--level LEVEL] [--path PATTERN] [--count]
+"""
+
+
+
+def parse_time(text: str) -> datetime:
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time {text!r}, expected for example '2025-03-09 15:53' or '2025-03-09T15:53:16'")
+
+
+def run_query(args: argparse.Namespace) -> int:
+    from .query import query
+
+    count = 0
+    output = sys.stdout.buffer
+    try:
+        for record in query(args.file, since=args.since, until=args.until, level=args.level, paths=args.path, rebuild=args.reindex):
+            count += 1
+            if not args.count:
+                output.write(record)
+    except (OSError, ValueError) as error:
+        print(f"pylogger query: {error}", file=sys.stderr)
+        return 1
+
+    if args.count:
+        print(count)
+    output.flush()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pylogger", description="pylogger command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = commands.add_parser("query", help="print the matching records of a log file, using its index")
+    query_parser.add_argument("file", help="path of the log file, in the text format")
+    query_parser.add_argument("--since", type=parse_time, help="records logged from this time")
+    query_parser.add_argument("--until", type=parse_time, help="records logged up to this time, included")
+    query_parser.add_argument("--level", help="records of this level or higher")
+    query_parser.add_argument("--path", action="append", help="records logged from this source path, glob patterns allowed, repeatable")
+    query_parser.add_argument("--count", action="store_true", help="only print the amount of matching records")
+    query_parser.add_argument("--reindex", action="store_true", help="build the index again from scratch")
+    query_parser.set_defaults(handler=run_query)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import asyncio
+import concurrent.futures
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .logger import Logger, PrefixLogger
+from .record import LogRecord
+from .sinks import Sink
+
+
+
+"""
+Logging classes for asyncio
+----------------
+AsyncLogger: same API as Logger, without ever blocking the event loop
+AsyncPrefixLogger: same API as PrefixLogger, without ever blocking the event loop
+The records are captured at the call site, then written by a writer task of the running loop,
+through a thread of its own so that the terminal and the files are never written on the loop
+Outside of a running loop, they behave like the regular loggers
+"""
+
+
+
+class LoopWriter:
+    # Maximum amount of items written at once
+    BATCH_SIZE: int = 1024
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Parameters:
+            loop (asyncio.AbstractEventLoop): the running loop owning the writer
+        """
+        self.loop = loop
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # A single thread, so that the batches are written in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pylogger-async")
+        self._task = loop.create_task(self._run(), name="pylogger-async-writer")
+
+        # Batch being written by the thread, with its future
+        self._batch: list = []
+        self._future: Optional[concurrent.futures.Future] = None
+
+    def put(self, item: tuple[LogRecord, tuple[Sink, ...]] | list[tuple[LogRecord, tuple[Sink, ...]]]) -> None:
+        """
+        Enqueues a record or a batch of records, without blocking
+
+        Parameters:
+            item (tuple | list): the record with its sinks, or a batch of them
+        """
+        self._queue.put_nowait(item)
+
+    async def flush(self) -> None:
+        """
+        Waits until every enqueued record has been written
+        """
+        await self._queue.join()
+
+    def write_pending(self) -> None:
+        """
+        Writes the enqueued records right away, blocking the loop, after the batch being written
+        """
+        self._wait_current()
+        self._write_remaining()
+
+    async def run(self, function: Callable[[], None]) -> None:
+        """
+        Runs a blocking function on the writer's thread, after the records being written
+
+        Parameters:
+            function (Callable[[], None]): the function to run
+        """
+        await asyncio.wrap_future(self._executor.submit(function))
+
+    async def close(self) -> None:
+        """
+        Writes the enqueued records, and stops the writer task
+        """
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def _drain(self) -> list:
+        "Gets the items already waiting in the queue"
+        items = []
+        try:
+            while len(items) < self.BATCH_SIZE:
+                items.append(self._queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        return items
+
+    def _wait_current(self) -> None:
+        "Waits for the batch being written by the thread, and writes it here if it was cancelled before running"
+        future = self._future
+        if future is None:
+            return
+
+        self._future = None
+        try:
+            future.result()
+        # Not 'asyncio.CancelledError', cancelled along with the writer task before the thread ran it
+        except concurrent.futures.CancelledError:
+            Logger._write_queued(self._batch)
+
+    def _write_remaining(self) -> None:
+        "Writes the records still enqueued, on the current thread"
+        items = self._drain()
+        while items:
+            Logger._write_queued(items)
+            for _ in items:
+                self._queue.task_done()
+            items = self._drain()
+
+    async def _run(self) -> None:
+        """
+        Writer task loop
+        Waits for a record, then writes everything else already waiting as the same batch
+        When cancelled (the loop is closing), writes the remaining records before stopping
+        """
+        try:
+            while True:
+                items = [await self._queue.get()]
+                items += self._drain()
+
+                self._batch = items
+                self._future = future = self._executor.submit(Logger._write_queued, items)
+                try:
+                    await asyncio.wrap_future(future)
+                    # Waited for by 'write_pending' meanwhile otherwise
+                    if self._future is future:
+                        self._future = None
+                finally:
+                    for _ in items:
+                        self._queue.task_done()
+
+        except asyncio.CancelledError:
+            # Let the batch being written finish first, to keep the order
+            self._wait_current()
+            self._write_remaining()
+            raise
+
+        finally:
+            self._executor.shutdown(wait=True)
+            _writers.pop(self.loop, None)
+
+
+
+# Writer of each running loop
+_writers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopWriter]' = weakref.WeakKeyDictionary()
+
+
+def get_loop_writer() -> Optional[LoopWriter]:
+    """
+    Returns the writer of the running loop, starting it if needed
+
+    Returns:
+        Optional[LoopWriter] - the writer, None outside of a running loop
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    writer = _writers.get(loop)
+    if writer is None:
+        # The loop is closing, the records get written right away
+        if loop.is_closed():
+            return None
+        writer = _writers[loop] = LoopWriter(loop)
+    return writer
+
+
+
+"Direct logging class, for asyncio"
+class AsyncLogger(Logger):
+
+    """
+    Same API as Logger, the logging calls only enqueue the records for the writer task of the running loop
+    Use 'await AsyncLogger.aflush()' to wait until they have been written, 'flush' writes them right away, blocking the loop
+    """
+
+    @classmethod
+    def _dispatch(cls, record: LogRecord, sinks: tuple[Sink, ...]) -> None:
+        writer = get_loop_writer()
+
+        # Outside of a loop, in a batch, or in a worker process: the regular path doesn't block
+        if writer is None or cls._batch.records is not None or cls._process_queue is not None:
+            super()._dispatch(record, sinks)
+            return
+
+        # Build the message now, the arguments could be modified by the caller afterwards
+        # The traceback is rendered by the thread of the writer, not on the loop
+        record.freeze()
+        writer.put((record, sinks))
+
+    @classmethod
+    def _dispatch_many(cls, records: list[tuple[LogRecord, tuple[Sink, ...]]]) -> None:
+        writer = get_loop_writer()
+        if writer is None or cls._process_queue is not None:
+            super()._dispatch_many(records)
+            return
+
+        for record, _ in records:
+            record.freeze()
+        writer.put(records)
+
+    @classmethod
+    def bind(cls, **fields: Any) -> 'AsyncPrefixLogger':
+        """
+        Returns an async logger adding the given fields to its records, see 'Logger.bind'
+
+        Parameters:
+            **fields (Any): the fields to add
+
+        Returns:
+            AsyncPrefixLogger - the logger, without prefix
+        """
+        return AsyncPrefixLogger(prefix=None, fields=fields)
+
+    @classmethod
+    def flush(cls) -> None:
+        """
+        Blocks until every record logged so far has been written, the ones enqueued for the writer task are written right away
+        Prefer 'await AsyncLogger.aflush()' on the loop
+        """
+        writer = _writers.get(cls._running_loop())
+        if writer is not None:
+            writer.write_pending()
+        Logger.flush()
+
+    @classmethod
+    async def aflush(cls) -> None:
+        """
+        Waits until every record logged so far has been written, without blocking the loop
+        """
+        writer = get_loop_writer()
+        if writer is None:
+            Logger.flush()
+            return
+
+        await writer.flush()
+        await writer.run(Logger.flush)
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """
+        Writes the pending records and stops the writer task of the running loop
+        Done automatically when the loop gets closed by 'asyncio.run'
+        """
+        writer = _writers.get(asyncio.get_running_loop())
+        if writer is not None:
+            await writer.close()
+
+
+
+"Instance logging with prefix, for asyncio"
+class AsyncPrefixLogger(PrefixLogger, AsyncLogger):
+
+    """
+    Same API as PrefixLogger, the logging calls only enqueue the records for the writer task of the running loop
+    """
@@ -0,0 +1,139 @@
+import logging
+from typing import Callable, Optional
+
+from .config import Config
+from .context import get_fields
+from .format import Formatting
+from .levels import LevelModel, Levels
+from .logger import Logger
+from .record import LogRecord
+
+
+
+"""
+Bridge from the standard 'logging' module
+----------------
+StdlibHandler: a 'logging.Handler' writing the records of the standard loggers through the pylogger sinks
+The time, file and line of a record are taken from the standard record, the caller is neither located nor the clock read again
+Install it as the root handler with 'StdlibHandler.install()'
+"""
+
+
+
+# Standard levels and the matching levels, the highest first, the records below 'INFO' are in debug mode
+STDLIB_LEVELS: tuple[tuple[int, LevelModel], ...] = (
+    (logging.CRITICAL, Levels.FATAL),
+    (logging.ERROR, Levels.ERROR),
+    (logging.WARNING, Levels.WARNING),
+    (logging.INFO, Levels.INFO)
+)
+
+
+
+class StdlibHandler(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET, logger: type[Logger] = Logger, prefix_names: bool = True) -> None:
+        """
+        Parameters:
+            level (int): the minimum standard level of the handler, the minimum level of the config applies on top of it
+            logger (type[Logger]): the logging class writing the records, 'AsyncLogger' to never block the running loop
+            prefix_names (bool): whether to use the name of the standard logger as prefix, except for the root logger
+        """
+        super().__init__(level)
+        self.logger = logger
+        self.prefix_names = prefix_names
+
+        # Level per standard level number
+        self._levels: dict[int, LevelModel] = {}
+
+    @classmethod
+    def install(cls, level: Optional[int] = None, logger: type[Logger] = Logger, prefix_names: bool = True) -> 'StdlibHandler':
+        """
+        Replaces the handlers of the root logger by a new handler, so that every standard logger writes through pylogger
+        The replaced handlers are closed, like with 'logging.basicConfig(force=True)'
+
+        Parameters:
+            level (Optional[int]): the standard level to set on the root logger, defaults to the one matching the minimum level of the config
+            logger (type[Logger]): the logging class writing the records
+            prefix_names (bool): whether to use the name of the standard logger as prefix
+
+        Returns:
+            StdlibHandler - the installed handler
+        """
+        root = logging.getLogger()
+        handler = cls(logger=logger, prefix_names=prefix_names)
+
+        for previous in root.handlers[:]:
+            root.removeHandler(previous)
+            previous.close()
+
+        root.addHandler(handler)
+        root.setLevel(cls.to_stdlib_level(Config.MIN_LEVEL) if level is None else level)
+        return handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = self._levels.get(record.levelno)
+            if level is None:
+                level = self._levels[record.levelno] = self.to_level(record.levelno)
+
+            # Skip building the record
+            if level.value < Config.MIN_LEVEL.value:
+                return
+
+            message: Callable[[], str] = record.getMessage
+            if record.stack_info:
+                message = lambda: f"{record.getMessage()}\n{record.stack_info}"
+
+            self.logger.log_record(LogRecord(
+                message=message,
+                level=level,
+                prefix=record.name if self.prefix_names and record.name != "root" else None,
+                time=record.created,
+                path=Formatting.format_code_file(record.pathname),
+                lineno=record.lineno,
+                exception=record.exc_info[1] if record.exc_info else None,
+                fields=get_fields()
+            ))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        # Not the one of the async loggers, which needs to be awaited
+        Logger.flush()
+
+    @staticmethod
+    def to_level(levelno: int) -> LevelModel:
+        """
+        Returns the level matching a standard level
+
+        Parameters:
+            levelno (int): the standard level number, custom ones included
+
+        Returns:
+            LevelModel - the highest default level whose standard level is lower or equal
+        """
+        for stdlib_level, level in STDLIB_LEVELS:
+            if levelno >= stdlib_level:
+                return level
+        return Levels.DEBUG
+
+    @staticmethod
+    def to_stdlib_level(level: LevelModel) -> int:
+        """
+        Returns the standard level matching a level
+
+        Parameters:
+            level (LevelModel): the level
+
+        Returns:
+            int - the lowest standard level mapped to a level at least as high, 'logging.NOTSET' if there is none
+        """
+        if level.value <= Levels.DEBUG.value:
+            return logging.NOTSET
+
+        for stdlib_level, mapped in reversed(STDLIB_LEVELS):
+            if mapped.value >= level.value:
+                return stdlib_level
+        return logging.NOTSET
@@ -0,0 +1,157 @@
+import heapq
+import sys
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+from .levels import LevelModel, Levels
+from .record import LogRecord
+
+
+
+"""
+Per thread buffers
+----------------
+Used by the logger in thread buffers mode: each thread renders its records and appends them to a buffer of its own,
+without taking any shared lock, and a combiner merges the buffers of every thread in timestamp order and writes them at once
+The buffers are combined when one of them is full, when a record of the flush level is logged, and periodically
+"""
+
+
+
+class _ThreadBuffer:
+    "Records of a single thread, with their sinks"
+    __slots__ = ("records", "lock", "thread")
+
+    def __init__(self) -> None:
+        self.records: list[tuple[LogRecord, tuple[Any, ...]]] = []
+        # Only shared with the combiner, never contended by the other threads
+        self.lock = threading.Lock()
+        self.thread = threading.current_thread()
+
+
+
+class ThreadBuffers:
+    def __init__(
+        self,
+        handler: Callable[[list[tuple[LogRecord, tuple[Any, ...]]]], None],
+        size: int = 256,
+        interval: Optional[float] = 0.1,
+        flush_level: Optional[LevelModel] = Levels.ERROR
+    ) -> None:
+        """
+        Parameters:
+            handler (Callable[[list[tuple[LogRecord, tuple[Sink, ...]]]], None): the function writing the combined records
+            size (int): the amount of records of a thread buffer combining them all
+            interval (Optional[float]): combine the buffers at least every this many seconds, None to only do it on the other conditions
+            flush_level (Optional[LevelModel]): combine the buffers right away when a record of this level or higher is logged
+        """
+        if size < 1:
+            raise ValueError("The size of the thread buffers must be at least 1")
+
+        self.handler = handler
+        self.size = size
+        self.interval = interval
+        self.flush_level = flush_level
+
+        self._local = threading.local()
+        self._buffers: list[_ThreadBuffer] = []
+        self._buffers_lock = threading.Lock()
+
+        # A single combiner at a time, so that the combined records are written in order
+        # Reentrant, a sink could log while writing
+        self._combine_lock = threading.RLock()
+
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if interval is not None:
+            self._thread = threading.Thread(target=self._run, name="pylogger-combiner", daemon=True)
+            self._thread.start()
+
+    def put(self, record: LogRecord, sinks: tuple[Any, ...]) -> None:
+        """
+        Renders the record for its sinks, and appends it to the buffer of the current thread
+
+        Parameters:
+            record (LogRecord): the record to write
+            sinks (tuple[Sink, ...]): the sinks to write it to
+        """
+        for sink in sinks:
+            sink.prepare(record)
+
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _ThreadBuffer()
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+
+        with buffer.lock:
+            records = buffer.records
+            records.append((record, sinks))
+            full = len(records) >= self.size
+
+        flush_level = self.flush_level
+        if full or (flush_level is not None and record.level.value >= flush_level.value):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Combines the buffers of every thread in timestamp order, and writes them
+        """
+        with self._combine_lock:
+            batches = []
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+
+            for buffer in buffers:
+                with buffer.lock:
+                    records, buffer.records = buffer.records, []
+
+                if records:
+                    batches.append(records)
+                # The thread ended, nothing else will be appended to its buffer
+                elif not buffer.thread.is_alive():
+                    with self._buffers_lock:
+                        self._buffers.remove(buffer)
+
+            if not batches:
+                return
+
+            # Each buffer is already in order
+            combined = batches[0] if len(batches) == 1 else list(heapq.merge(*batches, key=lambda item: item[0].time))
+            self.handler(combined)
+
+    def stop(self) -> None:
+        """
+        Writes the buffered records, and stops the periodic combiner
+        """
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def reset_after_fork(self) -> None:
+        """
+        Forgets the buffers in a forked process, they belong to the parent process which writes them
+        The periodic combiner is not running anymore, only the current thread survives
+        """
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._combine_lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+        if self.interval is not None:
+            self._thread = threading.Thread(target=self._run, name="pylogger-combiner", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Periodic combiner loop
+        Handler errors are reported and do not stop the loop
+        """
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,89 @@
+import time
+from datetime import datetime
+
+from .config import Config
+from .stats import Stats, clock_ns
+
+
+
+"""
+Clock used to timestamp the log messages
+----------------
+Reads the current time (wall clock, or monotonic clock if set in the config)
+and renders the time and date strings, only again when the second or the day changes
+"""
+
+
+
+class Clock:
+    # Offset between the wall clock and the monotonic clock, captured once
+    _monotonic_offset: float = time.time() - time.monotonic()
+
+    # Last rendering: second, time string, day ordinal and date string
+    # Replaced as a whole, so that threads never see a partial update
+    _cache: tuple[int, str, int, str] = (-1, "", -1, "")
+
+    @classmethod
+    def now(cls) -> float:
+        """
+        Returns the current timestamp
+        In monotonic mode, it never goes backwards, even if the system clock gets adjusted
+
+        Returns:
+            float - the current timestamp, in seconds since the epoch
+        """
+        if Config.MONOTONIC_CLOCK:
+            return time.monotonic() + cls._monotonic_offset
+        return time.time()
+
+    @classmethod
+    def render(cls, timestamp: float) -> tuple[str, str]:
+        """
+        Returns a tuple of formatted time and date of the given timestamp, in this format:
+            13:33:37 (with the fraction of second, if a precision is set in the config)
+            13 Jan 2007
+
+        Parameters:
+            timestamp (float): the timestamp to render
+
+        Returns:
+            tuple[str, str] - time and date
+        """
+        stats = Config.STATS
+        if stats:
+            start = clock_ns()
+
+        second = int(timestamp)
+
+        cache = cls._cache
+        if cache[0] != second:
+            cache = cls._cache = cls._render_second(second, cache)
+
+        time_string = cache[1]
+
+        precision = Config.TIME_PRECISION
+        if precision:
+            fraction = int((timestamp - second) * 10 ** precision)
+            time_string = f"{time_string}.{fraction:0{precision}d}"
+
+        if stats:
+            Stats.add_time("clock", clock_ns() - start)
+        return time_string, cache[3]
+
+    @classmethod
+    def _render_second(cls, second: int, previous: tuple[int, str, int, str]) -> tuple[int, str, int, str]:
+        """
+        Renders the time of a new second, and the date only if the day changed
+
+        Parameters:
+            second (int): the timestamp of the second
+            previous (tuple[int, str, int, str]): the previous rendering
+
+        Returns:
+            tuple[int, str, int, str] - the new rendering
+        """
+        now = datetime.fromtimestamp(second)
+        day = now.toordinal()
+
+        date = previous[3] if previous[2] == day else now.strftime("%d %b %Y")
+        return second, now.strftime("%H:%M:%S"), day, date
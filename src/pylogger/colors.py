@@ -1,5 +1,4 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from typing import ClassVar, Optional
 
 
 
@@ -7,14 +6,46 @@ from typing import Optional
 Colors models and default colors
 ----------------
 You can create your own colors by creating a ColorModel instance
+The color modes define when the terminal output is colored, see 'Config.set_color_mode'
 """
 
 
-class ColorModel(BaseModel):
+
+class ColorModes:
+    # Colored only if the terminal output is a terminal, and the NO_COLOR environment variable is not set
+    AUTO = "auto"
+    ALWAYS = "always"
+    NEVER = "never"
+
+
+
+def _validate_channel(name: str, value: int) -> int:
+    "Validates a RGB channel, when constructing a color"
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(f"Color channel '{name}' must be an int, got {type(value).__name__}")
+    if not 0 <= value <= 255:
+        raise ValueError(f"Color channel '{name}' must be between 0 and 255, got {value}")
+    return value
+
+
+
+class ColorModel:
     """RGB color model with values between 0-255."""
-    r: int = Field(default=255, ge=0, le=255)
-    g: int = Field(default=255, ge=0, le=255)
-    b: int = Field(default=255, ge=0, le=255)
+    __slots__ = ("r", "g", "b")
+
+    def __init__(self, *, r: int = 255, g: int = 255, b: int = 255, validate: bool = True) -> None:
+        """
+        Parameters:
+            r (int): the red value
+            g (int): the green value
+            b (int): the blue value
+            validate (bool): whether to check the values, only done here
+        """
+        if validate:
+            r, g, b = _validate_channel("r", r), _validate_channel("g", g), _validate_channel("b", b)
+        self.r = r
+        self.g = g
+        self.b = b
 
     def __call__(self, text: str) -> str:
         return self.colorize(text)
@@ -23,36 +54,87 @@ class ColorModel(BaseModel):
         """Simply colorize text on the foreground with this color"""
         return f"\033[38;2;{self.r};{self.g};{self.b}m{text}\033[0m"
 
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColorModel):
+            return (self.r, self.g, self.b) == (other.r, other.g, other.b)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColorModel(r={self.r}, g={self.g}, b={self.b})"
 
 
-class ColorCombo(BaseModel):
+
+class ColorCombo:
     """RGB color combo with foreground and background colors, allowing for transparent colors."""
+    __slots__ = ("fg", "bg", "_codes")
+
+    # Bumped to invalidate the cached escape codes of every combo, see 'Formatting.recompile'
+    generation: ClassVar[int] = 0
 
-    "Set to None for transparent colors"
-    fg: Optional[ColorModel] = None
-    bg: Optional[ColorModel] = None
+    def __init__(self, *, fg: Optional[ColorModel] = None, bg: Optional[ColorModel] = None, validate: bool = True) -> None:
+        """
+        Set to None for transparent colors
+
+        Parameters:
+            fg (Optional[ColorModel]): the foreground color
+            bg (Optional[ColorModel]): the background color
+            validate (bool): whether to check the colors, only done here
+        """
+        if validate:
+            for name, color in (("fg", fg), ("bg", bg)):
+                if color is not None and not isinstance(color, ColorModel):
+                    raise TypeError(f"Color '{name}' must be a ColorModel or None, got {type(color).__name__}")
+        self.fg = fg
+        self.bg = bg
+
+        # Cached escape codes, along with what they were built from
+        self._codes: Optional[tuple] = None
 
 
     def __call__(self, text: str) -> str:
         return self.colorize(text)
 
+    def codes(self) -> tuple[str, str]:
+        """
+        Returns the escape codes to put before and after a text to colorize it
+        Built once, and again only if the colors get replaced
+
+        Returns:
+            tuple[str, str] - the codes before and after the text
+        """
+        cached = self._codes
+        if cached is None or cached[0] is not self.fg or cached[1] is not self.bg or cached[2] != ColorCombo.generation:
+            start = ""
+            end = "\033[0m"
+            
+            # Only add colors if they are given
+            if self.bg is not None:
+                start += f"\033[48;2;{self.bg.r};{self.bg.g};{self.bg.b}m"
+            
+            if self.fg is not None:
+                start += f"\033[38;2;{self.fg.r};{self.fg.g};{self.fg.b}m"
+
+            # If BG is given, space around text
+            if self.bg is not None:
+                start += " "
+                end = " " + end
+
+            cached = self._codes = (self.fg, self.bg, ColorCombo.generation, start, end)
+
+        return cached[3], cached[4]
+
     def colorize(self, text: str) -> str:
         """Colorize text and handle transparency"""
-        result = ""
-        
-        # Only add colors if they are given
-        if self.bg is not None:
-            # If BG is given, space around text
-            text = f" {text} "
-            result += f"\033[48;2;{self.bg.r};{self.bg.g};{self.bg.b}m"
-        
-        if self.fg is not None:
-            result += f"\033[38;2;{self.fg.r};{self.fg.g};{self.fg.b}m"
-        
-        # Add text and reset
-        result += f"{text}\033[0m"
-        
-        return result
+        start, end = self.codes()
+        return start + text + end
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColorCombo):
+            return (self.fg, self.bg) == (other.fg, other.bg)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColorCombo(fg={self.fg!r}, bg={self.bg!r})"
 
 
 class Colors:
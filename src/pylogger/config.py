@@ -1,11 +1,18 @@
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import sys, os
 from pathlib import Path
-import inspect
 
 from .levels import Levels, LevelModel
 
+# The sinks depend on the config, they are imported when needed
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+    from .flight import FlightRecorder
+    from .policies import CallSitePolicy
+    from .rotation import RotationPolicy
+    from .sinks import Sink, FileSink, FlushPolicy
+
 
 
 """
@@ -13,8 +20,22 @@ Logging configuration
 ----------------
 Config class to set the:
     - minimum logging level threshold: this condition will be checked before each logging call
+    - named loggers levels: the minimum level of a tree of named loggers ('db', 'db.pool'), see the hierarchy module
     - log file: the file to log to, if set
+    - file buffering: the buffer size and flush policy of the log files
+    - file format: the format of the log files, text (default), json or binary
+    - sinks: additional consumers of the log records
     - root path (auto-detected): the root path of the project, used to auto-detect the caller's path. will be set automatically but you can override
+    - color mode: whether the terminal output is colored, by default only if it is a terminal and NO_COLOR is not set
+    - time precision: the amount of fraction of second digits in the time of the messages
+    - monotonic clock: if enabled, the time of the messages never goes backwards
+    - async mode: if enabled, the records are written by a background thread instead of the caller's thread
+    - thread buffers mode: if enabled, each thread buffers its records, and they are combined in timestamp order and written together
+    - multiprocess mode: if enabled, the forked processes send their records to a writer in the main process
+    - flight recorder: if enabled, the last records below the level threshold are kept in memory, and written on errors
+    - call site policy: if set, limits the records logged from each line of code (rate limit, sampling, deduplication)
+    - exception fingerprints: if enabled, an exception raised again from the same place is logged as a single line
+    - statistics: if enabled, the records are counted and the stages of the logging calls are timed, see 'Logger.stats'
 """
 
 
@@ -28,32 +49,358 @@ class classproperty:
         return self.method(cls)
     
 
-class Config:
+class ConfigMeta(type):
+    """
+    Keeps the cached levels of the loggers up to date, even when 'MIN_LEVEL' is assigned directly
+    And logs the pending records of the call site policy replaced, even when 'CALL_SITE_POLICY' is assigned directly
+    """
+
+    def __setattr__(cls, name, value) -> None:
+        if name == "CALL_SITE_POLICY":
+            previous = getattr(cls, name, None)
+            if previous is not None and previous is not value:
+                from .logger import Logger
+
+                Logger._flush_policy(previous)
+
+        super().__setattr__(name, value)
+        if name == "MIN_LEVEL":
+            from .hierarchy import LoggerTree
+
+            LoggerTree.refresh()
+
+
+class Config(metaclass=ConfigMeta):
     MIN_LEVEL: LevelModel = Levels.DEBUG
     LOG_FILE: Path | None = None
+    ASYNC: bool = False
+    MULTIPROCESS: bool = False
+    THREAD_BUFFERS: bool = False
+    TIME_PRECISION: int = 0
+    MONOTONIC_CLOCK: bool = False
+    FILE_BUFFER_SIZE: int = 8192
+    FILE_FLUSH_POLICY: Optional['FlushPolicy'] = None
+    FILE_FORMAT: str = "text"
+    COLOR_MODE: str = "auto"
+    SINKS: list['Sink'] = []
+    FLIGHT_RECORDER: Optional['FlightRecorder'] = None
+    STATS: bool = False
+    EXCEPTION_FINGERPRINTS: bool = False
+    CALL_SITE_POLICY: Optional['CallSitePolicy'] = None
     _root_path: Path | None = None
+    _log_sink: Optional['FileSink'] = None
+
+    # Sinks every record goes to, rebuilt when the log file or the sinks change
+    _active_sinks: Optional[tuple['Sink', ...]] = None
+    _active_log_file: Path | None = None
 
     @classmethod
     def set_level(cls, level: LevelModel) -> None:
         """
         Sets the current minimum level
+        The named loggers without a level of their own (see 'set_logger_level') use it
 
         Parameters:
             level (LevelModel): the level to set as the minimum
         """
+        # The loggers get refreshed, see 'ConfigMeta'
         cls.MIN_LEVEL = level
 
     @classmethod
-    def set_log_file(cls, path: str | Path) -> None:
+    def set_logger_level(cls, name: str, level: Optional[LevelModel]) -> None:
+        """
+        Sets the minimum level of the named loggers ('db'), and of their children ('db.pool') without a level of their own
+
+        Parameters:
+            name (str): the dotted name of the loggers
+            level (Optional[LevelModel]): the level to set as their minimum, None to inherit it from the parent again
+        """
+        from .hierarchy import LoggerTree
+
+        LoggerTree.set_level(name, level)
+
+    @classmethod
+    def set_log_file(cls, path: str | Path, file_format: Optional[str] = None, rotation: Optional['RotationPolicy'] = None) -> None:
         """
         Sets the log file at the given path
 
         Parameters:
             path (str | Path): the path to set as the log file
+            file_format (Optional[str]): the format of the file, see 'FileFormats', defaults to FILE_FORMAT
+            rotation (Optional[RotationPolicy]): when to rotate the file, see 'RotationPolicy', never by default
         """
         if isinstance(path, str):
             path = cls.ROOT_PATH / Path(path)
+
+        # Close the previous file, it will be reopened if another logger still uses it
+        if cls._log_sink is not None and cls._log_sink.path != path:
+            cls._log_sink.close()
+
         cls.LOG_FILE = path
+        cls._log_sink = cls.get_file_sink(path, file_format=file_format, rotation=rotation)
+        cls._active_sinks = None
+
+    @classmethod
+    def log_file_sink(cls) -> Optional['FileSink']:
+        """
+        Returns the sink of the log file, if set
+
+        Returns:
+            Optional[FileSink] - the sink of the log file
+        """
+        sink = cls._log_sink
+        if cls.LOG_FILE is None:
+            return None
+
+        # The log file was changed without 'set_log_file'
+        if sink is None or sink.path is not cls.LOG_FILE:
+            sink = cls._log_sink = cls.get_file_sink(cls.LOG_FILE)
+        return sink
+
+    @classmethod
+    def add_sink(cls, sink: 'Sink') -> None:
+        """
+        Adds a sink, every logged record will be passed to it
+
+        Parameters:
+            sink (Sink): the sink to add
+        """
+        cls.SINKS.append(sink)
+        cls._active_sinks = None
+
+    @classmethod
+    def remove_sink(cls, sink: 'Sink') -> None:
+        """
+        Removes a sink added with 'add_sink'
+
+        Parameters:
+            sink (Sink): the sink to remove
+        """
+        cls.SINKS.remove(sink)
+        cls._active_sinks = None
+
+    @classmethod
+    def active_sinks(cls) -> tuple['Sink', ...]:
+        """
+        Returns the sinks every record goes to: the terminal, the log file (if set), and the added sinks
+
+        Returns:
+            tuple[Sink, ...] - the sinks
+        """
+        sinks = cls._active_sinks
+        if sinks is None or cls._active_log_file is not cls.LOG_FILE:
+            from .sinks import StdoutSink
+
+            log_sink = cls.log_file_sink()
+            sinks = (StdoutSink.get(),) + ((log_sink,) if log_sink is not None else ()) + tuple(cls.SINKS)
+
+            cls._active_sinks = sinks
+            cls._active_log_file = cls.LOG_FILE
+        return sinks
+
+    @classmethod
+    def get_file_sink(cls, path: Path, file_format: Optional[str] = None, rotation: Optional['RotationPolicy'] = None) -> 'FileSink':
+        """
+        Returns the shared sink of the given file, with the configured buffering
+
+        Parameters:
+            path (Path): the path of the file
+            file_format (Optional[str]): the format of the file, switched to if the sink already exists in another format
+                defaults to FILE_FORMAT for a new sink
+            rotation (Optional[RotationPolicy]): when to rotate the file, replaces the policy of an existing sink
+
+        Returns:
+            FileSink - the sink of the file
+        """
+        from .sinks import FileSink
+
+        sink = FileSink.get(path, buffer_size=cls.FILE_BUFFER_SIZE, flush_policy=cls.FILE_FLUSH_POLICY, file_format=file_format or cls.FILE_FORMAT, rotation=rotation)
+        if (file_format is not None and sink.file_format != file_format) or (rotation is not None and sink.rotation is not rotation):
+            sink.configure(file_format=file_format, rotation=rotation)
+        return sink
+
+    @classmethod
+    def set_file_buffering(cls, buffer_size: Optional[int] = None, flush_policy: Optional['FlushPolicy'] = None) -> None:
+        """
+        Sets the buffer size and/or the flush policy of the log files
+        Applies to the already opened files aswell
+
+        Parameters:
+            buffer_size (Optional[int]): the size of the write buffer, in bytes
+            flush_policy (Optional[FlushPolicy]): when to flush the buffer, see 'FlushPolicy'
+        """
+        if buffer_size is not None:
+            cls.FILE_BUFFER_SIZE = buffer_size
+        if flush_policy is not None:
+            cls.FILE_FLUSH_POLICY = flush_policy
+
+        from .sinks import FileSink
+
+        FileSink.configure_all(buffer_size=buffer_size, flush_policy=flush_policy)
+
+    @classmethod
+    def set_file_format(cls, file_format: str) -> None:
+        """
+        Sets the default format of the log files, only used for the files opened afterwards
+
+        Parameters:
+            file_format (str): the format, see 'FileFormats'
+        """
+        from .encoders import ENCODERS
+
+        if file_format not in ENCODERS:
+            raise ValueError(f"Unknown file format {file_format!r}, expected one of: {', '.join(ENCODERS)}")
+        cls.FILE_FORMAT = file_format
+
+    @classmethod
+    def set_color_mode(cls, mode: str) -> None:
+        """
+        Sets when the terminal output is colored
+        Without colors, the messages are rendered without any escape sequence at all
+
+        Parameters:
+            mode (str): 'auto' (default, only if the output is a terminal and NO_COLOR is not set), 'always' or 'never', see 'ColorModes'
+        """
+        from .colors import ColorModes
+
+        if mode not in (ColorModes.AUTO, ColorModes.ALWAYS, ColorModes.NEVER):
+            raise ValueError(f"Unknown color mode {mode!r}, expected one of: auto, always, never")
+        cls.COLOR_MODE = mode
+
+    @classmethod
+    def set_time_precision(cls, digits: int) -> None:
+        """
+        Sets the amount of fraction of second digits in the time of the messages
+
+        Parameters:
+            digits (int): between 0 (seconds, default) and 6 (microseconds)
+        """
+        if not 0 <= digits <= 6:
+            raise ValueError("The time precision must be between 0 and 6 digits")
+        cls.TIME_PRECISION = digits
+
+    @classmethod
+    def set_monotonic_clock(cls, enabled: bool = True) -> None:
+        """
+        Enables or disables the monotonic clock
+        When enabled, the time of the messages is based on the wall clock at startup, and never goes backwards
+        even if the system clock gets adjusted
+
+        Parameters:
+            enabled (bool): whether to use the monotonic clock
+        """
+        cls.MONOTONIC_CLOCK = enabled
+
+    @classmethod
+    def set_async(cls, enabled: bool = True) -> None:
+        """
+        Enables or disables the async mode
+        In async mode, the logging calls only enqueue the records, and a background thread writes them
+        Use 'Logger.flush()' to wait for the enqueued records to be written
+
+        Parameters:
+            enabled (bool): whether to enable the async mode
+        """
+        cls.ASYNC = enabled
+
+    @classmethod
+    def set_thread_buffers(
+        cls,
+        enabled: bool = True,
+        size: int = 256,
+        interval: Optional[float] = 0.1,
+        flush_level: Optional[LevelModel] = Levels.ERROR
+    ) -> None:
+        """
+        Enables or disables the thread buffers mode
+        Each thread renders its records and appends them to a buffer of its own, instead of writing them under the lock of each sink,
+        then the buffers of every thread are combined in timestamp order and written together
+        Removes the contention between many logging threads, use 'Logger.flush()' to write the buffered records
+
+        Parameters:
+            enabled (bool): whether to enable the thread buffers mode
+            size (int): the amount of records of a thread buffer combining them all
+            interval (Optional[float]): combine the buffers at least every this many seconds, None to only do it on the other conditions
+            flush_level (Optional[LevelModel]): combine the buffers right away when a record of this level or higher is logged
+        """
+        from .logger import Logger
+
+        cls.THREAD_BUFFERS = enabled
+        if enabled:
+            Logger._start_thread_buffers(size=size, interval=interval, flush_level=flush_level)
+        else:
+            Logger._stop_thread_buffers()
+
+    @classmethod
+    def set_flight_recorder(cls, capacity: Optional[int] = 1024, trigger: Optional[LevelModel] = Levels.ERROR) -> None:
+        """
+        Enables or disables the flight recorder
+        It keeps the last records below the level threshold in a fixed size buffer, without formatting them,
+        and writes them when a record of the trigger level is logged, or on 'Logger.dump_flight_recorder'
+
+        Parameters:
+            capacity (Optional[int]): the amount of records kept, None to disable it
+            trigger (Optional[LevelModel]): the level writing the records, None to only write them on demand
+        """
+        from .flight import FlightRecorder
+
+        cls.FLIGHT_RECORDER = None if capacity is None else FlightRecorder(capacity=capacity, trigger=trigger)
+
+    @classmethod
+    def set_call_site_policy(cls, policy: Optional['CallSitePolicy']) -> None:
+        """
+        Sets the policy limiting the records logged from each call site, see the policies module
+        The PrefixLoggers with a policy of their own use it instead
+
+        Parameters:
+            policy (Optional[CallSitePolicy]): for example 'RateLimit(10)', 'Sample(100)' or 'Deduplicate()', None to log everything
+        """
+        # The pending records of the previous policy get logged, see 'ConfigMeta'
+        cls.CALL_SITE_POLICY = policy
+
+    @classmethod
+    def set_exception_fingerprints(cls, enabled: bool = True) -> None:
+        """
+        Enables or disables the exception fingerprints
+        When enabled, each logged traceback ends with its fingerprint, and only the first occurrence of a fingerprint
+        is logged in full, the next ones as a single line: 'ValueError: message [traceback 1a2b3c4d, already logged]'
+
+        Parameters:
+            enabled (bool): whether to shorten the tracebacks already logged
+        """
+        cls.EXCEPTION_FINGERPRINTS = enabled
+
+    @classmethod
+    def set_stats(cls, enabled: bool = True) -> None:
+        """
+        Enables or disables the statistics
+        When enabled, the records are counted per level and per sink, and the stages of the logging calls are timed
+        Read them with 'Logger.stats()', disabled they cost a single check per stage
+
+        Parameters:
+            enabled (bool): whether to gather the statistics
+        """
+        cls.STATS = enabled
+
+    @classmethod
+    def set_multiprocess(cls, enabled: bool = True, context: Optional['BaseContext'] = None) -> None:
+        """
+        Enables or disables the multiprocess mode, call it from the main process before creating the workers
+        A thread of the current process becomes the only one writing to the terminal and the log files,
+        and the processes forked afterwards send their records to it
+        For workers that are not forked, see 'Logger.init_worker'
+
+        Parameters:
+            enabled (bool): whether to enable the multiprocess mode
+            context (Optional[BaseContext]): the multiprocessing context of the workers, defaults to the current one
+        """
+        from .logger import Logger
+
+        cls.MULTIPROCESS = enabled
+        if enabled:
+            Logger._start_process_writer(context)
+        else:
+            Logger._stop_process_writer()
 
     @classproperty
     def ROOT_PATH(cls) -> Path:
@@ -81,15 +428,8 @@ class Config:
             return
         
         try:
-            # Get the current frame's caller
-            frame = inspect.currentframe()
-
-            # If frame is unknown
-            if frame is None:
-                raise ValueError("Could not get the current frame")
-
-            # Go one frame back
-            frame = frame.f_back
+            # Get the caller's frame
+            frame = sys._getframe(1)
 
             # Set the root path
             root_path = Path(frame.f_code.co_filename).parent
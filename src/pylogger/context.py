@@ -0,0 +1,150 @@
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+
+
+"""
+Fields bound to the logged records
+----------------
+Fields: an immutable set of fields, with its rendering cached, so that it is only rendered once per set of fields
+The fields of the current context are kept in a context variable, see 'Logger.contextualize':
+asyncio tasks start with a copy of the context they were created in,
+threads with an empty one, unless run with 'contextvars.copy_context().run'
+The fields of a logger are added on top of them, see 'Logger.bind'
+"""
+
+
+
+class Fields:
+    __slots__ = ("values", "_rendered", "_prefixes", "_last_merge")
+
+    def __init__(self, values: dict[str, Any]) -> None:
+        """
+        Parameters:
+            values (dict[str, Any]): the fields, never modified afterwards
+        """
+        for key in values:
+            if not isinstance(key, str) or not key:
+                raise ValueError(f"Invalid field name: {key!r}")
+
+        self.values = values
+
+        # Built on first use, then reused as long as the fields don't change
+        self._rendered: Optional[str] = None
+        self._prefixes: dict[Optional[str], str] = {}
+
+        # Last fields merged on top of these ones, and the result, replaced at once as it's shared by the threads
+        self._last_merge: Optional[tuple[Fields, Fields]] = None
+
+    def merge(self, values: dict[str, Any]) -> 'Fields':
+        """
+        Returns new fields, with the given ones added or replaced
+
+        Parameters:
+            values (dict[str, Any]): the fields to add
+
+        Returns:
+            Fields - the new fields
+        """
+        return Fields({**self.values, **values})
+
+    def merge_bound(self, bound: 'Fields') -> 'Fields':
+        """
+        Returns these fields with the ones of a logger on top, reused while both stay the same
+
+        Parameters:
+            bound (Fields): the fields of the logger
+
+        Returns:
+            Fields - the merged fields
+        """
+        last = self._last_merge
+        if last is not None and last[0] is bound:
+            return last[1]
+
+        merged = self.merge(bound.values)
+        self._last_merge = (bound, merged)
+        return merged
+
+    def plain(self) -> dict[str, str | int | float | bool | None]:
+        """
+        Returns:
+            dict[str, str | int | float | bool | None] - the fields, with the other types of values turned into strings
+        """
+        return {key: value if value is None or isinstance(value, (str, int, float, bool)) else str(value) for key, value in self.values.items()}
+
+    def render(self) -> str:
+        """
+        Returns:
+            str - the fields as 'key=value' pairs, separated by spaces
+        """
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = " ".join(f"{key}={value}" for key, value in self.values.items())
+        return rendered
+
+    def prefix(self, prefix: Optional[str]) -> str:
+        """
+        Returns the prefix of a record with these fields
+
+        Parameters:
+            prefix (Optional[str]): the formatted prefix of the logger, if any
+
+        Returns:
+            str - the prefix followed by the rendered fields
+        """
+        rendered = self._prefixes.get(prefix)
+        if rendered is None:
+            rendered = self.render() if prefix is None else f"{prefix} {self.render()}"
+            self._prefixes[prefix] = rendered
+        return rendered
+
+    def __repr__(self) -> str:
+        return f"Fields({self.values!r})"
+
+
+
+# Fields of the current context
+_current: ContextVar[Optional[Fields]] = ContextVar("pylogger_fields", default=None)
+
+
+def get_fields(bound: Optional[Fields] = None) -> Optional[Fields]:
+    """
+    Returns the fields of a record logged now
+
+    Parameters:
+        bound (Optional[Fields]): the fields of the logger, if any
+
+    Returns:
+        Optional[Fields] - the fields of the current context, with the ones of the logger on top, None if there are none
+    """
+    current = _current.get()
+    if bound is None:
+        return current
+    if current is None:
+        return bound
+    return current.merge_bound(bound)
+
+
+def push_fields(values: dict[str, Any]) -> Token:
+    """
+    Adds fields to the current context
+
+    Parameters:
+        values (dict[str, Any]): the fields to add, replacing the ones with the same name
+
+    Returns:
+        Token - the token restoring the previous fields, see 'pop_fields'
+    """
+    current = _current.get()
+    return _current.set(Fields(values) if current is None else current.merge(values))
+
+
+def pop_fields(token: Token) -> None:
+    """
+    Restores the fields of the current context, as they were before 'push_fields'
+
+    Parameters:
+        token (Token): the token returned by 'push_fields'
+    """
+    _current.reset(token)
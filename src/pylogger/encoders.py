@@ -0,0 +1,210 @@
+import struct
+
+from .format import Formatting
+from .record import LogRecord
+
+
+
+"""
+Encoders of the log files
+----------------
+Turn the records into the content of a log file, depending on its format:
+    text: the raw formatted messages, as shown in the terminal (default)
+    json: one JSON object per line, the bound fields under "fields"
+    binary: length-prefixed entries, with the paths, levels, prefixes and field names interned
+Read them back with 'pylogger.read'
+"""
+
+
+
+class FileFormats:
+    TEXT = "text"
+    JSON = "json"
+    BINARY = "binary"
+
+
+
+"Binary format"
+
+# Every entry starts with its type and the length of its payload
+ENTRY_HEADER = struct.Struct("<cI")
+
+# Header: magic and version, starts the file and every reopening, resets the interned strings
+HEADER = b"H"
+MAGIC = b"PYLG"
+VERSION = 1
+HEADER_PAYLOAD = struct.Struct("<4sH")
+
+# Interned string: id, then the UTF-8 string
+STRING = b"S"
+STRING_ID = struct.Struct("<I")
+
+# Record: time, level name id, level value, path id, line number, prefix id, then the UTF-8 message
+RECORD = b"R"
+RECORD_FIELDS = struct.Struct("<dIiIiI")
+
+# Fields of the next record: for each field, its name id and the length of its value, then the UTF-8 value
+# Skipped by the readers not knowing it, like any unknown entry
+FIELDS = b"F"
+FIELD = struct.Struct("<II")
+
+# Unknown line number, and no prefix
+NO_LINENO = -1
+NO_PREFIX = 0xFFFFFFFF
+
+
+
+class Encoder:
+    "Turns records into the content of a log file"
+
+    # Whether the file is opened in binary mode
+    binary: bool = False
+    # Whether the encoder keeps a state, the records are then encoded under the lock of the sink
+    stateful: bool = False
+
+    def header(self) -> str | bytes:
+        "Returns the content written whenever the file gets opened"
+        return b"" if self.binary else ""
+
+    def encode(self, records: list[LogRecord]) -> str | bytes:
+        """
+        Parameters:
+            records (list[LogRecord]): the records to encode
+
+        Returns:
+            str | bytes - the content to append to the file
+        """
+        raise NotImplementedError
+
+
+class TextEncoder(Encoder):
+    def encode(self, records: list[LogRecord]) -> str:
+        return "\n".join([Formatting.raw_render(record) for record in records]) + "\n"
+
+
+class JsonEncoder(Encoder):
+    def __init__(self) -> None:
+        # Only needed once the format is used, slow to import
+        import json
+
+        self._dumps = json.dumps
+
+    def encode(self, records: list[LogRecord]) -> str:
+        dumps = self._dumps
+        return "\n".join([dumps(self.to_dict(record), ensure_ascii=False) for record in records]) + "\n"
+
+    @classmethod
+    def to_dict(cls, record: LogRecord) -> dict:
+        """
+        Returns the fields of the record, as written in the file
+
+        Parameters:
+            record (LogRecord): the record
+
+        Returns:
+            dict - the fields
+        """
+        fields = {
+            "time": record.time,
+            "level": record.level.name,
+            "value": record.level.value,
+            "path": record.path,
+            "lineno": record.lineno,
+            "prefix": record.prefix,
+            "message": record.get_message()
+        }
+        if record.fields is not None:
+            fields["fields"] = record.fields.plain()
+        return fields
+
+
+class BinaryEncoder(Encoder):
+    binary = True
+    stateful = True
+
+    # Above this amount of interned strings, the table starts over with a new header
+    MAX_STRINGS: int = 65536
+
+    def __init__(self) -> None:
+        self._strings: dict[str, int] = {}
+
+    def header(self) -> bytes:
+        self._strings.clear()
+        return ENTRY_HEADER.pack(HEADER, HEADER_PAYLOAD.size) + HEADER_PAYLOAD.pack(MAGIC, VERSION)
+
+    def encode(self, records: list[LogRecord]) -> bytes:
+        chunks = []
+        if len(self._strings) >= self.MAX_STRINGS:
+            chunks.append(self.header())
+
+        intern = self._intern
+        for record in records:
+            level = record.level
+            prefix = NO_PREFIX if record.prefix is None else intern(record.prefix, chunks)
+            lineno = NO_LINENO if record.lineno is None else record.lineno
+
+            fields = RECORD_FIELDS.pack(record.time, intern(level.name, chunks), level.value, intern(record.path, chunks), lineno, prefix)
+            message = record.get_message().encode("utf-8")
+
+            # Right before the record, the values as strings
+            if record.fields is not None:
+                bound = []
+                for key, value in record.fields.values.items():
+                    data = str(value).encode("utf-8")
+                    bound.append(FIELD.pack(intern(key, chunks), len(data)))
+                    bound.append(data)
+
+                payload = b"".join(bound)
+                chunks.append(ENTRY_HEADER.pack(FIELDS, len(payload)))
+                chunks.append(payload)
+
+            chunks.append(ENTRY_HEADER.pack(RECORD, len(fields) + len(message)))
+            chunks.append(fields)
+            chunks.append(message)
+
+        return b"".join(chunks)
+
+    def _intern(self, string: str, chunks: list[bytes]) -> int:
+        """
+        Returns the id of the string, defining it first if needed
+
+        Parameters:
+            string (str): the string to intern
+            chunks (list[bytes]): the content being encoded, the definition gets appended to it
+
+        Returns:
+            int - the id of the string
+        """
+        string_id = self._strings.get(string)
+        if string_id is None:
+            string_id = self._strings[string] = len(self._strings)
+
+            data = string.encode("utf-8")
+            chunks.append(ENTRY_HEADER.pack(STRING, STRING_ID.size + len(data)))
+            chunks.append(STRING_ID.pack(string_id))
+            chunks.append(data)
+        return string_id
+
+
+
+ENCODERS: dict[str, type[Encoder]] = {
+    FileFormats.TEXT: TextEncoder,
+    FileFormats.JSON: JsonEncoder,
+    FileFormats.BINARY: BinaryEncoder
+}
+
+
+def create_encoder(file_format: str) -> Encoder:
+    """
+    Returns a new encoder of the given format
+
+    Parameters:
+        file_format (str): the format, see 'FileFormats'
+
+    Returns:
+        Encoder - the encoder
+    """
+    encoder = ENCODERS.get(file_format)
+    if encoder is None:
+        raise ValueError(f"Unknown file format {file_format!r}, expected one of: {', '.join(ENCODERS)}")
+    return encoder()
@@ -0,0 +1,137 @@
+import itertools
+import sys
+from types import CodeType
+from typing import Callable, Optional
+
+from .clock import Clock
+from .context import Fields
+from .format import Formatting, THIS_MODULE_PREFIX
+from .levels import LevelModel, Levels
+from .record import LogRecord
+
+
+
+"""
+Flight recorder
+----------------
+Keeps the last records below the level threshold in memory, in a fixed size ring buffer,
+so that the context leading to an error can still be written when the error happens
+Only the raw fields are stored: the messages are neither built nor formatted unless dumped
+"""
+
+
+
+class FlightRecorder:
+    def __init__(self, capacity: int = 1024, trigger: Optional[LevelModel] = Levels.ERROR) -> None:
+        """
+        Parameters:
+            capacity (int): the amount of records kept, the oldest ones get overwritten
+            trigger (Optional[LevelModel]): dump the records when one of this level or higher is logged, None to only dump on demand
+        """
+        if capacity <= 0:
+            raise ValueError("The capacity of the flight recorder must be positive")
+
+        self.capacity = capacity
+        self.trigger = trigger
+
+        # Preallocated slots, one list per field
+        self._sequences: list[Optional[int]] = [None] * capacity
+        self._messages: list[str | Callable[[], str] | None] = [None] * capacity
+        self._args: list[tuple] = [()] * capacity
+        self._levels: list[Optional[LevelModel]] = [None] * capacity
+        self._prefixes: list[Optional[str]] = [None] * capacity
+        self._fields: list[Optional[Fields]] = [None] * capacity
+        self._times: list[float] = [0.0] * capacity
+        # Caller's code and last instruction, the path and line number are only resolved when dumping
+        self._codes: list[Optional[CodeType]] = [None] * capacity
+        self._instructions: list[int] = [0] * capacity
+
+        # Atomic under the GIL, so that capturing needs no lock
+        self._counter = itertools.count()
+
+    def capture(self, message: str | Callable[[], str], level: LevelModel, prefix: Optional[str] = None, args: tuple = (), fields: Optional[Fields] = None) -> None:
+        """
+        Stores a record in the next slot, called by the 'log' method of the loggers below the level threshold
+
+        Parameters:
+            message (str | Callable[[], str]): the message, or a function returning it
+            level (LevelModel): the level of the message
+            prefix (Optional[str]): the formatted prefix, if any
+            args (tuple): the arguments to merge into the message
+            fields (Optional[Fields]): the fields bound to the message, if any
+        """
+        sequence = next(self._counter)
+        slot = sequence % self.capacity
+
+        # Go back until we're out of this module, starting from the caller of 'log'
+        frame = sys._getframe(2)
+        try:
+            while frame is not None and frame.f_code.co_filename.startswith(THIS_MODULE_PREFIX):
+                frame = frame.f_back
+
+            if frame is None:
+                self._codes[slot] = None
+            else:
+                # Cheaper than the line number, which gets computed from it
+                self._codes[slot] = frame.f_code
+                self._instructions[slot] = frame.f_lasti
+        finally:
+            # Reference cycle prevention
+            del frame
+
+        self._messages[slot] = message
+        self._args[slot] = args
+        self._levels[slot] = level
+        self._prefixes[slot] = prefix
+        self._fields[slot] = fields
+        self._times[slot] = Clock.now()
+        self._sequences[slot] = sequence
+
+    def is_triggered_by(self, level: LevelModel) -> bool:
+        "Whether logging a message of this level dumps the records"
+        return self.trigger is not None and level.value >= self.trigger.value
+
+    def drain(self) -> list[LogRecord]:
+        """
+        Empties the buffer
+
+        Returns:
+            list[LogRecord] - the stored records, from the oldest to the newest
+        """
+        sequences = self._sequences
+        slots = sorted((sequence, slot) for slot, sequence in enumerate(sequences) if sequence is not None)
+
+        records = []
+        for _, slot in slots:
+            sequences[slot] = None
+
+            code = self._codes[slot]
+            records.append(LogRecord(
+                message=self._messages[slot],
+                level=self._levels[slot],
+                prefix=self._prefixes[slot],
+                time=self._times[slot],
+                path='<unknown>' if code is None else Formatting.format_code_file(code.co_filename),
+                lineno=None if code is None else self._get_lineno(code, self._instructions[slot]),
+                args=self._args[slot],
+                fields=self._fields[slot]
+            ))
+
+            # Release the references
+            self._messages[slot] = None
+            self._args[slot] = ()
+            self._codes[slot] = None
+            self._fields[slot] = None
+
+        return records
+
+    @classmethod
+    def _get_lineno(cls, code: CodeType, instruction: int) -> Optional[int]:
+        "Returns the line number of an instruction offset"
+        for start, end, lineno in code.co_lines():
+            if start <= instruction < end:
+                return lineno
+        return None
+
+    def __len__(self) -> int:
+        return sum(sequence is not None for sequence in self._sequences)
@@ -1,18 +1,23 @@
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 
-from datetime import datetime
-import inspect
+import os
+import sys
 from pathlib import Path
 
 from .config import Config
-from .styles import FormatColors as FS, Separators as Seps
+from .clock import Clock
+from .colors import ColorCombo
+from .context import Fields, get_fields
+from .styles import FormatColors as FS, Separators as Seps, StylesMeta
 from .levels import LevelModel
+from .record import LogRecord
+from .stats import Stats, clock_ns
 
 
 
 """
 Class taking care of formatting the log messages
-Uses the styles defined in the styles module
+Captures the log records, and renders them using the styles defined in the styles module
 ----------------
 The formatting is NOT customizable, only the styles are
 """
@@ -23,9 +28,70 @@ The formatting is NOT customizable, only the styles are
 THIS_MODULE_PATH = Path(__file__).parent
 THIS_MODULE_NAME = THIS_MODULE_PATH.name
 
+# Frames from files starting with this prefix are skipped when looking for the caller
+THIS_MODULE_PREFIX = str(THIS_MODULE_PATH) + os.sep
+
+# Marker for the code files not in the locations cache yet
+_MISSING = object()
+
+
+
+class Templates(NamedTuple):
+    """
+    Formatting templates, compiled from the styles
+    Filled with the prefix (if any), time, date, path, line number, level and message
+    """
+    colored: str
+    colored_prefixed: str
+    raw: str
+    raw_prefixed: str
+
 
 
 class Formatting:
+    # Compiled templates, along with the styles version they were compiled from
+    _templates: Optional[Templates] = None
+    _templates_version: int = -1
+    # Colorized level per level id, along with the color and name it was built from
+    _levels_cache: dict[int, tuple[ColorCombo, str, str]] = {}
+
+    # Formatted file path per code file, None for the files of this module
+    _location_cache: dict[str, Optional[str]] = {}
+    # The root path the cached file paths are relative to
+    _location_root: Optional[Path] = None
+
+    @classmethod
+    def create_record(
+        cls,
+        message: str | Callable[[], str],
+        level: LevelModel,
+        prefix: Optional[str] = None,
+        args: tuple = (),
+        exception: Optional[BaseException] = None,
+        fields: Optional[Fields] = None
+    ) -> LogRecord:
+        """
+        Captures a record of the message, with the current time and the caller's location
+
+        Parameters:
+            message (str | Callable[[], str]): the message, or a function returning it
+            level (LevelModel): the level of the message
+            prefix (Optional[str]): the formatted prefix to include in the message
+            args (tuple): the arguments to merge into the message when rendering it
+            exception (Optional[BaseException]): the exception to render after the message
+            fields (Optional[Fields]): the fields bound to the logger, added on top of the ones of the current context
+
+        Returns:
+            LogRecord - the record
+        """
+        if Config.STATS:
+            start = clock_ns()
+            path, lineno = cls.locate_caller()
+            Stats.add_time("locate", clock_ns() - start)
+        else:
+            path, lineno = cls.locate_caller()
+
+        return LogRecord(message=message, level=level, prefix=prefix, time=Clock.now(), path=path, lineno=lineno, args=args, exception=exception, fields=get_fields(fields))
 
     @classmethod
     def format(cls, message: str, level: LevelModel, prefix: Optional[str] = None) -> str:
@@ -39,38 +105,7 @@ class Formatting:
         Returns:
             str - the formatted message
         """
-        # Get values
-        time, date = cls.format_time_and_date()
-        path, lineno = cls.format_file_info()
-
-        # Build formatted message
-        formatted_message = ""
-
-        if prefix is not None:
-            formatted_message += prefix + FS.separator.colorize(Seps.prefix_time)
-        
-        formatted_time = FS.time.colorize(text=time)
-        formatted_date = FS.date.colorize(text=date)
-        formatted_path = FS.path.colorize(text=path)
-        formatted_lineno = FS.lineno.colorize(text=lineno)
-
-        formatted_level = level.format()
-
-        formatted_message += (
-            formatted_time \
-            + FS.separator.colorize(Seps.time_date) \
-            + formatted_date \
-            + FS.separator.colorize(Seps.date_path) \
-            + formatted_path \
-            + FS.separator.colorize(Seps.path_lineno) \
-            + formatted_lineno \
-            + FS.separator.colorize(Seps.lineno_level) \
-            + formatted_level \
-            + FS.separator.colorize(Seps.level_message) \
-            + message
-        )
-
-        return formatted_message
+        return cls.render(cls.create_record(message=message, level=level, prefix=prefix))
     
     @classmethod
     def raw_format(cls, message: str, level: LevelModel, prefix: Optional[str] = None) -> str:
@@ -84,47 +119,186 @@ class Formatting:
         Returns:
             str - the formatted message
         """
-        # Get values
-        time, date = cls.format_time_and_date()
-        path, lineno = cls.format_file_info()
-
-        # Build formatted message
-        formatted_message = ""
-
-        if prefix is not None:
-            formatted_message += prefix + Seps.prefix_time
-        
-        formatted_message = (
-            time \
-            + Seps.time_date \
-            + date \
-            + Seps.date_path \
-            + path \
-            + Seps.path_lineno \
-            + lineno \
-            + Seps.lineno_level \
-            + level.name \
-            + Seps.level_message \
-            + message
-        )
+        return cls.raw_render(cls.create_record(message=message, level=level, prefix=prefix))
+
+    @classmethod
+    def render(cls, record: LogRecord) -> str:
+        """
+        Renders the record with colors, only once
+
+        Parameters:
+            record (LogRecord): the record to render
+
+        Returns:
+            str - the formatted message
+        """
+        if record.colored is not None:
+            return record.colored
+
+        stats = Config.STATS
+        if stats:
+            start = clock_ns()
+
+        templates = cls._templates
+        if templates is None or cls._templates_version != StylesMeta.version:
+            templates = cls.recompile()
+
+        time, date = Clock.render(record.time)
+        lineno = '?' if record.lineno is None else record.lineno
+
+        level = cls._format_level(record.level)
+
+        # The fields are rendered after the prefix, once per set of fields
+        prefix = record.prefix if record.fields is None else record.fields.prefix(record.prefix)
+
+        if prefix is None:
+            formatted_message = templates.colored % (time, date, record.path, lineno, level, record.get_message())
+        else:
+            formatted_message = templates.colored_prefixed % (prefix, time, date, record.path, lineno, level, record.get_message())
+
+        record.colored = formatted_message
+
+        if stats:
+            Stats.add_time("render", clock_ns() - start)
+        return formatted_message
+
+    @classmethod
+    def raw_render(cls, record: LogRecord) -> str:
+        """
+        Renders the record without any color, only once
+
+        Parameters:
+            record (LogRecord): the record to render
+
+        Returns:
+            str - the formatted message
+        """
+        if record.raw is not None:
+            return record.raw
+
+        stats = Config.STATS
+        if stats:
+            start = clock_ns()
+
+        templates = cls._templates
+        if templates is None or cls._templates_version != StylesMeta.version:
+            templates = cls.recompile()
+
+        time, date = Clock.render(record.time)
+        lineno = '?' if record.lineno is None else record.lineno
+
+        # The fields are rendered after the prefix, once per set of fields
+        prefix = record.prefix if record.fields is None else record.fields.prefix(record.prefix)
+
+        if prefix is None:
+            formatted_message = templates.raw % (time, date, record.path, lineno, record.level.name, record.get_message())
+        else:
+            formatted_message = templates.raw_prefixed % (prefix, time, date, record.path, lineno, record.level.name, record.get_message())
+
+        record.raw = formatted_message
 
+        if stats:
+            Stats.add_time("render", clock_ns() - start)
         return formatted_message
+
+    @classmethod
+    def _format_level(cls, level: LevelModel) -> str:
+        """
+        Returns the colorized level, built again only if its color or name got replaced
+
+        Parameters:
+            level (LevelModel): the level
+
+        Returns:
+            str - the colorized level
+        """
+        cached = cls._levels_cache.get(id(level))
+        if cached is None or cached[0] is not level.color or cached[1] is not level.name:
+            cached = cls._levels_cache[id(level)] = (level.color, level.name, level.format())
+        return cached[2]
+
+    @classmethod
+    def recompile(cls) -> Templates:
+        """
+        Compiles the styles into the formatting templates
+        Done automatically when overriding the styles, call it if you modify a color in place
+
+        Returns:
+            Templates - the compiled templates
+        """
+        # Invalidate the cached escape codes of the colors and levels
+        ColorCombo.generation += 1
+        cls._levels_cache.clear()
+        version = StylesMeta.version
+
+        def static(text: str) -> str:
+            "Escapes the static parts of the templates"
+            return text.replace('%', '%%')
+
+        def colored(color: ColorCombo, text: str) -> str:
+            "Colorizes a part of the template"
+            start, end = color.codes()
+            return static(start) + text + static(end)
+
+        def separator(text: str) -> str:
+            return static(FS.separator.colorize(text))
+
+        colored_template = (
+            colored(FS.time, '%s') \
+            + separator(Seps.time_date) \
+            + colored(FS.date, '%s') \
+            + separator(Seps.date_path) \
+            + colored(FS.path, '%s') \
+            + separator(Seps.path_lineno) \
+            + colored(FS.lineno, '[%s]') \
+            + separator(Seps.lineno_level) \
+            + '%s' \
+            + separator(Seps.level_message) \
+            + '%s'
+        )
+
+        raw_template = (
+            '%s' \
+            + static(Seps.time_date) \
+            + '%s' \
+            + static(Seps.date_path) \
+            + '%s' \
+            + static(Seps.path_lineno) \
+            + '[%s]' \
+            + static(Seps.lineno_level) \
+            + '%s' \
+            + static(Seps.level_message) \
+            + '%s'
+        )
+
+        templates = Templates(
+            colored=colored_template,
+            colored_prefixed='%s' + separator(Seps.prefix_time) + colored_template,
+            raw=raw_template,
+            raw_prefixed='%s' + static(Seps.prefix_time) + raw_template
+        )
+
+        cls._templates = templates
+        cls._templates_version = version
+        return templates
     
 
     @classmethod
-    def format_time_and_date(cls) -> tuple[str, str]:
+    def format_time_and_date(cls, timestamp: Optional[float] = None) -> tuple[str, str]:
         """
         Returns a tuple of formatted time and date, in this format:
             13:33:37
             13 Jan 2007
 
+        Parameters:
+            timestamp (Optional[float]): the timestamp to format, defaults to now
+
         Returns:
             tuple[str, str] - time and date
         """
-        now = datetime.now()
-        time = now.strftime("%H:%M:%S")
-        date = now.strftime("%d %b %Y")
-        return time, date
+        if timestamp is None:
+            timestamp = Clock.now()
+        return Clock.render(timestamp)
     
     @classmethod
     def format_file_info(cls) -> tuple[str, str]:
@@ -136,41 +310,100 @@ class Formatting:
         Returns:
             tuple[str, str] - file info
         """
+        path, lineno = cls.locate_caller()
+        return path, cls._format_lineno(lineno)
+
+    @classmethod
+    def locate_caller(cls) -> tuple[str, Optional[int]]:
+        """
+        Returns the caller's location, as the first frame out of this module:
+            file path, (starting from the root of the project)
+            lineno, None if unknown
+
+        Returns:
+            tuple[str, Optional[int]] - the caller's location
+        """
         try:
-            # Get the current frame's caller
-            frame = inspect.currentframe()
+            # Get the current frame's caller, this frame is skipped by the walk anyway
+            frame = sys._getframe(1)
 
-            # If frame is unknown
-            if frame is None:
-                return '<unknown>', '[?]'
+            # The cached paths are relative to the root path, drop them if it changed
+            if cls._location_root is not Config._root_path:
+                cls._location_cache.clear()
+                cls._location_root = Config._root_path
 
             # Go back until we're out of this module
-            while Path(frame.f_code.co_filename).parent.name == THIS_MODULE_NAME:
+            cache = cls._location_cache
+            while frame is not None:
+                # Code files names are interned strings, their hash is cached
+                code_file = frame.f_code.co_filename
+                file_path = cache.get(code_file, _MISSING)
+                if file_path is _MISSING:
+                    file_path = cache[code_file] = cls._resolve_file_path(code_file)
+
+                if file_path is not None:
+                    # Only the line number changes between calls
+                    return file_path, frame.f_lineno
+
                 frame = frame.f_back
-            
-            # Get the formatted relative file path
-            file_path = frame.f_code.co_filename
-
-            # Handle special cases like '<stdin>' from interactive shell
-            if file_path == '<stdin>' or not Path(file_path).exists():
-                return str(file_path), f'[{frame.f_lineno}]'
-        
-            # Get the formatted relative file path
-            try:
-                rel_file_path = Path(file_path).relative_to(Config.ROOT_PATH)
-                f_file_path = '/'.join(rel_file_path.parts)
-            except ValueError:
-                # If we can't make it relative to ROOT_PATH, just use the full path
-                f_file_path = str(Path(file_path))
-
-            # Get and format the line number
-            lineno = f'[{frame.f_lineno}]'
-
-            return f_file_path, lineno
+
+            # If frame is unknown
+            return '<unknown>', None
         finally:
             # Reference cycle prevention
             del frame
 
+    @classmethod
+    def format_code_file(cls, code_file: str) -> str:
+        """
+        Returns the formatted path of a code file, as shown in the messages
+
+        Parameters:
+            code_file (str): the file name of the code
+
+        Returns:
+            str - the file path, (starting from the root of the project)
+        """
+        if cls._location_root is not Config._root_path:
+            cls._location_cache.clear()
+            cls._location_root = Config._root_path
+
+        file_path = cls._location_cache.get(code_file, _MISSING)
+        if file_path is _MISSING:
+            file_path = cls._location_cache[code_file] = cls._resolve_file_path(code_file)
 
+        # Files of this module are not cached with their path
+        return code_file if file_path is None else file_path
 
+    @classmethod
+    def _format_lineno(cls, lineno: Optional[int]) -> str:
+        "Formats the line number in brackets"
+        if lineno is None:
+            return '[?]'
+        return f'[{lineno}]'
 
+    @classmethod
+    def _resolve_file_path(cls, file_path: str) -> Optional[str]:
+        """
+        Returns the formatted file path of a code file, relative to the root path if possible
+
+        Parameters:
+            file_path (str): the file path of the code
+
+        Returns:
+            Optional[str] - the formatted file path, None if the file belongs to this module
+        """
+        if file_path.startswith(THIS_MODULE_PREFIX):
+            return None
+
+        # Handle special cases like '<stdin>' from interactive shell
+        if file_path == '<stdin>' or not Path(file_path).exists():
+            return str(file_path)
+    
+        # Get the formatted relative file path
+        try:
+            rel_file_path = Path(file_path).relative_to(Config.ROOT_PATH)
+            return '/'.join(rel_file_path.parts)
+        except ValueError:
+            # If we can't make it relative to ROOT_PATH, just use the full path
+            return str(Path(file_path))
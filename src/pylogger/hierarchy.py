@@ -0,0 +1,125 @@
+import threading
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+from .config import Config
+from .levels import LevelModel
+
+if TYPE_CHECKING:
+    from .logger import PrefixLogger
+
+
+
+"""
+Hierarchy of the named loggers
+----------------
+The PrefixLoggers can be given a dotted name ('db', 'db.pool') forming a tree, with a level per node
+A logger uses the level of its name, or of its closest parent with one, or 'Config.MIN_LEVEL'
+The effective level of each logger is cached on it, and only computed again when a level changes,
+so that the logging calls never walk the tree
+"""
+
+
+
+class LoggerTree:
+    # Level set per name
+    _levels: dict[str, LevelModel] = {}
+
+    # Loggers per name, '' for the unnamed ones
+    _loggers: dict[str, 'weakref.WeakSet[PrefixLogger]'] = {}
+
+    # Prevents multiple threads concurrencing
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, logger: 'PrefixLogger') -> None:
+        """
+        Adds a logger to the tree, and sets its effective level
+
+        Parameters:
+            logger (PrefixLogger): the logger, its name being its node
+        """
+        name = logger.name or ''
+        with cls._lock:
+            loggers = cls._loggers.get(name)
+            if loggers is None:
+                loggers = cls._loggers[name] = weakref.WeakSet()
+            loggers.add(logger)
+            logger._apply_level(cls._effective_level(name))
+
+    @classmethod
+    def set_level(cls, name: str, level: Optional[LevelModel]) -> None:
+        """
+        Sets the level of a node, its children without a level of their own inherit it
+
+        Parameters:
+            name (str): the dotted name of the node
+            level (Optional[LevelModel]): the level, None to inherit it from the parent again
+        """
+        cls.validate_name(name)
+
+        with cls._lock:
+            if level is None:
+                cls._levels.pop(name, None)
+            else:
+                cls._levels[name] = level
+            cls._refresh(name)
+
+    @classmethod
+    def get_level(cls, name: str) -> LevelModel:
+        """
+        Returns the effective level of a node
+
+        Parameters:
+            name (str): the dotted name of the node
+
+        Returns:
+            LevelModel - its level, or the one of its closest parent with one, or 'Config.MIN_LEVEL'
+        """
+        with cls._lock:
+            return cls._effective_level(name)
+
+    @classmethod
+    def refresh(cls) -> None:
+        """
+        Computes the effective level of every logger again
+        Done automatically by 'Config.set_level'
+        """
+        with cls._lock:
+            cls._refresh(None)
+
+    @staticmethod
+    def validate_name(name: str) -> None:
+        if not isinstance(name, str) or not all(name.split('.')):
+            raise ValueError(f"Invalid logger name {name!r}, expected dotted names like 'db.pool'")
+
+    "Helpers, the lock must be held"
+
+    @classmethod
+    def _effective_level(cls, name: str) -> LevelModel:
+        while name:
+            level = cls._levels.get(name)
+            if level is not None:
+                return level
+            name = name.rpartition('.')[0]
+        return Config.MIN_LEVEL
+
+    @classmethod
+    def _refresh(cls, name: Optional[str]) -> None:
+        """
+        Applies the effective levels to the loggers of a node and its children, or of every node
+
+        Parameters:
+            name (Optional[str]): the node, None for every node
+        """
+        for node, loggers in list(cls._loggers.items()):
+            if name is not None and node != name and not node.startswith(name + '.'):
+                continue
+
+            if not loggers:
+                del cls._loggers[node]
+                continue
+
+            level = cls._effective_level(node)
+            for logger in list(loggers):
+                logger._apply_level(level)
@@ -1,5 +1,3 @@
-from pydantic import BaseModel
-
 from .colors import ColorCombo, Colors
 from .styles import LevelsColors
 
@@ -12,11 +10,34 @@ You can create your own levels by creating a LevelModel instance
 """
 
 
-class LevelModel(BaseModel):
-    name: str
-    color: ColorCombo
-    value: int
+class LevelModel:
+    """
+    Logging level, compared by value
+    The logger compares the integer values directly on the hot path
+    """
+    __slots__ = ("name", "color", "value")
+
+    def __init__(self, *, name: str, color: ColorCombo, value: int, validate: bool = True) -> None:
+        """
+        Parameters:
+            name (str): the name of the level
+            color (ColorCombo): the color of the level
+            value (int): the value of the level, compared to the minimum level
+            validate (bool): whether to check the values, only done here
+        """
+        if validate:
+            if not isinstance(name, str):
+                raise TypeError(f"Level name must be a str, got {type(name).__name__}")
+            if not isinstance(color, ColorCombo):
+                raise TypeError(f"Level color must be a ColorCombo, got {type(color).__name__}")
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"Level value must be an int, got {type(value).__name__}")
+        self.name = name
+        self.color = color
+        self.value = value
 
+    def __repr__(self) -> str:
+        return f"LevelModel(name={self.name!r}, color={self.color!r}, value={self.value!r})"
 
     def __call__(self):
         return self.format()
@@ -1,12 +1,32 @@
 import threading
+import atexit
+import os
 import sys
-from typing import Optional
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional, TYPE_CHECKING
 
 from pathlib import Path
 
+from .buffers import ThreadBuffers
 from .config import Config
+from .context import Fields, get_fields, pop_fields, push_fields
 from .format import Formatting
+from .hierarchy import LoggerTree
 from .levels import LevelModel, Levels
+from .record import LogRecord
+from .multiprocess import ProcessWriter, send_records
+from .policies import CallSitePolicy
+from .rotation import Compressor, RotationPolicy
+from .sinks import Sink, StdoutSink, FileSink
+from .stats import Stats
+from .writer import BackgroundWriter
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+# Exception to log: an exception, a 'sys.exc_info()' tuple, or True for the one being handled
+ExcInfo = Optional[bool | BaseException | tuple]
 
 
 
@@ -21,64 +41,646 @@ You are free to write your own wrapper logging classes, inheriting from the foll
 
 
 
+class _BatchState(threading.local):
+    "Records collected by the current thread's batch, None outside of a batch"
+    records: Optional[list[tuple[LogRecord, tuple[Sink, ...]]]] = None
+
+
+
 "Direct logging class"
 class Logger:
-    # Prevents multiple threads concurrencing
-    _stdout_lock = threading.Lock()
-    _file_lock = threading.Lock()
+    # Background writer, only started in async mode
+    _writer: Optional[BackgroundWriter] = None
+    _writer_lock = threading.Lock()
+
+    # Batch of the current thread, see 'batch'
+    _batch = _BatchState()
+
+    # Multiprocess mode: the central writer in the main process, and the queue to it in the workers
+    _process_writer: Optional[ProcessWriter] = None
+    _process_queue = None
+
+    # Thread buffers mode: the buffers of every thread, and their combiner
+    _thread_buffers: Optional[ThreadBuffers] = None
+
+    # Call site policies in use, with the sinks of their last records, for their pending records, see 'flush'
+    _policies: 'weakref.WeakKeyDictionary[CallSitePolicy, tuple[Sink, ...]]' = weakref.WeakKeyDictionary()
 
     @classmethod
-    def log(cls, message: str, level: LevelModel, prefix: Optional[str] = None) -> str | None:
+    def log(
+        cls,
+        message: str | Callable[[], str],
+        level: LevelModel,
+        prefix: Optional[str] = None,
+        args: tuple = (),
+        exc_info: ExcInfo = None
+    ) -> LogRecord | None:
         """
         Logs the message with the given level and prefix (if the minimum level threshold is met)
-        
+        The message is only built if the threshold is met: pass its arguments separately, or a function returning it
+
         Parameters:
-            message (str): the message to log
+            message (str | Callable[[], str]): the message to log, or a function returning it
             level (LevelModel): the level of the message
             prefix (Optional[str]): the prefix to include in the message
+            args (tuple): the arguments to merge into the message with the '%' operator
+            exc_info (ExcInfo): the exception to log after the message, with its traceback: an exception, a 'sys.exc_info()' tuple,
+                or True for the one being handled. Only rendered when the record gets written
+
+        Returns:
+            LogRecord | None - the record of the message if the level threshold is met, 'str(record)' gives the raw formatted message
+        """
+        # If the level threshold is not met, simply return (after keeping it in the flight recorder, if enabled)
+        if level.value < Config.MIN_LEVEL.value:
+            if Config.FLIGHT_RECORDER is not None:
+                Config.FLIGHT_RECORDER.capture(message=message, level=level, prefix=prefix, args=args, fields=get_fields())
+            return
+
+        exception = None if exc_info is None else cls._get_exception(exc_info)
+        record = Formatting.create_record(message=message, level=level, prefix=prefix, args=args, exception=exception)
+
+        # Limited per call site, the rejected records are never formatted
+        policy = Config.CALL_SITE_POLICY
+        if policy is not None:
+            return cls._log_filtered(record, policy, Config.active_sinks())
+
+        # Write the context leading to the error first
+        recorder = Config.FLIGHT_RECORDER
+        if recorder is not None and recorder.is_triggered_by(level):
+            cls.dump_flight_recorder()
+
+        if Config.STATS:
+            Stats.count_level(level.name)
+
+        cls._dispatch(record, Config.active_sinks())
+
+        return record
+
+    @classmethod
+    def log_record(cls, record: LogRecord) -> LogRecord | None:
+        """
+        Logs a record built elsewhere, with its own time and location, such as one from the 'logging' module, see 'StdlibHandler'
+
+        Parameters:
+            record (LogRecord): the record to log
+
+        Returns:
+            LogRecord | None - the record if the level threshold is met
+        """
+        if record.level.value < Config.MIN_LEVEL.value:
+            return
+
+        policy = Config.CALL_SITE_POLICY
+        if policy is not None:
+            return cls._log_filtered(record, policy, Config.active_sinks())
+
+        recorder = Config.FLIGHT_RECORDER
+        if recorder is not None and recorder.is_triggered_by(record.level):
+            cls.dump_flight_recorder()
+
+        if Config.STATS:
+            Stats.count_level(record.level.name)
+
+        cls._dispatch(record, Config.active_sinks())
+
+        return record
+
+    @staticmethod
+    def _get_exception(exc_info: ExcInfo) -> Optional[BaseException]:
+        "Returns the exception of an 'exc_info' argument"
+        if exc_info is True:
+            return sys.exc_info()[1]
+        if isinstance(exc_info, tuple):
+            return exc_info[1]
+        if isinstance(exc_info, BaseException):
+            return exc_info
+        return None
+
+    @classmethod
+    def _log_filtered(cls, record: LogRecord, policy: CallSitePolicy, sinks: tuple[Sink, ...]) -> LogRecord | None:
+        """
+        Logs what the call site policy keeps of the record
+
+        Parameters:
+            record (LogRecord): the captured record
+            policy (CallSitePolicy): the policy of the logger
+            sinks (tuple[Sink, ...]): the sinks to write to
+
+        Returns:
+            LogRecord | None - the record if it was kept
+        """
+        # Remembered for the pending records of the policy
+        if Logger._policies.get(policy) is not sinks:
+            Logger._policies[policy] = sinks
+
+        records = policy.filter(record)
+        logged = bool(records) and records[-1] is record
+
+        # Counted once the policy decided, so that the counts match what the sinks wrote
+        if Config.STATS:
+            if not logged:
+                Stats.count_dropped(record.level.name)
+            for kept in records:
+                Stats.count_level(kept.level.name)
+
+        if not records:
+            return None
+
+        recorder = Config.FLIGHT_RECORDER
+        if recorder is not None and recorder.is_triggered_by(record.level):
+            cls.dump_flight_recorder()
+
+        for kept in records:
+            cls._dispatch(kept, sinks)
+
+        return record if logged else None
+
+    @classmethod
+    def is_enabled(cls, level: LevelModel) -> bool:
+        """
+        Returns whether a message of the given level would be logged
+        Use it to skip expensive diagnostics
+
+        Parameters:
+            level (LevelModel): the level to check
+
+        Returns:
+            bool - whether the level threshold is met
+        """
+        return level.value >= Config.MIN_LEVEL.value
+
+    @classmethod
+    def bind(cls, **fields: Any) -> 'PrefixLogger':
+        """
+        Returns a logger adding the given fields to its records, on top of the ones of the current context
+        The fields are rendered after the prefix as 'key=value' pairs, and written as such in the json and binary log files
+        Cheap enough to be called for each request
+
+        Usage:
+            request_logger = Logger.bind(request_id=request.id)
+            request_logger.info("served")
+
+        Parameters:
+            **fields (Any): the fields to add
+
+        Returns:
+            PrefixLogger - the logger, without prefix
+        """
+        return PrefixLogger(prefix=None, fields=fields)
+
+    @classmethod
+    @contextmanager
+    def contextualize(cls, **fields: Any) -> Iterator[None]:
+        """
+        Adds the given fields to the records logged in the block, from any logger, see 'bind'
+        The fields belong to the current context: they follow the asyncio tasks created in the block,
+        but not the threads, unless they are run with 'contextvars.copy_context().run'
+
+        Usage:
+            with Logger.contextualize(request_id=request.id):
+                Logger.info("served")
+
+        Parameters:
+            **fields (Any): the fields to add, replacing the ones with the same name
+        """
+        token = push_fields(fields)
+        try:
+            yield
+        finally:
+            pop_fields(token)
+
+    @classmethod
+    def dump_flight_recorder(cls) -> int:
+        """
+        Writes the records kept by the flight recorder, to the log file if set, to the terminal otherwise
+        Done automatically when a record of the trigger level is logged, see 'Config.set_flight_recorder'
+
+        Returns:
+            int - the amount of records written
+        """
+        recorder = Config.FLIGHT_RECORDER
+        if recorder is None:
+            return 0
+
+        records = recorder.drain()
+        if records:
+            log_sink = Config.log_file_sink()
+            sinks = (log_sink,) if log_sink is not None else (StdoutSink.get(),)
+            cls._dispatch_many([(record, sinks) for record in records])
+        return len(records)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Returns the statistics gathered since they were enabled or reset, see 'Config.set_stats'
+            since: when the statistics were last reset, as a timestamp
+            levels: the amount of records logged, per level name
+            sinks: the amount of records and the time spent, per sink
+            stages: per stage of a logging call (see the stats module), its count, its total, mean and max time,
+                and its histogram: the amount of calls per upper bound, in nanoseconds
+
+        Returns:
+            dict - the statistics
+        """
+        return Stats.snapshot()
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        Resets the statistics
+        """
+        Stats.reset()
+
+    @classmethod
+    def _dispatch(cls, record: LogRecord, sinks: tuple[Sink, ...]) -> None:
+        """
+        Passes the record to the sinks on the caller's thread, or enqueues it for the background writer in async mode
+
+        Parameters:
+            record (LogRecord): the record to write
+            sinks (tuple[Sink, ...]): the sinks to write it to
+        """
+        # Collected by the current batch
+        batch = cls._batch.records
+        if batch is not None:
+            record.freeze()
+            batch.append((record, sinks))
+            return
+
+        # Worker process, sent to the central writer
+        if cls._process_queue is not None:
+            send_records(cls._process_queue, [(record, sinks)])
+            return
+
+        if Config.ASYNC:
+            # Build the message now, the arguments could be modified by the caller afterwards
+            # The traceback is rendered by the background writer
+            record.freeze()
+            cls._get_writer().put((record, sinks))
+            return
+
+        # Appended to the buffer of the current thread, see 'Config.set_thread_buffers'
+        if cls._thread_buffers is not None:
+            cls._thread_buffers.put(record, sinks)
+            return
+
+        # Async mode got disabled, write the pending records first to keep the order
+        if cls._writer is not None:
+            cls._stop_writer()
+
+        if Config.STATS:
+            for sink in sinks:
+                Stats.emit(sink, record)
+            return
+
+        for sink in sinks:
+            sink.emit(record)
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """
+        Collects the records logged by the current thread in the block, from any logger,
+        then writes them together: each sink gets a single write, in order, without records of other threads in between
+        Nested batches are part of the outermost one
+
+        Usage:
+            with Logger.batch():
+                Logger.info("first")
+                prefix_logger.info("second")
+        """
+        state = Logger._batch
+
+        # Already in a batch
+        if state.records is not None:
+            yield
+            return
+
+        state.records = []
+        try:
+            yield
+        finally:
+            records = state.records
+            state.records = None
+
+            if records:
+                cls._dispatch_many(records)
+
+    @classmethod
+    def log_many(cls, records: Iterable[tuple[str | Callable[[], str], LevelModel]], prefix: Optional[str] = None) -> None:
+        """
+        Logs multiple messages at once, see 'batch'
+
+        Parameters:
+            records (Iterable[tuple[str | Callable[[], str], LevelModel]]): the messages to log, with their level
+            prefix (Optional[str]): the prefix to include in the messages
+        """
+        with cls.batch():
+            for message, level in records:
+                cls.log(message=message, level=level, prefix=prefix)
+
+    @classmethod
+    def _dispatch_many(cls, records: list[tuple[LogRecord, tuple[Sink, ...]]]) -> None:
+        """
+        Writes a batch of records, or enqueues it as a whole for the background writer in async mode
+
+        Parameters:
+            records (list[tuple[LogRecord, tuple[Sink, ...]]]): the records to write, with their sinks
+        """
+        if cls._process_queue is not None:
+            send_records(cls._process_queue, records)
+            return
+
+        if Config.ASYNC:
+            cls._get_writer().put(records)
+            return
+
+        if cls._writer is not None:
+            cls._stop_writer()
+
+        # Written as a whole, after the records buffered so far
+        if cls._thread_buffers is not None:
+            cls._thread_buffers.flush()
+
+        cls._emit_many(records)
+
+    @classmethod
+    def _write_queued(cls, items: list[tuple[LogRecord, tuple[Sink, ...]] | list[tuple[LogRecord, tuple[Sink, ...]]]]) -> None:
+        """
+        Writes the items drained by the background writer: single records, or whole batches
+
+        Parameters:
+            items (list): the items to write
+        """
+        records = []
+        for item in items:
+            if isinstance(item, list):
+                records += item
+            else:
+                records.append(item)
+        cls._emit_many(records)
+
+    @classmethod
+    def _emit_many(cls, batch: list[tuple[LogRecord, tuple[Sink, ...]]]) -> None:
+        """
+        Writes a batch of records
+        Each sink gets all of its records at once, in order
+
+        Parameters:
+            batch (list[tuple[LogRecord, tuple[Sink, ...]]]): the records to write, with their sinks
+        """
+        records_per_sink: dict[Sink, list[LogRecord]] = {}
+        for record, sinks in batch:
+            for sink in sinks:
+                records = records_per_sink.get(sink)
+                if records is None:
+                    records = records_per_sink[sink] = []
+                records.append(record)
+
+        if Config.STATS:
+            for sink, records in records_per_sink.items():
+                Stats.emit_many(sink, records)
+            return
+
+        for sink, records in records_per_sink.items():
+            sink.emit_many(records)
+
+    @classmethod
+    def _get_writer(cls) -> BackgroundWriter:
+        """
+        Returns the background writer, starting it if needed
 
         Returns:
-            str | None - the raw formatted message, if the level threshold is met
+            BackgroundWriter - the background writer
+        """
+        writer = cls._writer
+        if writer is None:
+            with Logger._writer_lock:
+                if Logger._writer is None:
+                    Logger._writer = BackgroundWriter(handler=Logger._write_queued)
+                writer = Logger._writer
+        return writer
+
+    @classmethod
+    def _stop_writer(cls) -> None:
         """
-        # If the level threshold is not met, simply return
-        if level < Config.MIN_LEVEL:
+        Writes the pending records and stops the background writer
+        """
+        with Logger._writer_lock:
+            writer = Logger._writer
+            Logger._writer = None
+
+        if writer is not None:
+            writer.shutdown()
+
+    @classmethod
+    def _start_process_writer(cls, context: Optional['BaseContext'] = None) -> None:
+        """
+        Starts the central writer of the multiprocess mode, in the current process
+        The processes forked afterwards send their records to it
+
+        Parameters:
+            context (Optional[BaseContext]): the multiprocessing context of the workers
+        """
+        # Already a worker, or already started
+        if Logger._process_queue is not None or Logger._process_writer is not None:
             return
-        
-        formatted_message = Formatting.format(message=message, level=level, prefix=prefix)
-        raw_message = Formatting.raw_format(message=message, level=level, prefix=prefix)
-
-        with cls._stdout_lock:
-            sys.stdout.write(formatted_message + "\n")
-            sys.stdout.flush()
-        
-        if Config.LOG_FILE is not None:
-            with cls._file_lock:
-                with Config.LOG_FILE.open(mode='a') as f:
-                    f.write(raw_message + "\n")
-        
-        return raw_message
+
+        Logger._process_writer = ProcessWriter(handler=Logger._emit_many, context=context)
+
+    @classmethod
+    def _stop_process_writer(cls) -> None:
+        """
+        Writes the records already sent by the workers, and stops the central writer
+        """
+        writer = Logger._process_writer
+        Logger._process_writer = None
+
+        if writer is not None:
+            writer.stop()
+
+    @classmethod
+    def _start_thread_buffers(cls, size: int, interval: Optional[float], flush_level: Optional[LevelModel]) -> None:
+        """
+        Starts the thread buffers mode, replacing the previous buffers if any
+
+        Parameters:
+            size (int): the amount of records of a thread buffer combining them all
+            interval (Optional[float]): combine the buffers at least every this many seconds
+            flush_level (Optional[LevelModel]): combine the buffers right away on records of this level or higher
+        """
+        cls._stop_thread_buffers()
+        Logger._thread_buffers = ThreadBuffers(handler=Logger._emit_many, size=size, interval=interval, flush_level=flush_level)
+
+    @classmethod
+    def _stop_thread_buffers(cls) -> None:
+        """
+        Writes the buffered records, and stops the thread buffers mode
+        """
+        buffers = Logger._thread_buffers
+        Logger._thread_buffers = None
+
+        if buffers is not None:
+            buffers.stop()
+
+    @classmethod
+    def process_queue(cls):
+        """
+        Returns the queue to the central writer, starting it if needed
+        Pass it to 'init_worker' in the processes that are not forked (spawn or forkserver start methods)
+
+        Returns:
+            multiprocessing.Queue - the queue to the central writer
+        """
+        if Logger._process_queue is not None:
+            return Logger._process_queue
+
+        cls._start_process_writer()
+        return Logger._process_writer.queue
+
+    @classmethod
+    def init_worker(cls, process_queue) -> None:
+        """
+        Makes the current process send its records to the central writer
+        Use it as the initializer of the workers that are not forked:
+            ProcessPoolExecutor(initializer=Logger.init_worker, initargs=(Logger.process_queue(),))
+
+        Parameters:
+            process_queue (multiprocessing.Queue): the queue returned by 'process_queue' in the main process
+        """
+        Logger._process_queue = process_queue
+
+    @classmethod
+    def _before_fork(cls) -> None:
+        """
+        Flushes the file buffers, so that the child process does not write them again
+        """
+        if Logger._thread_buffers is not None:
+            Logger._thread_buffers.flush()
+
+        FileSink.flush_all()
+        StdoutSink.get().flush()
+
+    @classmethod
+    def _after_fork_in_child(cls) -> None:
+        """
+        Reinitializes the locks and the writers in the child process, since only the forking thread survives
+        The records still enqueued belong to the parent process, which writes them
+        """
+        Logger._writer_lock = threading.Lock()
+        Logger._writer = None
+        Logger._batch = _BatchState()
+
+        StdoutSink.get().reset_after_fork()
+        FileSink.reset_all_after_fork()
+        Compressor.reset_after_fork()
+        Stats.reset_after_fork()
+        if Logger._thread_buffers is not None:
+            Logger._thread_buffers.reset_after_fork()
+        if Config.CALL_SITE_POLICY is not None:
+            Config.CALL_SITE_POLICY.reset_after_fork()
+        for sink in Config.SINKS:
+            sink.reset_after_fork()
+
+        # The child becomes a worker of the central writer
+        if Logger._process_writer is not None:
+            Logger._process_queue = Logger._process_writer.queue
+            Logger._process_writer = None
+
+    @classmethod
+    def flush(cls) -> None:
+        """
+        Blocks until every record logged so far has been written
+        """
+        cls._flush_policies()
+
+        writer = Logger._writer
+        if writer is not None:
+            writer.flush()
+
+        if Logger._thread_buffers is not None:
+            Logger._thread_buffers.flush()
+
+        for sink in Config.active_sinks():
+            sink.flush()
+
+        FileSink.flush_all()
+
+    @classmethod
+    def _flush_policies(cls) -> None:
+        "Logs the pending records of the call site policies, such as the repeats counted by 'Deduplicate'"
+        for policy in list(Logger._policies.keys()):
+            cls._flush_policy(policy)
+
+    @classmethod
+    def _flush_policy(cls, policy: CallSitePolicy) -> None:
+        "Logs the pending records of a call site policy, to the sinks of its last records, also called when the policy gets replaced"
+        sinks = Logger._policies.get(policy)
+        if sinks is None:
+            return
+
+        for record in policy.flush():
+            if Config.STATS:
+                Stats.count_level(record.level.name)
+            cls._dispatch(record, sinks)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Writes the pending records, stops the background writer and closes the sinks
+        Called automatically on exit, logging again afterwards starts a new writer and reopens the files
+        """
+        # The pending and buffered records first, they could go to the background writers
+        cls._flush_policies()
+        if Logger._thread_buffers is not None:
+            Logger._thread_buffers.flush()
+
+        cls._stop_writer()
+        cls._stop_process_writer()
+
+        # Worker process, make sure the records sent are not lost
+        if Logger._process_queue is not None:
+            Logger._process_queue.close()
+            Logger._process_queue.join_thread()
+            Logger._process_queue = None
+
+        for sink in Config.active_sinks():
+            sink.close()
+
+        FileSink.close_all()
+
+        # Finish compressing the rotated files
+        Compressor.shutdown()
 
     "Logger methods for each level"
 
     @classmethod
-    def debug(cls, message: str, prefix: Optional[str] = None) -> None:
-        cls.log(message=message, level=Levels.DEBUG, prefix=prefix)
-    
+    def debug(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None, exc_info: ExcInfo = None) -> None:
+        cls.log(message=message, level=Levels.DEBUG, prefix=prefix, args=args, exc_info=exc_info)
+
     @classmethod
-    def info(cls, message: str, prefix: Optional[str] = None) -> None:
-        cls.log(message=message, level=Levels.INFO, prefix=prefix)
-    
+    def info(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None, exc_info: ExcInfo = None) -> None:
+        cls.log(message=message, level=Levels.INFO, prefix=prefix, args=args, exc_info=exc_info)
+
     @classmethod
-    def warning(cls, message: str, prefix: Optional[str] = None) -> None:
-        cls.log(message=message, level=Levels.WARNING, prefix=prefix)
-    
+    def warning(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None, exc_info: ExcInfo = None) -> None:
+        cls.log(message=message, level=Levels.WARNING, prefix=prefix, args=args, exc_info=exc_info)
+
     @classmethod
-    def error(cls, message: str, prefix: Optional[str] = None) -> None:
-        cls.log(message=message, level=Levels.ERROR, prefix=prefix)
-    
+    def error(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None, exc_info: ExcInfo = None) -> None:
+        cls.log(message=message, level=Levels.ERROR, prefix=prefix, args=args, exc_info=exc_info)
+
     @classmethod
-    def fatal(cls, message: str, prefix: Optional[str] = None) -> None:
-        cls.log(message=message, level=Levels.FATAL, prefix=prefix)
+    def fatal(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None, exc_info: ExcInfo = None) -> None:
+        cls.log(message=message, level=Levels.FATAL, prefix=prefix, args=args, exc_info=exc_info)
+
+    @classmethod
+    def exception(cls, message: str | Callable[[], str], *args, prefix: Optional[str] = None) -> None:
+        """
+        Logs the message in error mode, followed by the exception being handled and its traceback
+        Call it from an 'except' block
+        """
+        cls.log(message=message, level=Levels.ERROR, prefix=prefix, args=args, exc_info=True)
 
 
 "Instance logging, with prefix"
@@ -91,66 +693,219 @@ class PrefixLogger(Logger):
     WARNING: The prefix should be already formatted when given
     """
 
-    def __init__(self, prefix: str, log_file: Optional[str | Path] = None) -> None:
+    def __init__(
+        self,
+        prefix: Optional[str],
+        log_file: Optional[str | Path] = None,
+        file_format: Optional[str] = None,
+        rotation: Optional[RotationPolicy] = None,
+        policy: Optional[CallSitePolicy] = None,
+        name: Optional[str] = None,
+        fields: Optional[dict[str, Any]] = None
+    ) -> None:
         """
         Parameters:
-            prefix (str): the formatted prefix to include in the log messages
+            prefix (Optional[str]): the formatted prefix to include in the log messages, None for no prefix
             log_file (Optional[str | Path]): the path to the log file
+            file_format (Optional[str]): the format of the log file, see 'FileFormats', defaults to 'Config.FILE_FORMAT'
+            rotation (Optional[RotationPolicy]): when to rotate the log file, see 'RotationPolicy', never by default
+            policy (Optional[CallSitePolicy]): limits the records logged from each call site, see the policies module, defaults to 'Config.CALL_SITE_POLICY'
+            name (Optional[str]): the dotted name of the logger in the tree of loggers ('db.pool'), see 'set_level'
+            fields (Optional[dict[str, Any]]): the fields to add to the records, see 'bind'
         """
 
-        self.prefix: str = prefix
+        if name is not None:
+            LoggerTree.validate_name(name)
+
+        self.prefix: Optional[str] = prefix
+        self.fields: Optional[Fields] = Fields(fields) if fields else None
+        self.policy: Optional[CallSitePolicy] = policy
+        self.name: Optional[str] = name
 
         if isinstance(log_file, str):
             log_file = Path(log_file)
-        
+
         if isinstance(log_file, Path):
             log_file = Config.ROOT_PATH / log_file
-        
+
         self.log_file: Optional[Path] = log_file
-        self._file_lock: Optional[threading.Lock] = None
+        self._file_sink: Optional[FileSink] = None
+
+        # Sinks of this logger only, on top of the ones from the config
+        self._sinks: tuple[Sink, ...] = ()
 
+        # Shares the handle with the other loggers writing to the same file
         if log_file is not None:
-            self._file_lock = threading.Lock()
-    
+            self._file_sink = Config.get_file_sink(log_file, file_format=file_format, rotation=rotation)
+            self._sinks = (self._file_sink,)
+
+        # Effective level and per level flags, kept up to date by the tree
+        self.level: LevelModel = Config.MIN_LEVEL
+        self._threshold: int = self.level.value
+        self._debug_enabled = self._info_enabled = self._warning_enabled = self._error_enabled = self._fatal_enabled = True
+        LoggerTree.register(self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The pending records of the policy replaced get logged first
+        if name == "policy":
+            previous = self.__dict__.get(name)
+            if previous is not None and previous is not value:
+                self._flush_policy(previous)
+
+        super().__setattr__(name, value)
+
+    def bind(self, **fields: Any) -> 'PrefixLogger':
+        """
+        Returns a copy of this logger, sharing its sinks and its level, adding the given fields to its records, see 'Logger.bind'
+
+        Parameters:
+            **fields (Any): the fields to add, replacing the ones with the same name
+
+        Returns:
+            PrefixLogger - the logger
+        """
+        # Cheaper than 'copy.copy'
+        logger = object.__new__(type(self))
+        logger.__dict__.update(self.__dict__)
+        logger.fields = Fields(fields) if self.fields is None else self.fields.merge(fields)
+        LoggerTree.register(logger)
+        return logger
+
+    def set_level(self, level: Optional[LevelModel]) -> None:
+        """
+        Sets the minimum level of the loggers with this name, and of their children without a level of their own
+        Same as 'Config.set_logger_level(name, level)'
+
+        Parameters:
+            level (Optional[LevelModel]): the level to set as the minimum, None to inherit it from the parent again
+        """
+        if self.name is None:
+            raise ValueError("Only named loggers have a level of their own, use 'Config.set_level' for the others")
+        LoggerTree.set_level(self.name, level)
 
-    def log(self, message: str, level: LevelModel) -> str | None:
+    def is_enabled(self, level: LevelModel) -> bool:
         """
-        Passes the call to the parent log method with the instance prefix, then logs to the file, if set
-        
+        Returns whether a message of the given level would be logged by this logger
+
+        Parameters:
+            level (LevelModel): the level to check
+
+        Returns:
+            bool - whether the level threshold of the logger is met
+        """
+        return level.value >= self._threshold
+
+    def _apply_level(self, level: LevelModel) -> None:
+        "Caches the effective level, called by the tree when it changes"
+        value = level.value
+        self.level = level
+        self._threshold = value
+        self._debug_enabled = Levels.DEBUG.value >= value
+        self._info_enabled = Levels.INFO.value >= value
+        self._warning_enabled = Levels.WARNING.value >= value
+        self._error_enabled = Levels.ERROR.value >= value
+        self._fatal_enabled = Levels.FATAL.value >= value
+
+
+    def log(self, message: str | Callable[[], str], level: LevelModel, args: tuple = (), exc_info: ExcInfo = None) -> LogRecord | None:
+        """
+        Logs the message with the instance prefix, also to the instance file, if set
+
         Parameters:
-            message (str): the message to log
+            message (str | Callable[[], str]): the message to log, or a function returning it
             level (LevelModel): the level of the message
-        
+            args (tuple): the arguments to merge into the message with the '%' operator
+            exc_info (ExcInfo): the exception to log after the message, with its traceback: an exception, a 'sys.exc_info()' tuple,
+                or True for the one being handled. Only rendered when the record gets written
+
         Returns:
-            str | None - the raw formatted message, if the level threshold is met
+            LogRecord | None - the record of the message if the level threshold is met, 'str(record)' gives the raw formatted message
         """
-        # If the level threshold is not met, simply return
-        if level < Config.MIN_LEVEL:
+        # If the level threshold of the logger is not met, simply return (after keeping it in the flight recorder, if enabled)
+        if level.value < self._threshold:
+            if Config.FLIGHT_RECORDER is not None:
+                Config.FLIGHT_RECORDER.capture(message=message, level=level, prefix=self.prefix, args=args, fields=get_fields(self.fields))
             return
-        
-        # Log to terminal and get raw message
-        raw_message = super().log(message=message, level=level, prefix=self.prefix)
-
-        # If provided, log to the file
-        if self.log_file is not None:
-            with self._file_lock:
-                with self.log_file.open(mode='a') as f:
-                    f.write(raw_message + "\n")
-    
-    "Logger methods for each level"
 
-    def debug(self, message: str) -> None:
-        self.log(message=message, level=Levels.DEBUG)
-    
-    def info(self, message: str) -> None:
-        self.log(message=message, level=Levels.INFO)
-    
-    def warning(self, message: str) -> None:
-        self.log(message=message, level=Levels.WARNING)
-    
-    def error(self, message: str) -> None:
-        self.log(message=message, level=Levels.ERROR)
-
-    def fatal(self, message: str) -> None:
-        self.log(message=message, level=Levels.FATAL)
-    
+        exception = None if exc_info is None else self._get_exception(exc_info)
+        record = Formatting.create_record(message=message, level=level, prefix=self.prefix, args=args, exception=exception, fields=self.fields)
+
+        # Limited per call site, the rejected records are never formatted
+        policy = self.policy if self.policy is not None else Config.CALL_SITE_POLICY
+        if policy is not None:
+            return self._log_filtered(record, policy, Config.active_sinks() + self._sinks)
+
+        # Write the context leading to the error first
+        recorder = Config.FLIGHT_RECORDER
+        if recorder is not None and recorder.is_triggered_by(level):
+            self.dump_flight_recorder()
+
+        if Config.STATS:
+            Stats.count_level(level.name)
+
+        self._dispatch(record, Config.active_sinks() + self._sinks)
+
+        return record
+
+    def log_many(self, records: Iterable[tuple[str | Callable[[], str], LevelModel]]) -> None:
+        """
+        Logs multiple messages at once with the instance prefix, see 'batch'
+
+        Parameters:
+            records (Iterable[tuple[str | Callable[[], str], LevelModel]]): the messages to log, with their level
+        """
+        with self.batch():
+            for message, level in records:
+                self.log(message=message, level=level)
+
+    "Logger methods for each level, checking the cached flag of the level first"
+
+    def debug(self, message: str | Callable[[], str], *args, exc_info: ExcInfo = None) -> None:
+        if self._debug_enabled:
+            self.log(message=message, level=Levels.DEBUG, args=args, exc_info=exc_info)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.DEBUG, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+    def info(self, message: str | Callable[[], str], *args, exc_info: ExcInfo = None) -> None:
+        if self._info_enabled:
+            self.log(message=message, level=Levels.INFO, args=args, exc_info=exc_info)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.INFO, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+    def warning(self, message: str | Callable[[], str], *args, exc_info: ExcInfo = None) -> None:
+        if self._warning_enabled:
+            self.log(message=message, level=Levels.WARNING, args=args, exc_info=exc_info)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.WARNING, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+    def error(self, message: str | Callable[[], str], *args, exc_info: ExcInfo = None) -> None:
+        if self._error_enabled:
+            self.log(message=message, level=Levels.ERROR, args=args, exc_info=exc_info)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.ERROR, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+    def fatal(self, message: str | Callable[[], str], *args, exc_info: ExcInfo = None) -> None:
+        if self._fatal_enabled:
+            self.log(message=message, level=Levels.FATAL, args=args, exc_info=exc_info)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.FATAL, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+    def exception(self, message: str | Callable[[], str], *args) -> None:
+        """
+        Logs the message in error mode, followed by the exception being handled and its traceback
+        Call it from an 'except' block
+        """
+        if self._error_enabled:
+            self.log(message=message, level=Levels.ERROR, args=args, exc_info=True)
+        elif Config.FLIGHT_RECORDER is not None:
+            Config.FLIGHT_RECORDER.capture(message=message, level=Levels.ERROR, prefix=self.prefix, args=args, fields=get_fields(self.fields))
+
+
+
+
+# Make sure no record is lost on exit
+atexit.register(Logger.shutdown)
+
+# Keep the locks, buffers and writers consistent in forked processes
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=Logger._before_fork, after_in_child=Logger._after_fork_in_child)
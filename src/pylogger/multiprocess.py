@@ -0,0 +1,186 @@
+import os
+import queue
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from .config import Config
+from .context import Fields
+from .levels import LevelModel, Levels
+from .record import LogRecord
+from .sinks import Sink, StdoutSink, FileSink
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+
+
+"""
+Multiprocess logging
+----------------
+The worker processes send compact records through a multiprocessing queue,
+and a thread of the main process writes them to the terminal and the log files
+The records going to the default sinks are written to the ones of the main process (its terminal and log file),
+a spawned worker never configured them, only the files of the PrefixLogger instances are sent by path
+The other sinks are still called by the worker processes themselves
+"""
+
+
+
+class ProcessWriter:
+    # Maximum amount of records handed to the handler at once
+    BATCH_SIZE: int = 1024
+
+    def __init__(self, handler: Callable[[list[tuple[LogRecord, tuple[Sink, ...]]]], None], context: Optional['BaseContext'] = None) -> None:
+        """
+        Parameters:
+            handler (Callable): the function writing a batch of records, with their sinks
+            context (Optional[BaseContext]): the multiprocessing context to create the queue with
+        """
+        # Only needed once the mode is enabled, slow to import
+        import multiprocessing
+
+        self.handler = handler
+
+        # Only the process that created the writer runs it
+        self.owner_pid = os.getpid()
+        self.queue = (context or multiprocessing.get_context()).Queue()
+
+        self._thread = threading.Thread(target=self._run, name="pylogger-process-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def encode(cls, record: LogRecord, sinks: tuple[Sink, ...]) -> tuple:
+        """
+        Turns a record into a compact tuple to send to the writer
+        Only the terminal and the file sinks are kept, the default sinks of the worker are replaced by a marker
+
+        Parameters:
+            record (LogRecord): the record
+            sinks (tuple[Sink, ...]): the sinks of the record
+
+        Returns:
+            tuple - the encoded record
+        """
+        level = record.level
+
+        # Default levels are sent by name
+        level_ref = level.name if getattr(Levels, level.name, None) is level else level
+
+        # The default sinks come first, see 'Logger.log' and 'PrefixLogger.log'
+        defaults = Config.active_sinks()
+        to_defaults = sinks[:len(defaults)] == defaults
+        if to_defaults:
+            sinks = sinks[len(defaults):]
+
+        to_stdout = False
+        files = []
+        for sink in sinks:
+            if isinstance(sink, StdoutSink):
+                to_stdout = True
+            elif isinstance(sink, FileSink):
+                files.append((str(sink.path), sink.file_format))
+
+        # Values of any other type are sent as strings, they may not be picklable
+        fields = None if record.fields is None else record.fields.plain()
+
+        return (record.get_message(), level_ref, record.prefix, record.time, record.path, record.lineno, fields, to_defaults, to_stdout, tuple(files))
+
+    @classmethod
+    def decode(cls, item: tuple) -> tuple[LogRecord, tuple[Sink, ...]]:
+        """
+        Turns an encoded record back into a record, with its sinks
+
+        Parameters:
+            item (tuple): the encoded record
+
+        Returns:
+            tuple[LogRecord, tuple[Sink, ...]] - the record and its sinks
+        """
+        message, level_ref, prefix, time, path, lineno, fields, to_defaults, to_stdout, files = item
+
+        level: LevelModel = getattr(Levels, level_ref) if isinstance(level_ref, str) else level_ref
+        record = LogRecord(
+            message=message, level=level, prefix=prefix, time=time, path=path, lineno=lineno,
+            fields=None if fields is None else Fields(fields)
+        )
+
+        sinks = tuple(Config.get_file_sink(Path(file), file_format=file_format) for file, file_format in files)
+        if to_stdout:
+            sinks = (StdoutSink.get(),) + sinks
+
+        # The terminal and the log file of the main process, the custom sinks were called by the worker
+        if to_defaults:
+            defaults = tuple(sink for sink in Config.active_sinks() if not cls.is_local(sink))
+            sinks = defaults + tuple(sink for sink in sinks if sink not in defaults)
+
+        return record, sinks
+
+    @classmethod
+    def is_local(cls, sink: Sink) -> bool:
+        "Whether the sink is called by the worker process itself"
+        return not isinstance(sink, (StdoutSink, FileSink))
+
+    def stop(self) -> None:
+        """
+        Writes the records already sent, and stops the writer thread
+        """
+        if os.getpid() != self.owner_pid or not self._thread.is_alive():
+            return
+
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """
+        Writer thread loop
+        Waits for a record, then takes everything else already waiting as the same batch
+        A single item can also be a whole batch from a worker
+        """
+        while True:
+            items = [self.queue.get()]
+            try:
+                while len(items) < self.BATCH_SIZE:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            records = []
+            for item in items:
+                if isinstance(item, list):
+                    records += [self.decode(encoded) for encoded in item]
+                elif item is not None:
+                    records.append(self.decode(item))
+
+            try:
+                if records:
+                    self.handler(records)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+            # Stop marker
+            if None in items:
+                return
+
+
+
+def send_records(process_queue: Any, items: list[tuple[LogRecord, tuple[Sink, ...]]]) -> None:
+    """
+    Sends records to the writer through its queue, from a worker process
+    The sinks that are not handled by the writer are called right away
+    Multiple records are sent as a single item, so that they are written together
+
+    Parameters:
+        process_queue (Any): the queue of the writer
+        items (list[tuple[LogRecord, tuple[Sink, ...]]]): the records, with their sinks
+    """
+    encoded = []
+    for record, sinks in items:
+        for sink in sinks:
+            if ProcessWriter.is_local(sink):
+                sink.emit(record)
+        encoded.append(ProcessWriter.encode(record, sinks))
+
+    process_queue.put(encoded[0] if len(encoded) == 1 else encoded)
@@ -0,0 +1,377 @@
+import collections
+import errno
+import socket
+import sys
+import threading
+import traceback
+from typing import Optional
+
+from .encoders import Encoder, FileFormats, create_encoder
+from .format import Formatting
+from .levels import LevelModel
+from .record import LogRecord
+from .sinks import Sink
+
+
+
+"""
+Network sink, for a local collector agent
+----------------
+SocketSink: sends the records over UDP, TCP or a Unix domain socket, in the text or json format, optionally as syslog messages
+The records are encoded on the logging thread and queued, a sender thread packs them into few datagrams or writes,
+through a persistent connection, reconnected with an exponential backoff when it fails
+While the collector is down, the queued records are kept in a bounded spill buffer, the oldest ones are dropped first
+----------------
+Framing of the records:
+    streams (tcp, unix): each record ends with a line break, a json record is always a single line,
+        a text record spans multiple lines when its message does (tracebacks), prefer json to split them reliably
+    datagrams (udp, unix_dgram): whole records, each ending with a line break, packed up to 'datagram_size' bytes
+    syslog (with a facility): one message per datagram without line break (RFC 5426),
+        and octet counting over the streams, each message preceded by its length and a space (RFC 6587)
+"""
+
+
+
+class Protocols:
+    UDP = "udp"
+    TCP = "tcp"
+    # Unix domain sockets, stream or datagram ('/dev/log')
+    UNIX = "unix"
+    UNIX_DGRAM = "unix_dgram"
+
+
+# Socket family and type per protocol
+SOCKET_TYPES: dict[str, tuple[int, int]] = {
+    Protocols.UDP: (socket.AF_INET, socket.SOCK_DGRAM),
+    Protocols.TCP: (socket.AF_INET, socket.SOCK_STREAM),
+    Protocols.UNIX: (getattr(socket, "AF_UNIX", -1), socket.SOCK_STREAM),
+    Protocols.UNIX_DGRAM: (getattr(socket, "AF_UNIX", -1), socket.SOCK_DGRAM)
+}
+
+# Syslog severity per level value, the custom levels get the closest one
+SEVERITIES: dict[int, int] = {
+    0: 7,  # DEBUG: debug
+    1: 6,  # INFO: informational
+    2: 4,  # WARNING: warning
+    3: 3,  # ERROR: error
+    4: 2   # FATAL: critical
+}
+
+
+
+class SocketSink(Sink):
+    def __init__(
+        self,
+        address: str | tuple[str, int],
+        protocol: str = Protocols.UDP,
+        file_format: str = FileFormats.TEXT,
+        facility: Optional[int] = None,
+        ident: Optional[str] = None,
+        batch_size: int = 512,
+        interval: float = 0.1,
+        datagram_size: int = 8192,
+        spill_size: int = 10_000,
+        timeout: float = 5.0,
+        backoff: float = 0.1,
+        max_backoff: float = 30.0
+    ) -> None:
+        """
+        Parameters:
+            address (str | tuple[str, int]): the host and port, or the path of the Unix domain socket
+            protocol (str): the protocol, see 'Protocols'
+            file_format (str): the format of the records, text or json, see 'FileFormats'
+            facility (Optional[int]): the syslog facility (1 for user, 16 to 23 for local0 to local7), to send syslog messages '<PRI>ident: message'
+            ident (Optional[str]): the name of the program in the syslog messages
+            batch_size (int): the maximum amount of records sent at once
+            interval (float): the maximum time a record waits for others to be sent with, in seconds
+            datagram_size (int): the maximum size of a datagram packing multiple records, 0 to send each record in its own datagram,
+                always the case for syslog messages
+            spill_size (int): the maximum amount of queued records, the oldest ones are dropped once reached
+            timeout (float): the timeout of the connection and of each send, in seconds
+            backoff (float): the delay before reconnecting after a first failure, doubled after each failure
+            max_backoff (float): the maximum delay before reconnecting
+        """
+        if protocol not in SOCKET_TYPES:
+            raise ValueError(f"Unknown protocol {protocol!r}, expected one of: {', '.join(SOCKET_TYPES)}")
+        if SOCKET_TYPES[protocol][0] == -1:
+            raise ValueError(f"The {protocol} protocol is not available on this platform")
+        if file_format not in (FileFormats.TEXT, FileFormats.JSON):
+            raise ValueError(f"Can't send records in the {file_format} format, expected text or json")
+        if batch_size < 1 or spill_size < 1:
+            raise ValueError("The batch size and the spill size must be at least 1")
+
+        self.address = address
+        self.protocol = protocol
+        self.file_format = file_format
+        self.encoder: Encoder = create_encoder(file_format)
+        self.facility = facility
+        self.ident = ident
+        self.batch_size = batch_size
+        self.interval = interval
+        self.datagram_size = datagram_size
+        self.spill_size = spill_size
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._datagrams = SOCKET_TYPES[protocol][1] == socket.SOCK_DGRAM
+        # Syslog receivers read a single message per datagram
+        self._single_datagrams = facility is not None or datagram_size <= 0
+
+        # Records sent, and dropped because the spill buffer was full or a datagram couldn't be sent
+        self.sent = 0
+        self.dropped = 0
+
+        self._init_state()
+
+    def emit(self, record: LogRecord) -> None:
+        self._enqueue([self._encode(record)])
+
+    def emit_many(self, records: list[LogRecord]) -> None:
+        self._enqueue([self._encode(record) for record in records])
+
+    def prepare(self, record: LogRecord) -> None:
+        if self.file_format == FileFormats.TEXT:
+            Formatting.raw_render(record)
+        else:
+            record.get_message()
+
+    def flush(self) -> None:
+        """
+        Blocks until the queued records have been sent, or kept in the spill buffer if the collector is down
+        """
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive() or self._down:
+                return
+
+            self._requested += 1
+            requested = self._requested
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._completed >= requested or self._stopped)
+
+    def close(self) -> None:
+        """
+        Sends the queued records, stops the sender thread and closes the connection
+        Logging again afterwards starts them again
+        """
+        self.flush()
+        with self._condition:
+            thread = self._thread
+            self._stopped = True
+            self._condition.notify_all()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        with self._condition:
+            self._thread = None
+            self._stopped = False
+        self._disconnect()
+
+    def reset_after_fork(self) -> None:
+        # The queued records belong to the parent process, which sends them, and the connection is its own
+        # Closing it here leaves it open in the parent process
+        self._disconnect()
+        self._init_state()
+
+    "Helpers"
+
+    def _init_state(self) -> None:
+        self._pending: collections.deque[bytes] = collections.deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Flush requests, and the last one handled by the sender thread
+        self._requested = 0
+        self._completed = 0
+
+        # Only used by the sender thread, and by 'close' once it's stopped
+        self._socket: Optional[socket.socket] = None
+        self._delay = self.backoff
+
+        # Whether the last attempt failed, the records are then kept until the next one
+        self._down = False
+
+    def _encode(self, record: LogRecord) -> bytes:
+        # A single record, ending with a line break
+        data = self.encoder.encode([record])
+        if self.facility is None:
+            return data.encode("utf-8")
+
+        message = data[:-1]
+        priority = self.facility * 8 + self._severity(record.level)
+        encoded = (f"<{priority}>{message}" if self.ident is None else f"<{priority}>{self.ident}: {message}").encode("utf-8")
+
+        # Octet counting framing over the streams
+        if not self._datagrams:
+            encoded = b"%d %s" % (len(encoded), encoded)
+        return encoded
+
+    @staticmethod
+    def _severity(level: LevelModel) -> int:
+        "Syslog severity of a level, the custom levels below debug or above fatal get the closest one"
+        return SEVERITIES[max(min(level.value, max(SEVERITIES)), min(SEVERITIES))]
+
+    def _enqueue(self, items: list[bytes]) -> None:
+        with self._condition:
+            self._pending.extend(items)
+            self._trim()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pylogger-socket", daemon=True)
+                self._thread.start()
+            elif len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _trim(self) -> None:
+        "Drops the oldest records above the spill size, the lock must be held"
+        pending = self._pending
+        overflow = len(pending) - self.spill_size
+        if overflow > 0:
+            for _ in range(overflow):
+                pending.popleft()
+            self.dropped += overflow
+
+    def _run(self) -> None:
+        """
+        Sender loop: waits for a full batch, the interval or a flush, then sends every queued record
+        Unexpected errors are reported and do not stop the loop
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped or self._requested > self._completed or len(self._pending) >= self.batch_size,
+                    timeout=self.interval
+                )
+                stopped = self._stopped
+                requested = self._requested
+
+            try:
+                delay = self._send_pending()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                delay = None
+
+            with self._condition:
+                self._completed = max(self._completed, requested)
+                self._condition.notify_all()
+
+                if stopped:
+                    return
+
+                # Collector down, wait before reconnecting, unless stopped
+                if delay is not None:
+                    self._condition.wait_for(lambda: self._stopped, timeout=delay)
+
+    def _send_pending(self) -> Optional[float]:
+        """
+        Sends the queued records in batches, until none are left or the collector is down
+
+        Returns:
+            Optional[float] - the delay before trying again if the collector is down, None otherwise
+        """
+        while True:
+            with self._condition:
+                pending = self._pending
+                batch = [pending.popleft() for _ in range(min(len(pending), self.batch_size))]
+            if not batch:
+                return None
+
+            # A single write over a stream, as few datagrams as possible otherwise
+            chunks = self._pack(batch) if self._datagrams else [batch]
+            for index, chunk in enumerate(chunks):
+                try:
+                    self._connect()
+                    self._send(b"".join(chunk))
+                except OSError as error:
+                    # Too large for the socket, sending it again won't help
+                    if self._datagrams and error.errno == errno.EMSGSIZE:
+                        with self._condition:
+                            self.dropped += len(chunk)
+                        continue
+
+                    self._disconnect()
+                    # The chunks already sent are not sent again
+                    self._requeue([data for unsent in chunks[index:] for data in unsent])
+                    self._down = True
+
+                    delay = self._delay
+                    self._delay = min(delay * 2, self.max_backoff)
+                    return delay
+
+                self.sent += len(chunk)
+
+            self._down = False
+            self._delay = self.backoff
+
+    def _requeue(self, batch: list[bytes]) -> None:
+        "Puts back the records that couldn't be sent, before the ones queued meanwhile"
+        with self._condition:
+            self._pending.extendleft(reversed(batch))
+            self._trim()
+
+    def _connect(self) -> None:
+        if self._socket is not None:
+            # The first write after the collector closed the stream would succeed, and be lost
+            if self._datagrams or not self._is_closed(self._socket):
+                return
+            self._disconnect()
+
+        family, kind = SOCKET_TYPES[self.protocol]
+        sock = socket.socket(family, kind)
+        try:
+            sock.settimeout(self.timeout)
+            # Datagram sockets are connected too, so that the errors of the collector are reported
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+
+    @staticmethod
+    def _is_closed(sock: socket.socket) -> bool:
+        "Whether the other end closed the stream, without waiting"
+        # A socket with a timeout would wait for something to read
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return sock.recv(1, socket.MSG_PEEK) == b""
+        # Nothing to read, still open
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+        finally:
+            sock.settimeout(timeout)
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _send(self, data: bytes) -> None:
+        if self._datagrams:
+            self._socket.send(data)
+        else:
+            self._socket.sendall(data)
+
+    def _pack(self, batch: list[bytes]) -> list[list[bytes]]:
+        "Groups the records into datagrams of at most 'datagram_size' bytes, a larger record gets its own, one record per datagram for syslog"
+        if self._single_datagrams:
+            return [[data] for data in batch]
+
+        datagrams = []
+        current: list[bytes] = []
+        size = 0
+        for data in batch:
+            if current and size + len(data) > self.datagram_size:
+                datagrams.append(current)
+                current = []
+                size = 0
+            current.append(data)
+            size += len(data)
+
+        if current:
+            datagrams.append(current)
+        return datagrams
@@ -0,0 +1,207 @@
+import threading
+from typing import Optional, TYPE_CHECKING
+
+from .clock import Clock
+from .record import LogRecord
+
+if TYPE_CHECKING:
+    from .context import Fields
+
+
+
+"""
+Call site policies, limiting the records logged from each line of code
+----------------
+CallSitePolicy: base class, keeps a state per call site (the path and line number of the caller)
+RateLimit: logs at most a number of records per second from each call site
+Sample: logs 1 record out of every K from each call site
+Deduplicate: collapses the repeats of the same message into 'Last message repeated X times'
+Set them globally with 'Config.set_call_site_policy', or per PrefixLogger
+The records are filtered right after being captured, the rejected ones are never formatted
+The pending records of a policy (such as the repeats counted by 'Deduplicate') are written by 'Logger.flush' and 'Logger.shutdown'
+"""
+
+
+
+class CallSitePolicy:
+    """
+    Filters the records of each call site
+    Override 'filter', and 'flush' if records can be pending, the state of each call site is kept in 'self.sites'
+    """
+
+    def __init__(self) -> None:
+        # State per call site
+        self.sites: dict[tuple[str, Optional[int]], list] = {}
+
+        # Prevents multiple threads concurrencing
+        self.lock = threading.Lock()
+
+    def filter(self, record: LogRecord) -> tuple[LogRecord, ...]:
+        """
+        Decides what gets logged instead of the record
+
+        Parameters:
+            record (LogRecord): the captured record, not formatted yet
+
+        Returns:
+            tuple[LogRecord, ...] - the records to log: the record itself, nothing to drop it, or extra records
+        """
+        raise NotImplementedError
+
+    def flush(self) -> list[LogRecord]:
+        """
+        Returns the records still pending, called by 'Logger.flush' and 'Logger.shutdown'
+
+        Returns:
+            list[LogRecord] - the records to log, none by default
+        """
+        return []
+
+    def reset(self) -> None:
+        "Forgets the state of every call site"
+        with self.lock:
+            self.sites.clear()
+
+    def reset_after_fork(self) -> None:
+        "Reinitializes the lock in a forked process, another thread could have held it"
+        self.lock = threading.Lock()
+
+
+
+class RateLimit(CallSitePolicy):
+    """
+    Logs at most 'per_second' records per second from each call site, with bursts of up to 'burst' records
+    The records above the limit are dropped
+    """
+
+    def __init__(self, per_second: float, burst: Optional[int] = None) -> None:
+        """
+        Parameters:
+            per_second (float): the sustained amount of records per second
+            burst (Optional[int]): the amount of records logged at once before limiting, defaults to 'per_second'
+        """
+        if per_second <= 0:
+            raise ValueError("The rate limit must be positive")
+
+        super().__init__()
+        self.per_second = per_second
+        self.burst = max(1, int(per_second) if burst is None else burst)
+
+    def filter(self, record: LogRecord) -> tuple[LogRecord, ...]:
+        key = (record.path, record.lineno)
+        with self.lock:
+            # Token bucket: the tokens left, and when they were counted
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [float(self.burst), record.time]
+
+            tokens = min(self.burst, site[0] + (record.time - site[1]) * self.per_second)
+            site[1] = record.time
+            if tokens < 1:
+                site[0] = tokens
+                return ()
+
+            site[0] = tokens - 1
+        return (record,)
+
+
+
+class Sample(CallSitePolicy):
+    """
+    Logs 1 record out of every 'every' from each call site, starting with the first one
+    """
+
+    def __init__(self, every: int) -> None:
+        """
+        Parameters:
+            every (int): log 1 record out of this many
+        """
+        if every < 1:
+            raise ValueError("The sampling rate must be at least 1")
+
+        super().__init__()
+        self.every = every
+
+    def filter(self, record: LogRecord) -> tuple[LogRecord, ...]:
+        key = (record.path, record.lineno)
+        with self.lock:
+            # Records seen
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [0]
+
+            count = site[0]
+            site[0] = count + 1
+        return () if count % self.every else (record,)
+
+
+
+class Deduplicate(CallSitePolicy):
+    """
+    Collapses the consecutive repeats of the same message from each call site
+    The first one is logged, the repeats are counted, and 'Last message repeated X times' is logged
+    when the call site logs a different message, on the next repeat after 'interval' seconds, or on flush
+    A message is repeated if both its format string (or function) and its arguments are the same
+    """
+
+    SUMMARY = "Last message repeated %d times"
+
+    def __init__(self, interval: Optional[float] = 60.0) -> None:
+        """
+        Parameters:
+            interval (Optional[float]): the seconds after which the repeats get reported anyway, None to wait for a different message
+        """
+        super().__init__()
+        self.interval = interval
+
+    def filter(self, record: LogRecord) -> tuple[LogRecord, ...]:
+        key = (record.path, record.lineno)
+        with self.lock:
+            # Last message, its arguments, level and prefix, the repeats since it was reported, and when they were reported
+            site = self.sites.get(key)
+            if site is None:
+                self.sites[key] = [record.message, record.args, record.level, record.prefix, 0, record.time]
+                return (record,)
+
+            if self._is_repeat(site, record):
+                site[4] += 1
+                if self.interval is None or record.time - site[5] < self.interval:
+                    return ()
+
+                summary = self._summarize(site, key, record.time, record.fields)
+                site[4] = 0
+                site[5] = record.time
+                return (summary,)
+
+            summary = self._summarize(site, key, record.time, record.fields) if site[4] else None
+            self.sites[key] = [record.message, record.args, record.level, record.prefix, 0, record.time]
+
+        return (record,) if summary is None else (summary, record)
+
+    def flush(self) -> list[LogRecord]:
+        "Returns the summaries of the repeats not reported yet, such as the ones of a loop that stopped"
+        now = Clock.now()
+        summaries = []
+        with self.lock:
+            for key, site in self.sites.items():
+                if site[4]:
+                    summaries.append(self._summarize(site, key, now, None))
+                    site[4] = 0
+                    site[5] = now
+        return summaries
+
+    "Helpers"
+
+    @staticmethod
+    def _is_repeat(site: list, record: LogRecord) -> bool:
+        try:
+            return record.level is site[2] and record.message == site[0] and record.args == site[1]
+        # Arguments that can't be compared are never repeats
+        except Exception:
+            return False
+
+    def _summarize(self, site: list, key: tuple[str, Optional[int]], time: float, fields: Optional['Fields']) -> LogRecord:
+        return LogRecord(
+            message=self.SUMMARY, args=(site[4],), level=site[2], prefix=site[3],
+            time=time, path=key[0], lineno=key[1], fields=fields
+        )
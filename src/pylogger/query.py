@@ -0,0 +1,349 @@
+import fnmatch
+import json
+import mmap
+import os
+import re
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .encoders import FileFormats
+from .levels import LevelModel, Levels
+from .reader import detect_format
+from .styles import Separators as Seps
+
+
+
+"""
+Indexed queries on the log files in the text format
+----------------
+LogIndex: sidecar index of a log file ('<file>.idx'), updated incrementally as the file grows
+query: yields the records of a log file matching a time range, a minimum level and/or source paths
+The file is split in blocks, starting at each new minute or every 'BLOCK_SIZE' bytes,
+and the index keeps the offset and minute of each block, and the blocks of each level and each source path
+The queries only scan the matching blocks, through mmap
+Run with: python -m pylogger query <file> --since "2025-03-09 15:00" --level ERROR
+"""
+
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+# Maximum size of a block, in bytes
+BLOCK_SIZE = 1 << 18
+
+# Bytes hashed at the start of the file, to detect it got replaced (rotated, truncated)
+HEAD_SIZE = 4096
+
+MONTHS = {month.encode(): number for number, month in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+
+
+
+def compile_header() -> re.Pattern:
+    """
+    Compiles the pattern of the start of a record in the text format, with the current separators
+    The lines not matching it are the continuation of the previous record
+
+    Returns:
+        re.Pattern - the pattern, on bytes
+    """
+    def separator(text: str) -> bytes:
+        return re.escape(text.encode())
+
+    return re.compile(
+        rb"^(?:(?P<prefix>[^\n]*?)" + separator(Seps.prefix_time) + rb")??"
+        + rb"(?P<time>\d\d:\d\d:\d\d)(?:\.\d+)?" + separator(Seps.time_date)
+        + rb"(?P<date>\d\d [A-Za-z]{3} \d{4})" + separator(Seps.date_path)
+        + rb"(?P<path>[^\n]*?)" + separator(Seps.path_lineno)
+        + rb"\[[^\]\n]*\]" + separator(Seps.lineno_level)
+        + rb"(?P<level>[^\n]*?)" + separator(Seps.level_message),
+        re.MULTILINE
+    )
+
+
+def minute_key(time: bytes, date: bytes) -> int:
+    "Sortable minute of a record, as YYYYMMDDHHMM"
+    return int(date[7:11]) * 100000000 + MONTHS.get(date[3:6], 0) * 1000000 + int(date[0:2]) * 10000 + int(time[0:2]) * 100 + int(time[3:5])
+
+
+def second_key(moment: datetime) -> int:
+    "Sortable second of a datetime, as YYYYMMDDHHMMSS"
+    return int(moment.strftime("%Y%m%d%H%M%S"))
+
+
+
+class LogIndex:
+    """
+    Index of a log file in the text format
+    Use 'LogIndex.open' to load it, updated with the records written since it was saved
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Parameters:
+            path (Path): the path of the log file
+        """
+        self.path = path
+        self.index_path = path.with_name(path.name + INDEX_SUFFIX)
+
+        # Indexed bytes, always ending at a line break, and the hash of the start of the file
+        self.size = 0
+        self.head_size = 0
+        self.head_hash = 0
+
+        # Offset and minute of each block
+        self.blocks: list[list[int]] = []
+        # Blocks containing each level and each source path
+        self.levels: dict[str, list[int]] = {}
+        self.paths: dict[str, list[int]] = {}
+
+    @classmethod
+    def open(cls, path: str | Path, rebuild: bool = False) -> 'LogIndex':
+        """
+        Loads the index of a log file, updates it with the new records and saves it
+        It is built again if the file got replaced or truncated
+
+        Parameters:
+            path (str | Path): the path of the log file
+            rebuild (bool): whether to build it again from scratch
+
+        Returns:
+            LogIndex - the up to date index
+        """
+        index = cls(Path(path))
+        if not rebuild:
+            index.load()
+
+        with open(index.path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return cls(index.path)
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if size < index.size or zlib.crc32(view[:index.head_size]) != index.head_hash:
+                    index = cls(index.path)
+
+                if index.update(view):
+                    try:
+                        index.save()
+                    # Read only directory, the index is only used in memory
+                    except OSError:
+                        pass
+        return index
+
+    def load(self) -> None:
+        """
+        Loads the saved index, if any, and of the current version
+        """
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") != INDEX_VERSION:
+            return
+
+        self.size = data["size"]
+        self.head_size = data["head_size"]
+        self.head_hash = data["head_hash"]
+        self.blocks = data["blocks"]
+        self.levels = data["levels"]
+        self.paths = data["paths"]
+
+    def save(self) -> None:
+        """
+        Saves the index next to the log file, replacing the previous one at once
+        """
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "head_size": self.head_size,
+            "head_hash": self.head_hash,
+            "blocks": self.blocks,
+            "levels": self.levels,
+            "paths": self.paths
+        }
+
+        temporary = self.index_path.with_name(self.index_path.name + ".tmp")
+        temporary.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(temporary, self.index_path)
+
+    def update(self, view: mmap.mmap) -> bool:
+        """
+        Indexes the records written since the last update, up to the last complete line
+
+        Parameters:
+            view (mmap.mmap): the content of the log file
+
+        Returns:
+            bool - whether new records got indexed
+        """
+        end = view.rfind(b"\n", self.size) + 1
+        if end <= self.size:
+            return False
+
+        if self.head_size < HEAD_SIZE:
+            self.head_size = min(HEAD_SIZE, end)
+            self.head_hash = zlib.crc32(view[:self.head_size])
+
+        blocks, levels, paths = self.blocks, self.levels, self.paths
+        block = len(blocks) - 1
+        block_start, block_minute = blocks[-1] if blocks else (-BLOCK_SIZE, -1)
+
+        minutes: dict[tuple[bytes, bytes], int] = {}
+        for match in compile_header().finditer(view, self.size, end):
+            time, date = match.group("time", "date")
+
+            key = (time[:5], date)
+            minute = minutes.get(key)
+            if minute is None:
+                minute = minutes[key] = minute_key(time, date)
+
+            # New block on each new minute, or once it is large enough
+            offset = match.start()
+            if minute != block_minute or offset - block_start >= BLOCK_SIZE:
+                block_start, block_minute = offset, minute
+                blocks.append([offset, minute])
+                block += 1
+
+            for table, value in ((levels, match.group("level")), (paths, match.group("path"))):
+                name = value.decode(errors="replace")
+                ids = table.get(name)
+                if ids is None:
+                    table[name] = [block]
+                elif ids[-1] != block:
+                    ids.append(block)
+
+        self.size = end
+        return True
+
+    def select(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        levels: Optional[Iterable[str]] = None,
+        paths: Optional[Iterable[str]] = None
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the byte ranges of the blocks that may contain matching records, adjacent blocks merged
+
+        Parameters:
+            since (Optional[int]): the first minute, as YYYYMMDDHHMM
+            until (Optional[int]): the last minute, as YYYYMMDDHHMM
+            levels (Optional[Iterable[str]]): the level names
+            paths (Optional[Iterable[str]]): the source paths
+
+        Returns:
+            list[tuple[int, int]] - the start and end offsets of the ranges
+        """
+        candidates = set(range(len(self.blocks)))
+        for table, names in ((self.levels, levels), (self.paths, paths)):
+            if names is not None:
+                candidates &= {block for name in names for block in table.get(name, ())}
+
+        ranges: list[tuple[int, int]] = []
+        for block in sorted(candidates):
+            start, minute = self.blocks[block]
+            if (since is not None and minute < since) or (until is not None and minute > until):
+                continue
+
+            end = self.blocks[block + 1][0] if block + 1 < len(self.blocks) else self.size
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+
+
+def query(
+    path: str | Path,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    level: Optional[LevelModel | str] = None,
+    paths: Optional[Iterable[str]] = None,
+    rebuild: bool = False
+) -> Iterator[bytes]:
+    """
+    Yields the records of a log file in the text format matching every given filter, using its index
+
+    Parameters:
+        path (str | Path): the path of the log file
+        since (Optional[datetime]): the records logged from this time
+        until (Optional[datetime]): the records logged up to this time, included
+        level (Optional[LevelModel | str]): the records of this level or higher, the custom levels only match their own name
+        paths (Optional[Iterable[str]]): the records logged from these source paths, as glob patterns ('db/*.py')
+        rebuild (bool): whether to build the index again from scratch
+
+    Returns:
+        Iterator[bytes] - the records, with their continuation lines and line break
+    """
+    path = Path(path)
+    file_format = detect_format(path)
+    if file_format != FileFormats.TEXT:
+        raise ValueError(f"Can't query a log file in the {file_format} format, read it with 'pylogger.read'")
+
+    index = LogIndex.open(path, rebuild=rebuild)
+
+    level_names = None
+    if level is not None:
+        level_names = _level_names(level)
+
+    path_names = None
+    if paths is not None:
+        patterns = list(paths)
+        path_names = {name for name in index.paths if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)}
+
+    first = None if since is None else second_key(since)
+    last = None if until is None else second_key(until)
+    ranges = index.select(
+        since=None if first is None else first // 100,
+        until=None if last is None else last // 100,
+        levels=level_names,
+        paths=path_names
+    )
+    if not ranges:
+        return
+
+    header = compile_header()
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for start, end in ranges:
+            matches = header.finditer(view, start, end)
+            match = next(matches, None)
+            while match is not None:
+                following = next(matches, None)
+                record_end = end if following is None else following.start()
+
+                if _matches(match, first, last, level_names, path_names):
+                    yield view[match.start():record_end]
+                match = following
+
+
+"Helpers"
+
+def _level_names(level: LevelModel | str) -> set[str]:
+    "Names of the default levels of the given level or higher, and the name of the level itself"
+    name = level if isinstance(level, str) else level.name
+    known = {model.name: model.value for model in vars(Levels).values() if isinstance(model, LevelModel)}
+
+    value = level.value if isinstance(level, LevelModel) else known.get(name)
+    if value is None:
+        return {name}
+    return {known_name for known_name, known_value in known.items() if known_value >= value} | {name}
+
+
+def _matches(match: re.Match, first: Optional[int], last: Optional[int], levels: Optional[set[str]], paths: Optional[set[str]]) -> bool:
+    "Whether a record matches the filters, the blocks only match them by minute"
+    if levels is not None and match.group("level").decode(errors="replace") not in levels:
+        return False
+    if paths is not None and match.group("path").decode(errors="replace") not in paths:
+        return False
+
+    if first is not None or last is not None:
+        time, date = match.group("time", "date")
+        second = minute_key(time, date) * 100 + int(time[6:8])
+        if (first is not None and second < first) or (last is not None and second > last):
+            return False
+    return True
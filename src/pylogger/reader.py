@@ -0,0 +1,205 @@
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .colors import ColorCombo, Colors
+from .context import Fields
+from .encoders import FileFormats, ENTRY_HEADER, HEADER, MAGIC, VERSION, HEADER_PAYLOAD, STRING, STRING_ID, RECORD, RECORD_FIELDS, FIELDS, FIELD, NO_LINENO, NO_PREFIX
+from .format import Formatting
+from .levels import LevelModel, Levels
+from .record import LogRecord
+
+
+
+"""
+Reader of the log files
+----------------
+read: yields the records of a json or binary log file, as they were logged
+to_text: yields the lines of a log file in the text format
+convert: writes a log file in the text format
+"""
+
+
+
+def detect_format(path: str | Path) -> str:
+    """
+    Returns the format of a log file, from its first bytes
+
+    Parameters:
+        path (str | Path): the path of the log file
+
+    Returns:
+        str - the format, see 'FileFormats'
+    """
+    with open(path, 'rb') as file:
+        start = file.read(ENTRY_HEADER.size + len(MAGIC))
+
+    if start[:1] == HEADER and start[ENTRY_HEADER.size:] == MAGIC:
+        return FileFormats.BINARY
+    if start.lstrip()[:1] == b"{":
+        return FileFormats.JSON
+    return FileFormats.TEXT
+
+
+def read(path: str | Path, file_format: Optional[str] = None) -> Iterator[LogRecord]:
+    """
+    Yields the records of a log file, lazily so that large files can be scanned
+    The text format can't be read back, see 'to_text'
+
+    Parameters:
+        path (str | Path): the path of the log file
+        file_format (Optional[str]): the format of the file, detected if not given
+
+    Returns:
+        Iterator[LogRecord] - the records, in the order they were written
+    """
+    if file_format is None:
+        file_format = detect_format(path)
+
+    if file_format == FileFormats.BINARY:
+        return _read_binary(Path(path))
+    if file_format == FileFormats.JSON:
+        return _read_json(Path(path))
+    raise ValueError(f"Can't read records from a log file in the {file_format} format")
+
+
+def to_text(path: str | Path, file_format: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields the lines of a log file in the text format, rendered with the current styles
+
+    Parameters:
+        path (str | Path): the path of the log file
+        file_format (Optional[str]): the format of the file, detected if not given
+
+    Returns:
+        Iterator[str] - the lines, without line breaks
+    """
+    if file_format is None:
+        file_format = detect_format(path)
+
+    if file_format == FileFormats.TEXT:
+        with open(path) as file:
+            for line in file:
+                yield line.rstrip("\n")
+        return
+
+    for record in read(path, file_format=file_format):
+        yield Formatting.raw_render(record)
+
+
+def convert(path: str | Path, destination: str | Path, file_format: Optional[str] = None) -> int:
+    """
+    Writes a log file in the text format
+
+    Parameters:
+        path (str | Path): the path of the log file
+        destination (str | Path): the path of the text file to write
+        file_format (Optional[str]): the format of the log file, detected if not given
+
+    Returns:
+        int - the amount of records written, a multiline message counting once
+    """
+    count = 0
+    with open(destination, 'w') as file:
+        for line in to_text(path, file_format=file_format):
+            file.write(line + "\n")
+            count += 1
+    return count
+
+
+
+"Helpers"
+
+# Levels read from the files, per name and value
+_levels: dict[tuple[str, int], LevelModel] = {}
+
+
+def _get_level(name: str, value: int) -> LevelModel:
+    "Returns the default level with this name and value, or a new one"
+    level = _levels.get((name, value))
+    if level is None:
+        level = getattr(Levels, name, None)
+        if not isinstance(level, LevelModel) or level.value != value:
+            level = LevelModel(name=name, color=ColorCombo(fg=Colors.white), value=value)
+        _levels[(name, value)] = level
+    return level
+
+
+def _read_json(path: Path) -> Iterator[LogRecord]:
+    import json
+
+    with path.open() as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            fields = json.loads(line)
+            yield LogRecord(
+                message=fields["message"],
+                level=_get_level(fields["level"], fields["value"]),
+                prefix=fields.get("prefix"),
+                time=fields["time"],
+                path=fields["path"],
+                lineno=fields.get("lineno"),
+                fields=Fields(fields["fields"]) if fields.get("fields") else None
+            )
+
+
+def _read_binary(path: Path) -> Iterator[LogRecord]:
+    with path.open('rb') as file:
+        # An empty file can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            offset = 0
+            strings: list[str] = []
+            # Fields of the next record
+            bound: Optional[Fields] = None
+
+            while offset + ENTRY_HEADER.size <= size:
+                kind, length = ENTRY_HEADER.unpack_from(data, offset)
+                start = offset + ENTRY_HEADER.size
+                end = start + length
+
+                # Last entry still being written
+                if end > size:
+                    break
+
+                if kind == RECORD:
+                    time, level_id, value, path_id, lineno, prefix_id = RECORD_FIELDS.unpack_from(data, start)
+                    yield LogRecord(
+                        message=data[start + RECORD_FIELDS.size:end].decode("utf-8"),
+                        level=_get_level(strings[level_id], value),
+                        prefix=None if prefix_id == NO_PREFIX else strings[prefix_id],
+                        time=time,
+                        path=strings[path_id],
+                        lineno=None if lineno == NO_LINENO else lineno,
+                        fields=bound
+                    )
+                    bound = None
+
+                elif kind == FIELDS:
+                    values = {}
+                    position = start
+                    while position < end:
+                        key_id, value_length = FIELD.unpack_from(data, position)
+                        position += FIELD.size
+                        values[strings[key_id]] = data[position:position + value_length].decode("utf-8")
+                        position += value_length
+                    bound = Fields(values)
+
+                elif kind == STRING:
+                    # The ids are given in order
+                    strings.append(data[start + STRING_ID.size:end].decode("utf-8"))
+
+                elif kind == HEADER:
+                    magic, version = HEADER_PAYLOAD.unpack_from(data, start)
+                    if magic != MAGIC or version > VERSION:
+                        raise ValueError(f"Unsupported log file: {path} (version {version})")
+                    strings = []
+
+                # Unknown entries are skipped
+                offset = end
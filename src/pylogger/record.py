@@ -0,0 +1,107 @@
+from typing import Callable, Optional, TYPE_CHECKING
+
+from .levels import LevelModel
+
+if TYPE_CHECKING:
+    from .context import Fields
+
+
+
+"""
+Log record
+----------------
+Everything about a log message, captured once on the caller's thread
+The sinks turn it into the colored or raw text they need, see 'Formatting.render' and 'Formatting.raw_render'
+The message is only built when rendering: it can be a format string with its arguments, or a function
+The same goes for the traceback of the exception, if any
+"""
+
+
+
+class LogRecord:
+    __slots__ = ("message", "args", "level", "prefix", "time", "path", "lineno", "exception", "fields", "colored", "raw")
+
+    def __init__(
+        self,
+        message: str | Callable[[], str],
+        level: LevelModel,
+        prefix: Optional[str] = None,
+        time: float = 0.0,
+        path: str = '<unknown>',
+        lineno: Optional[int] = None,
+        args: tuple = (),
+        exception: Optional[BaseException] = None,
+        fields: Optional['Fields'] = None
+    ) -> None:
+        """
+        Parameters:
+            message (str | Callable[[], str]): the message, or a function returning it
+            level (LevelModel): the level of the message
+            prefix (Optional[str]): the formatted prefix, if any
+            time (float): the timestamp of the message
+            path (str): the formatted path of the caller's file
+            lineno (Optional[int]): the line of the caller, None if unknown
+            args (tuple): the arguments to merge into the message with the '%' operator
+            exception (Optional[BaseException]): the exception to render after the message, with its traceback
+            fields (Optional[Fields]): the fields bound to the record, see 'Logger.bind' and 'Logger.contextualize'
+        """
+        self.message = message
+        self.args = args
+        self.level = level
+        self.prefix = prefix
+        self.time = time
+        self.path = path
+        self.lineno = lineno
+        self.exception = exception
+        self.fields = fields
+
+        # Rendered forms, only built when a sink needs them
+        self.colored: Optional[str] = None
+        self.raw: Optional[str] = None
+
+    def freeze(self) -> None:
+        """
+        Builds the message from the function and/or the arguments, so that changing them afterwards doesn't affect it
+        Unlike 'get_message', the exception is left to be rendered by the thread writing the record
+        """
+        message = self.message
+        if callable(message):
+            message = message()
+        if self.args:
+            try:
+                message = str(message) % self.args
+            # A wrong format string must not prevent the record (and the next sinks) from being written
+            except (TypeError, ValueError, KeyError):
+                message = f"{message} {self.args!r}"
+        elif not isinstance(message, str):
+            message = str(message)
+
+        self.message = message
+        self.args = ()
+
+    def get_message(self) -> str:
+        """
+        Builds the message from the function and/or the arguments, followed by the exception if any, only once
+
+        Returns:
+            str - the message
+        """
+        if self.args or not isinstance(self.message, str):
+            self.freeze()
+
+        # Rendered only now, and released afterwards
+        if self.exception is not None:
+            from .tracebacks import Tracebacks
+
+            self.message = f"{self.message}\n{Tracebacks.render(self.exception)}"
+            self.exception = None
+
+        return self.message
+
+    def __str__(self) -> str:
+        from .format import Formatting
+
+        return Formatting.raw_render(self)
+
+    def __repr__(self) -> str:
+        return f"LogRecord(level={self.level.name!r}, path={self.path!r}, lineno={self.lineno!r}, message={self.get_message()!r})"
@@ -0,0 +1,223 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from .writer import BackgroundWriter
+
+
+
+"""
+Rotation of the log files
+----------------
+RotationPolicy: defines when a log file gets rotated, and how many rotated segments are kept
+Compressor: compresses the rotated segments and removes the old ones, on a background thread
+The segments are named after the file and the rotation time, such as 'app.log.20250309-155316.gz'
+"""
+
+
+
+class RotationPolicy:
+    """
+    Defines when a file sink rotates its file, as soon as one of the conditions is met
+    Set a condition to None to disable it
+    """
+
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        when: Optional[str] = None,
+        keep: Optional[int] = 5,
+        compress: bool = True
+    ) -> None:
+        """
+        Parameters:
+            max_bytes (Optional[int]): rotate before the file grows over this size
+            when (Optional[str]): rotate at the start of every hour ('hourly') or day ('daily'), local time
+            keep (Optional[int]): the amount of rotated segments to keep, None to keep them all
+            compress (bool): whether to gzip the rotated segments
+        """
+        if when not in (None, self.HOURLY, self.DAILY):
+            raise ValueError(f"Unknown rotation interval {when!r}, expected '{self.HOURLY}' or '{self.DAILY}'")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("The maximum size of a log file must be positive")
+
+        self.max_bytes = max_bytes
+        self.when = when
+        self.keep = keep
+        self.compress = compress
+
+    @classmethod
+    def by_size(cls, max_bytes: int, keep: Optional[int] = 5, compress: bool = True) -> 'RotationPolicy':
+        "Rotates before the file grows over 'max_bytes'"
+        return cls(max_bytes=max_bytes, keep=keep, compress=compress)
+
+    @classmethod
+    def hourly(cls, keep: Optional[int] = 24, compress: bool = True) -> 'RotationPolicy':
+        "Rotates at the start of every hour"
+        return cls(when=cls.HOURLY, keep=keep, compress=compress)
+
+    @classmethod
+    def daily(cls, keep: Optional[int] = 7, compress: bool = True) -> 'RotationPolicy':
+        "Rotates at midnight"
+        return cls(when=cls.DAILY, keep=keep, compress=compress)
+
+    def next_rollover(self, timestamp: float) -> float:
+        """
+        Returns when a file last written at the given time must be rotated
+
+        Parameters:
+            timestamp (float): the time of the last write
+
+        Returns:
+            float - the timestamp of the rotation, infinite if not time based
+        """
+        if self.when is None:
+            return float("inf")
+
+        start = datetime.fromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0)
+        if self.when == self.HOURLY:
+            return (start + timedelta(hours=1)).timestamp()
+        return (start.replace(hour=0) + timedelta(days=1)).timestamp()
+
+    def segment_path(self, path: Path) -> Path:
+        """
+        Returns a free path for a rotated segment of the file, after the current time
+
+        Parameters:
+            path (Path): the path of the log file
+
+        Returns:
+            Path - the path of the segment
+        """
+        name = f"{path.name}.{time.strftime('%Y%m%d-%H%M%S')}"
+        segment = path.with_name(name)
+
+        count = 0
+        while segment.exists() or segment.with_name(segment.name + ".gz").exists():
+            count += 1
+            segment = path.with_name(f"{name}-{count}")
+        return segment
+
+
+
+class Compressor:
+    """
+    Compresses the rotated segments and removes the old ones, on a background thread
+    So that the logging calls never wait for it
+    """
+
+    _writer: Optional[BackgroundWriter] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def submit(cls, segment: Path, path: Path, policy: RotationPolicy) -> None:
+        """
+        Enqueues a rotated segment
+
+        Parameters:
+            segment (Path): the path of the segment
+            path (Path): the path of the log file it comes from
+            policy (RotationPolicy): the rotation policy of the log file
+        """
+        writer = cls._writer
+        if writer is None:
+            with cls._lock:
+                if cls._writer is None:
+                    cls._writer = BackgroundWriter(handler=cls._process, name="pylogger-compressor")
+                writer = cls._writer
+        writer.put((segment, path, policy))
+
+    @classmethod
+    def wait(cls) -> None:
+        """
+        Blocks until every rotated segment has been processed
+        """
+        writer = cls._writer
+        if writer is not None:
+            writer.flush()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Processes the remaining segments, and stops the background thread
+        """
+        with cls._lock:
+            writer = cls._writer
+            cls._writer = None
+
+        if writer is not None:
+            writer.shutdown()
+
+    @classmethod
+    def reset_after_fork(cls) -> None:
+        "The background thread only exists in the parent process"
+        cls._writer = None
+        cls._lock = threading.Lock()
+
+    @classmethod
+    def segments(cls, path: Path) -> list[Path]:
+        """
+        Returns the rotated segments of a log file, from the oldest to the newest
+
+        Parameters:
+            path (Path): the path of the log file
+
+        Returns:
+            list[Path] - the segments
+        """
+        pattern = re.compile(re.escape(path.name) + r"\.(\d{8}-\d{6})(?:-(\d+))?(?:\.gz)?")
+
+        # By time, then by the count of the segments rotated within the same second ('-10' after '-9')
+        keyed = []
+        for segment in path.parent.iterdir():
+            match = pattern.fullmatch(segment.name)
+            if match is not None:
+                keyed.append(((match.group(1), int(match.group(2) or 0)), segment))
+
+        keyed.sort(key=lambda item: item[0])
+        return [segment for _, segment in keyed]
+
+    "Helpers"
+
+    @classmethod
+    def _process(cls, items: list[tuple[Path, Path, RotationPolicy]]) -> None:
+        pruned = {}
+        for segment, path, policy in items:
+            if policy.compress:
+                cls._compress(segment)
+            pruned[path] = policy.keep
+
+        for path, keep in pruned.items():
+            if keep is not None:
+                cls._prune(path, keep)
+
+    @classmethod
+    def _compress(cls, segment: Path) -> None:
+        # Only needed once a file gets rotated, slow to import
+        import gzip
+        import shutil
+
+        # Already pruned
+        if not segment.exists():
+            return
+
+        # Written aside first, so that an interrupted compression never leaves a truncated segment
+        temporary = segment.with_name(segment.name + ".gz.tmp")
+        with segment.open('rb') as source, gzip.open(temporary, 'wb') as destination:
+            shutil.copyfileobj(source, destination)
+
+        os.replace(temporary, segment.with_name(segment.name + ".gz"))
+        segment.unlink()
+
+    @classmethod
+    def _prune(cls, path: Path, keep: int) -> None:
+        segments = cls.segments(path)
+        for segment in segments[:max(len(segments) - keep, 0)]:
+            segment.unlink(missing_ok=True)
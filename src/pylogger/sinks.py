@@ -0,0 +1,558 @@
+import os
+import threading
+import time
+import sys
+from pathlib import Path
+from typing import IO, Callable, Optional
+
+from .colors import ColorModes
+from .config import Config
+from .encoders import Encoder, FileFormats, create_encoder
+from .format import Formatting
+from .levels import LevelModel, Levels
+from .record import LogRecord
+from .rotation import Compressor, RotationPolicy
+from .stats import Stats
+
+
+
+"""
+Logging sinks, the consumers of the log records
+----------------
+Sink: base class, inherit from it to create your own sinks and add them with 'Config.add_sink'
+StdoutSink: writes the messages to the terminal, colored or not depending on the color mode
+FileSink: keeps a single buffered handle per file path, shared by every logger writing to it, in the format of the file
+SocketSink: sends the records to a collector over UDP, TCP or a Unix domain socket, see the network module
+FlushPolicy: defines when the buffer of a file sink gets flushed
+RotationPolicy: defines when the file of a file sink gets rotated, see the rotation module
+"""
+
+
+
+class Sink:
+    """
+    Consumer of the log records
+    Override 'emit', and optionally the other methods
+    The sinks render the records themselves, so that only the needed forms are built (see 'Formatting')
+    """
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Writes a record
+
+        Parameters:
+            record (LogRecord): the record to write
+        """
+        raise NotImplementedError
+
+    def emit_many(self, records: list[LogRecord]) -> None:
+        """
+        Writes multiple records at once, in order
+        Used by the background writer, override it to write them in a single operation
+
+        Parameters:
+            records (list[LogRecord]): the records to write
+        """
+        for record in records:
+            self.emit(record)
+
+    def prepare(self, record: LogRecord) -> None:
+        """
+        Renders what the sink needs from the record ahead of writing it, on the logging thread
+        Used by the thread buffers mode, by default only builds the message
+
+        Parameters:
+            record (LogRecord): the record to write later
+        """
+        record.get_message()
+
+    def flush(self) -> None:
+        "Flushes the written records, if buffered"
+
+    def close(self) -> None:
+        "Releases the resources of the sink, it should still accept records afterwards"
+
+    def reset_after_fork(self) -> None:
+        "Reinitializes the locks of the sink in a forked process, another thread could have held them"
+
+
+
+class StdoutSink(Sink):
+    """
+    Writes the messages to the terminal, colored depending on 'Config.COLOR_MODE'
+    Use 'StdoutSink.get' to get the shared instance
+    """
+
+    _instance: Optional['StdoutSink'] = None
+
+    # Read once, see https://no-color.org
+    NO_COLOR: bool = bool(os.environ.get("NO_COLOR"))
+
+    def __init__(self) -> None:
+        # Prevents multiple threads concurrencing
+        self.lock = threading.Lock()
+
+        # Renderer of the messages, detected again only if sys.stdout or the color mode gets replaced
+        self._stream: Optional[IO] = None
+        self._color_mode: Optional[str] = None
+        self._render: Callable[[LogRecord], str] = Formatting.render
+
+    @classmethod
+    def get(cls) -> 'StdoutSink':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def emit(self, record: LogRecord) -> None:
+        text = self.renderer()(record) + "\n"
+        if Config.STATS:
+            Stats.call_locked(self.lock, self._write, text)
+            return
+
+        with self.lock:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def emit_many(self, records: list[LogRecord]) -> None:
+        render = self.renderer()
+        text = "\n".join([render(record) for record in records]) + "\n"
+        if Config.STATS:
+            Stats.call_locked(self.lock, self._write, text)
+            return
+
+        with self.lock:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            sys.stdout.flush()
+
+    def reset_after_fork(self) -> None:
+        self.lock = threading.Lock()
+
+    def prepare(self, record: LogRecord) -> None:
+        self.renderer()(record)
+
+    def renderer(self) -> Callable[[LogRecord], str]:
+        """
+        Returns the renderer for the terminal output: colored, or raw without any escape sequence
+
+        Returns:
+            Callable[[LogRecord], str] - 'Formatting.render' or 'Formatting.raw_render'
+        """
+        stream = sys.stdout
+        if stream is not self._stream or self._color_mode is not Config.COLOR_MODE:
+            self._stream = stream
+            self._color_mode = Config.COLOR_MODE
+            self._render = Formatting.render if self._use_colors(stream) else Formatting.raw_render
+        return self._render
+
+    def _use_colors(self, stream: IO) -> bool:
+        mode = Config.COLOR_MODE
+        if mode == ColorModes.ALWAYS:
+            return True
+        if mode == ColorModes.NEVER or self.NO_COLOR:
+            return False
+
+        try:
+            return stream.isatty()
+        # Replaced by an object without it, or closed
+        except (AttributeError, ValueError):
+            return False
+
+    def _write(self, text: str) -> None:
+        "The lock must be held"
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+
+class FlushPolicy:
+    """
+    Defines when a file sink's buffer gets flushed, as soon as one of the conditions is met
+    Set a condition to None to disable it
+    """
+
+    def __init__(
+        self,
+        every: Optional[int] = 1,
+        interval: Optional[float] = None,
+        level: Optional[LevelModel] = Levels.ERROR
+    ) -> None:
+        """
+        Parameters:
+            every (Optional[int]): flush after this many records
+            interval (Optional[float]): flush at most this many seconds after a record was written
+            level (Optional[LevelModel]): flush right away when a record of this level or higher is written
+        """
+        self.every = every
+        self.interval = interval
+        self.level = level
+
+    @classmethod
+    def per_record(cls) -> 'FlushPolicy':
+        "Flushes after each record (default)"
+        return cls(every=1)
+
+    @classmethod
+    def per_records(cls, count: int, level: Optional[LevelModel] = Levels.ERROR) -> 'FlushPolicy':
+        "Flushes every 'count' records"
+        return cls(every=count, level=level)
+
+    @classmethod
+    def per_interval(cls, seconds: float, level: Optional[LevelModel] = Levels.ERROR) -> 'FlushPolicy':
+        "Flushes at most 'seconds' after a record was written"
+        return cls(every=None, interval=seconds, level=level)
+
+    @classmethod
+    def on_level(cls, level: LevelModel = Levels.ERROR) -> 'FlushPolicy':
+        "Only flushes on records of the given level or higher, or when the buffer is full"
+        return cls(every=None, level=level)
+
+
+
+class FileSink(Sink):
+    """
+    Appends the records to a file through a persistent buffered handle
+    By default as raw messages, see 'FileFormats' for the other formats
+    Use 'FileSink.get' to share the same sink (and handle) between every logger writing to a path
+    """
+
+    # Registry of the opened sinks, per path
+    _sinks: dict[Path, 'FileSink'] = {}
+    _sinks_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Path,
+        buffer_size: int = 8192,
+        flush_policy: Optional[FlushPolicy] = None,
+        file_format: str = FileFormats.TEXT,
+        rotation: Optional[RotationPolicy] = None
+    ) -> None:
+        """
+        Parameters:
+            path (Path): the path of the file to append to
+            buffer_size (int): the size of the write buffer, in bytes
+            flush_policy (Optional[FlushPolicy]): when to flush the buffer, defaults to after each record
+            file_format (str): the format of the file, see 'FileFormats'
+            rotation (Optional[RotationPolicy]): when to rotate the file, never by default
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_policy = flush_policy or FlushPolicy()
+        self.file_format = file_format
+        self.encoder: Encoder = create_encoder(file_format)
+        self.rotation = rotation
+
+        # Prevents multiple threads concurrencing
+        self.lock = threading.Lock()
+
+        self._handle: Optional[IO] = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+
+        # State of the opened file, for the rotation
+        self._size = 0
+        self._has_records = False
+        self._rollover_at = float("inf")
+
+    @classmethod
+    def get(
+        cls,
+        path: Path,
+        buffer_size: int = 8192,
+        flush_policy: Optional[FlushPolicy] = None,
+        file_format: str = FileFormats.TEXT,
+        rotation: Optional[RotationPolicy] = None
+    ) -> 'FileSink':
+        """
+        Returns the sink of the given path, creating it if needed
+        The buffer size, flush policy, format and rotation policy are only used when creating it
+
+        Parameters:
+            path (Path): the path of the file
+            buffer_size (int): the size of the write buffer, in bytes
+            flush_policy (Optional[FlushPolicy]): when to flush the buffer
+            file_format (str): the format of the file, see 'FileFormats'
+            rotation (Optional[RotationPolicy]): when to rotate the file
+
+        Returns:
+            FileSink - the shared sink
+        """
+        sink = cls._sinks.get(path)
+        if sink is None:
+            with cls._sinks_lock:
+                sink = cls._sinks.get(path)
+                if sink is None:
+                    sink = cls._sinks[path] = cls(path, buffer_size=buffer_size, flush_policy=flush_policy, file_format=file_format, rotation=rotation)
+        return sink
+
+    def emit(self, record: LogRecord) -> None:
+        self._emit([record], record.level)
+
+    def emit_many(self, records: list[LogRecord]) -> None:
+        self._emit(records, max(record.level for record in records))
+
+    def prepare(self, record: LogRecord) -> None:
+        if self.file_format == FileFormats.TEXT:
+            Formatting.raw_render(record)
+        else:
+            record.get_message()
+
+    def write(self, message: str, level: LevelModel) -> None:
+        """
+        Writes a message, as a line
+        Only for the text format, the other formats need records
+
+        Parameters:
+            message (str): the message to write
+            level (LevelModel): the level of the message, used by the flush policy
+        """
+        self._check_text()
+        if Config.STATS:
+            Stats.call_locked(self.lock, self._write, message + "\n", 1, level)
+            return
+
+        with self.lock:
+            self._write(message + "\n", 1, level)
+
+    def write_many(self, messages: list[str], level: LevelModel) -> None:
+        """
+        Writes multiple messages at once, as lines
+
+        Parameters:
+            messages (list[str]): the messages to write
+            level (LevelModel): the highest level of the messages, used by the flush policy
+        """
+        self._check_text()
+        if Config.STATS:
+            Stats.call_locked(self.lock, self._write, "\n".join(messages) + "\n", len(messages), level)
+            return
+
+        with self.lock:
+            self._write("\n".join(messages) + "\n", len(messages), level)
+
+    def flush(self) -> None:
+        """
+        Flushes the buffer to the file
+        """
+        with self.lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the handle
+        The file will be opened again on the next write
+        """
+        with self.lock:
+            self._close()
+
+    def configure(
+        self,
+        buffer_size: Optional[int] = None,
+        flush_policy: Optional[FlushPolicy] = None,
+        file_format: Optional[str] = None,
+        rotation: Optional[RotationPolicy] = None
+    ) -> None:
+        """
+        Changes the buffer size, the flush policy, the format and/or the rotation policy
+        The handle is closed, so that the new buffer size and format get used
+
+        Parameters:
+            buffer_size (Optional[int]): the size of the write buffer, in bytes
+            flush_policy (Optional[FlushPolicy]): when to flush the buffer
+            file_format (Optional[str]): the format of the file, see 'FileFormats'
+            rotation (Optional[RotationPolicy]): when to rotate the file, 'RotationPolicy()' never rotates
+        """
+        encoder = None if file_format is None else create_encoder(file_format)
+
+        with self.lock:
+            self._close()
+            if buffer_size is not None:
+                self.buffer_size = buffer_size
+            if flush_policy is not None:
+                self.flush_policy = flush_policy
+            if encoder is not None:
+                self.file_format = file_format
+                self.encoder = encoder
+            if rotation is not None:
+                self.rotation = rotation
+
+    def reset_after_fork(self) -> None:
+        # The buffer was flushed before forking, the handle is shared with the parent process
+        self.lock = threading.Lock()
+        self._timer = None
+        self._pending = 0
+
+    "Operations on every sink"
+
+    @classmethod
+    def all(cls) -> list['FileSink']:
+        with cls._sinks_lock:
+            return list(cls._sinks.values())
+
+    @classmethod
+    def flush_all(cls) -> None:
+        for sink in cls.all():
+            sink.flush()
+
+    @classmethod
+    def close_all(cls) -> None:
+        for sink in cls.all():
+            sink.close()
+
+    @classmethod
+    def reset_all_after_fork(cls) -> None:
+        cls._sinks_lock = threading.Lock()
+        for sink in cls._sinks.values():
+            sink.reset_after_fork()
+
+    @classmethod
+    def configure_all(cls, buffer_size: Optional[int] = None, flush_policy: Optional[FlushPolicy] = None) -> None:
+        for sink in cls.all():
+            sink.configure(buffer_size=buffer_size, flush_policy=flush_policy)
+
+    "Helpers"
+
+    def _emit(self, records: list[LogRecord], level: LevelModel) -> None:
+        # Encoded before taking the lock, unless the encoder keeps a state
+        encoder = self.encoder
+        data = None if encoder.stateful else encoder.encode(records)
+
+        if Config.STATS:
+            Stats.call_locked(self.lock, self._encode_and_write, records, data, encoder, level)
+            return
+
+        with self.lock:
+            self._encode_and_write(records, data, encoder, level)
+
+    def _check_text(self) -> None:
+        if self.file_format != FileFormats.TEXT:
+            raise TypeError(f"Can't write messages to a log file in the {self.file_format} format, log records instead")
+
+    "Helpers, the lock must be held"
+
+    def _open(self) -> None:
+        if self._handle is not None:
+            return
+
+        encoder = self.encoder
+        self._handle = self.path.open(mode='ab' if encoder.binary else 'a', buffering=self.buffer_size)
+        self._last_flush = time.monotonic()
+
+        # Appending to the existing content
+        self._size = self._handle.tell()
+        self._has_records = self._size > 0
+        if self.rotation is not None:
+            last_write = os.path.getmtime(self.path) if self._has_records else time.time()
+            self._rollover_at = self.rotation.next_rollover(last_write)
+
+        header = encoder.header()
+        if header:
+            self._handle.write(header)
+            self._size += self._byte_size(header)
+
+    def _encode_and_write(self, records: list[LogRecord], data: Optional[str | bytes], encoder: Encoder, level: LevelModel) -> None:
+        # The format could also have changed while waiting for the lock
+        if data is None or self.encoder is not encoder:
+            data, size = self._encode(records)
+            self._append(data, size, len(records), level)
+        # Stateless encoder, the data doesn't depend on the file
+        else:
+            self._write(data, len(records), level)
+
+    def _encode(self, records: list[LogRecord]) -> tuple[str | bytes, int]:
+        """
+        Encodes the records for the file they get written to, rotating it first if needed
+        Rotation is decided once, the data refers to the header of the file (such as the interned strings of the binary format)
+
+        Returns:
+            tuple[str | bytes, int] - the data, and its size in bytes
+        """
+        # Opening first, the header resets the state of the encoder
+        self._open()
+        data = self.encoder.encode(records)
+        size = self._byte_size(data)
+
+        # The new file gets a new header, the records must be encoded again
+        if self._should_rotate(size):
+            self._rotate()
+            data = self.encoder.encode(records)
+            size = self._byte_size(data)
+        return data, size
+
+    def _byte_size(self, data: str | bytes) -> int:
+        "Size of the data once written, the text gets encoded by the file"
+        if isinstance(data, bytes) or data.isascii():
+            return len(data)
+        return len(data.encode(self._handle.encoding, self._handle.errors))
+
+    def _should_rotate(self, size: int) -> bool:
+        rotation = self.rotation
+        if rotation is None or not self._has_records:
+            return False
+
+        return (rotation.max_bytes is not None and self._size + size > rotation.max_bytes) \
+            or time.time() >= self._rollover_at
+
+    def _rotate(self) -> None:
+        self._close()
+
+        rotation = self.rotation
+        segment = rotation.segment_path(self.path)
+        try:
+            os.replace(self.path, segment)
+        except FileNotFoundError:
+            # Removed meanwhile, nothing to rotate
+            pass
+        else:
+            Compressor.submit(segment, self.path, rotation)
+
+        self._open()
+
+    def _write(self, data: str | bytes, count: int, level: LevelModel) -> None:
+        self._open()
+        size = self._byte_size(data)
+        if self._should_rotate(size):
+            self._rotate()
+
+        self._append(data, size, count, level)
+
+    def _append(self, data: str | bytes, size: int, count: int, level: LevelModel) -> None:
+        "Writes the data to the current file, the rotation was already decided"
+        self._handle.write(data)
+        self._size += size
+        self._has_records = True
+        self._pending += count
+
+        policy = self.flush_policy
+        if (policy.every is not None and self._pending >= policy.every) \
+            or (policy.level is not None and level.value >= policy.level.value) \
+            or (policy.interval is not None and time.monotonic() - self._last_flush >= policy.interval):
+            self._flush()
+
+        # Make sure the records get flushed even if nothing else gets logged
+        elif policy.interval is not None and self._timer is None:
+            self._timer = threading.Timer(policy.interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._handle is not None and self._pending:
+            self._handle.flush()
+
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _close(self) -> None:
+        self._flush()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,247 @@
+import threading
+import time
+from typing import Any, Callable
+
+
+
+"""
+Logging statistics
+----------------
+Optional instrumentation of the logging calls, enabled with 'Config.set_stats'
+Counts the records logged per level and per sink, the ones dropped by the call site policies per level, and times the stages of a logging call:
+    locate: finding the caller's file and line
+    clock: rendering the time and date
+    render: building the formatted text, including the clock
+    lock_wait: waiting for the lock of a sink (terminal or file)
+    write: writing to the terminal or the file, while holding the lock
+    emit: passing a record to a sink, from rendering to writing
+Each thread has its own counters, so that counting needs no lock, they are merged when read with 'Logger.stats'
+"""
+
+
+
+STAGES = ("locate", "clock", "render", "lock_wait", "write", "emit")
+
+# The histograms have a bucket per power of two nanoseconds
+BUCKETS = 48
+
+clock_ns = time.perf_counter_ns
+
+
+
+class _Counters:
+    "Counters of a single thread"
+    __slots__ = ("levels", "dropped", "sinks", "stages")
+
+    def __init__(self) -> None:
+        self.levels: dict[str, int] = {}
+        # Per level: records dropped by the call site policies
+        self.dropped: dict[str, int] = {}
+        # Per sink: records and time in nanoseconds
+        self.sinks: dict[str, list[int]] = {}
+        # Per stage: count, total and max time in nanoseconds, then the histogram
+        self.stages: dict[str, list[int]] = {stage: [0, 0, 0] + [0] * BUCKETS for stage in STAGES}
+
+
+
+class Stats:
+    _local = threading.local()
+
+    # Counters of every thread, and when they were last reset
+    _counters: list[_Counters] = []
+    _counters_lock = threading.Lock()
+    _since: float = time.time()
+
+    # Name of each sink, per id
+    _sink_names: dict[int, str] = {}
+
+    @classmethod
+    def get_counters(cls) -> _Counters:
+        "Returns the counters of the current thread"
+        counters = getattr(cls._local, "counters", None)
+        if counters is None:
+            counters = cls._local.counters = _Counters()
+            with cls._counters_lock:
+                cls._counters.append(counters)
+        return counters
+
+    @classmethod
+    def add_time(cls, stage: str, duration: int) -> None:
+        """
+        Adds the duration of a stage
+
+        Parameters:
+            stage (str): the stage, see 'STAGES'
+            duration (int): the duration, in nanoseconds
+        """
+        entry = cls.get_counters().stages[stage]
+        entry[0] += 1
+        entry[1] += duration
+        if duration > entry[2]:
+            entry[2] = duration
+        entry[3 + min(duration.bit_length(), BUCKETS - 1)] += 1
+
+    @classmethod
+    def count_level(cls, name: str) -> None:
+        "Counts a record of the given level name, once the call site policy kept it"
+        levels = cls.get_counters().levels
+        levels[name] = levels.get(name, 0) + 1
+
+    @classmethod
+    def count_dropped(cls, name: str) -> None:
+        "Counts a record of the given level name dropped by the call site policy"
+        dropped = cls.get_counters().dropped
+        dropped[name] = dropped.get(name, 0) + 1
+
+    @classmethod
+    def count_sink(cls, sink: Any, records: int, duration: int) -> None:
+        """
+        Counts the records passed to a sink, and the time it took
+
+        Parameters:
+            sink (Sink): the sink
+            records (int): the amount of records
+            duration (int): the time spent in the sink, in nanoseconds
+        """
+        name = cls._sink_names.get(id(sink))
+        if name is None:
+            path = getattr(sink, "path", None)
+            name = cls._sink_names[id(sink)] = type(sink).__name__ if path is None else f"{type(sink).__name__}({path})"
+
+        entry = cls.get_counters().sinks.get(name)
+        if entry is None:
+            entry = cls.get_counters().sinks[name] = [0, 0]
+        entry[0] += records
+        entry[1] += duration
+
+    @classmethod
+    def call_locked(cls, lock: threading.Lock, function: Callable, *args: Any) -> None:
+        """
+        Calls a function of a sink with its lock held, timing the wait for the lock and the call
+
+        Parameters:
+            lock (threading.Lock): the lock of the sink
+            function (Callable): the function writing the records
+            args (Any): the arguments of the function
+        """
+        start = clock_ns()
+        with lock:
+            acquired = clock_ns()
+            function(*args)
+            released = clock_ns()
+
+        cls.add_time("lock_wait", acquired - start)
+        cls.add_time("write", released - acquired)
+
+    @classmethod
+    def emit(cls, sink: Any, record: Any) -> None:
+        """
+        Passes a record to a sink, timing it
+
+        Parameters:
+            sink (Sink): the sink
+            record (LogRecord): the record
+        """
+        start = clock_ns()
+        sink.emit(record)
+        duration = clock_ns() - start
+
+        cls.add_time("emit", duration)
+        cls.count_sink(sink, 1, duration)
+
+    @classmethod
+    def emit_many(cls, sink: Any, records: list) -> None:
+        """
+        Passes records to a sink at once, timing it
+
+        Parameters:
+            sink (Sink): the sink
+            records (list[LogRecord]): the records
+        """
+        start = clock_ns()
+        sink.emit_many(records)
+        duration = clock_ns() - start
+
+        cls.add_time("emit", duration)
+        cls.count_sink(sink, len(records), duration)
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """
+        Returns the statistics of every thread, merged
+
+        Returns:
+            dict - the statistics
+        """
+        levels: dict[str, int] = {}
+        dropped: dict[str, int] = {}
+        sinks: dict[str, list[int]] = {}
+        stages = {stage: [0, 0, 0] + [0] * BUCKETS for stage in STAGES}
+
+        with cls._counters_lock:
+            counters = list(cls._counters)
+
+        for thread_counters in counters:
+            for name, count in list(thread_counters.levels.items()):
+                levels[name] = levels.get(name, 0) + count
+
+            for name, count in list(thread_counters.dropped.items()):
+                dropped[name] = dropped.get(name, 0) + count
+
+            for name, (records, duration) in list(thread_counters.sinks.items()):
+                entry = sinks.setdefault(name, [0, 0])
+                entry[0] += records
+                entry[1] += duration
+
+            for stage, entry in thread_counters.stages.items():
+                merged = stages[stage]
+                merged[0] += entry[0]
+                merged[1] += entry[1]
+                merged[2] = max(merged[2], entry[2])
+                for bucket in range(BUCKETS):
+                    merged[3 + bucket] += entry[3 + bucket]
+
+        return {
+            "since": cls._since,
+            "levels": levels,
+            "dropped": dropped,
+            "sinks": {name: {"records": records, "time_ns": duration} for name, (records, duration) in sinks.items()},
+            "stages": {stage: cls._summarize(entry) for stage, entry in stages.items()}
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Resets the statistics of every thread
+        """
+        with cls._counters_lock:
+            cls._counters = []
+            cls._since = time.time()
+
+        # The threads register new counters on their next record
+        cls._local = threading.local()
+
+    @classmethod
+    def reset_after_fork(cls) -> None:
+        "Reinitializes the lock in a forked process, another thread could have held it"
+        cls._counters_lock = threading.Lock()
+
+    @classmethod
+    def _summarize(cls, entry: list[int]) -> dict:
+        """
+        Turns the counters of a stage into a readable form
+
+        Parameters:
+            entry (list[int]): count, total time, max time, then the histogram
+
+        Returns:
+            dict - count, total, mean and max time in nanoseconds, and the histogram per upper bound in nanoseconds
+        """
+        count, total, maximum = entry[:3]
+        return {
+            "count": count,
+            "total_ns": total,
+            "mean_ns": total / count if count else 0.0,
+            "max_ns": maximum,
+            "histogram": {2 ** bucket: amount for bucket, amount in enumerate(entry[3:]) if amount}
+        }
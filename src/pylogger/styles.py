@@ -7,11 +7,25 @@ Styles definitions for the formatting
 These get applied in the formatting of the log messages
 ----------------
 You can override these values and customize the styling of the formatting
+The formatting templates get compiled again automatically when overriding them
+If you modify a color in place instead, call 'Formatting.recompile()'
 """
 
 
+
+class StylesMeta(type):
+    """Keeps track of the overrides of the styles, so that the templates get compiled again"""
+
+    # Bumped on every override
+    version: int = 0
+
+    def __setattr__(cls, name, value) -> None:
+        super().__setattr__(name, value)
+        StylesMeta.version += 1
+
+
 "Separators for the formatting of the log messages"
-class Separators:
+class Separators(metaclass=StylesMeta):
     prefix_time = " || "
 
     time_date = " ~ "
@@ -23,7 +37,7 @@ class Separators:
 
 
 "Formatting colors"
-class FormatColors:
+class FormatColors(metaclass=StylesMeta):
     time = ColorCombo(fg=Colors.slate_blue)
     date = ColorCombo(fg=Colors.slate_blue)
     path = ColorCombo(fg=Colors.royal_blue)
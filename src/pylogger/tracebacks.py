@@ -0,0 +1,155 @@
+import traceback
+import zlib
+from types import CodeType, TracebackType
+from typing import Optional
+
+from .config import Config
+
+
+
+"""
+Rendering of the exceptions logged with 'Logger.exception' or 'exc_info'
+----------------
+The exceptions are captured as objects, and only rendered when a sink writes their record
+The formatted frames are cached per traceback fingerprint (the code and line of each frame),
+so that an exception raised again from the same place is not formatted again
+With 'Config.set_exception_fingerprints', only the first occurrence of a fingerprint is rendered in full,
+the next ones as a single line referencing it
+"""
+
+
+
+# Maximum amount of cached tracebacks, the cache is cleared once reached
+MAX_CACHED = 1024
+
+CAUSE = "\nThe above exception was the direct cause of the following exception:\n\n"
+CONTEXT = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+
+
+class Tracebacks:
+    # Formatted frames, and the fingerprint, per traceback key
+    _cache: dict[tuple, tuple[str, str]] = {}
+
+    # Fingerprints already rendered in full
+    _seen: set[str] = set()
+
+    @classmethod
+    def render(cls, exception: BaseException) -> str:
+        """
+        Renders an exception with its traceback and its chained exceptions, like 'traceback.format_exception'
+        Or as a single line, if fingerprints are enabled and it was already rendered in full
+
+        Parameters:
+            exception (BaseException): the exception
+
+        Returns:
+            str - the rendered exception, without trailing line break
+        """
+        chain = cls._chain(exception)
+
+        if Config.EXCEPTION_FINGERPRINTS:
+            fingerprint = cls.fingerprint(exception)
+            if fingerprint in cls._seen:
+                return f"{cls._format_only(exception)} [traceback {fingerprint}, already logged]"
+            cls._seen.add(fingerprint)
+
+        parts = []
+        for chained, separator in chain:
+            if separator:
+                parts.append(separator)
+            frames, _ = cls._frames(chained)
+            if frames:
+                parts.append("Traceback (most recent call last):\n" + frames)
+            parts.append(cls._format_only(chained) + "\n")
+
+        text = "".join(parts).rstrip("\n")
+        if Config.EXCEPTION_FINGERPRINTS:
+            text += f" [traceback {fingerprint}]"
+        return text
+
+    @classmethod
+    def fingerprint(cls, exception: BaseException) -> str:
+        """
+        Returns the fingerprint of an exception: its type and the frames of its traceback, and of its chained exceptions
+
+        Parameters:
+            exception (BaseException): the exception
+
+        Returns:
+            str - the fingerprint, 8 hexadecimal digits
+        """
+        checksum = 0
+        for chained, _ in cls._chain(exception):
+            checksum = zlib.crc32(cls._frames(chained)[1].encode(), checksum)
+        return f"{checksum:08x}"
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Clears the cache, and forgets the fingerprints already rendered
+        """
+        cls._cache = {}
+        cls._seen = set()
+
+    "Helpers"
+
+    @classmethod
+    def _frames(cls, exception: BaseException) -> tuple[str, str]:
+        """
+        Returns the formatted frames of the traceback of an exception, from the cache if possible
+
+        Returns:
+            tuple[str, str] - the formatted frames, and the text the fingerprint is computed from
+        """
+        exception_type = type(exception)
+        key: list[tuple[CodeType, Optional[int]] | type] = [exception_type]
+        tb: Optional[TracebackType] = exception.__traceback__
+        while tb is not None:
+            key.append((tb.tb_frame.f_code, tb.tb_lineno))
+            tb = tb.tb_next
+
+        cache_key = tuple(key)
+        cached = cls._cache.get(cache_key)
+        if cached is None:
+            if len(cls._cache) >= MAX_CACHED:
+                cls._cache = {}
+
+            summary = traceback.extract_tb(exception.__traceback__)
+            frames = "".join(summary.format())
+            identity = f"{exception_type.__module__}.{exception_type.__qualname__}:" \
+                + ";".join(f"{frame.filename}:{frame.name}:{frame.lineno}" for frame in summary)
+            cached = cls._cache[cache_key] = (frames, identity)
+        return cached
+
+    @staticmethod
+    def _format_only(exception: BaseException) -> str:
+        return "".join(traceback.format_exception_only(type(exception), exception)).rstrip("\n")
+
+    @staticmethod
+    def _chain(exception: BaseException) -> list[tuple[BaseException, Optional[str]]]:
+        """
+        Returns the chained exceptions, the oldest first, like 'traceback.format_exception'
+
+        Returns:
+            list[tuple[BaseException, Optional[str]]] - each exception, with the separator before it
+        """
+        chain: list[tuple[BaseException, Optional[str]]] = []
+        seen: set[int] = set()
+
+        current: Optional[BaseException] = exception
+        separator: Optional[str] = None
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            chain.append((current, separator))
+
+            if current.__cause__ is not None:
+                current, separator = current.__cause__, CAUSE
+            elif current.__context__ is not None and not current.__suppress_context__:
+                current, separator = current.__context__, CONTEXT
+            else:
+                current = None
+
+        # The separator goes before the next exception, in the oldest first order
+        chain.reverse()
+        return [(chained, chain[index - 1][1] if index else None) for index, (chained, _) in enumerate(chain)]
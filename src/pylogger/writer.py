@@ -0,0 +1,117 @@
+import queue
+import sys
+import threading
+import traceback
+from typing import Any, Callable
+
+
+
+"""
+Background writer
+----------------
+Used by the logger in async mode: the logging calls only enqueue their records,
+and a dedicated thread drains the queue in batches and hands them to a handler
+"""
+
+
+
+# Marker put in the queue to stop the writer thread
+_STOP = object()
+
+
+
+class BackgroundWriter:
+    # Maximum amount of records handed to the handler at once
+    BATCH_SIZE: int = 1024
+
+    def __init__(self, handler: Callable[[list[Any]], None], name: str = "pylogger-writer") -> None:
+        """
+        Parameters:
+            handler (Callable[[list[Any]], None]): the function writing a batch of records
+            name (str): the name of the writer thread
+        """
+        self.handler = handler
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item: Any) -> None:
+        """
+        Enqueues a record, it will be written by the writer thread
+
+        Parameters:
+            item (Any): the record to enqueue
+        """
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """
+        Blocks until every enqueued record has been written
+        """
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self) -> None:
+        """
+        Writes the remaining records and stops the writer thread
+        """
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+        # Records enqueued by other threads after the stop marker
+        leftovers = self._drain()
+        if leftovers:
+            self._handle([item for item in leftovers if item is not _STOP])
+
+    def _drain(self, limit: int | None = None) -> list[Any]:
+        """
+        Gets the records already waiting in the queue, without blocking
+
+        Parameters:
+            limit (int | None): the maximum amount of records to get
+
+        Returns:
+            list[Any] - the records
+        """
+        items = []
+        try:
+            while limit is None or len(items) < limit:
+                items.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def _handle(self, batch: list[Any]) -> None:
+        """
+        Passes the batch to the handler, without letting an error kill the writer thread
+
+        Parameters:
+            batch (list[Any]): the records to write
+        """
+        try:
+            if batch:
+                self.handler(batch)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+    def _run(self) -> None:
+        """
+        Writer thread loop
+        Waits for a record, then takes everything else already waiting as the same batch
+        """
+        while True:
+            batch = [self._queue.get()]
+            batch += self._drain(limit=self.BATCH_SIZE - 1)
+
+            records = [item for item in batch if item is not _STOP]
+            try:
+                self._handle(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            # The stop marker was part of this batch
+            if len(records) != len(batch):
+                return
@@ -0,0 +1,81 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import Config
+from pylogger.aio import AsyncLogger, get_loop_writer
+from pylogger.record import LogRecord
+from pylogger.sinks import Sink
+
+
+
+"""
+Regression checks of the asyncio loggers
+----------------
+Run with: python -m pytest tests, or python tests/test_aio.py
+"""
+
+
+
+class ListSink(Sink):
+    "Keeps the messages of the records"
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def emit(self, record: LogRecord) -> None:
+        self.messages.append(record.get_message())
+
+
+def run_with_sink(main) -> list[str]:
+    "Runs the coroutine function in a new loop, passing it the sink the records get written to"
+    sink = ListSink()
+    Config.add_sink(sink)
+    try:
+        asyncio.run(main(sink))
+    finally:
+        Config.remove_sink(sink)
+    return sink.messages
+
+
+def test_aflush_waits_for_the_writer_task() -> None:
+    async def main(sink: ListSink) -> None:
+        for index in range(10):
+            AsyncLogger.info("record %d", index)
+        await AsyncLogger.aflush()
+        assert len(sink.messages) == 10
+
+    run_with_sink(main)
+
+
+def test_flush_writes_the_enqueued_records_right_away() -> None:
+    async def main(sink: ListSink) -> None:
+        for index in range(10):
+            AsyncLogger.info("record %d", index)
+        AsyncLogger.flush()
+        assert len(sink.messages) == 10
+
+    assert run_with_sink(main) == [f"record {index}" for index in range(10)]
+
+
+def test_batch_cancelled_before_running_is_still_written() -> None:
+    async def main(sink: ListSink) -> None:
+        writer = get_loop_writer()
+        # Keeps the thread of the writer busy, so that the next batch is still waiting when the loop closes
+        writer._executor.submit(time.sleep, 0.2)
+
+        AsyncLogger.info("first")
+        await asyncio.sleep(0)
+        AsyncLogger.info("second")
+
+    assert run_with_sink(main) == ["first", "second"]
+
+
+if __name__ == "__main__":
+    test_aflush_waits_for_the_writer_task()
+    test_flush_writes_the_enqueued_records_right_away()
+    test_batch_cancelled_before_running_is_still_written()
+    print("ok")
@@ -0,0 +1,67 @@
+import sys
+import threading
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import Logger, Config
+from pylogger.record import LogRecord
+from pylogger.sinks import Sink
+from pylogger.tracebacks import Tracebacks
+
+
+
+"""
+Regression checks of the async mode, where a background thread writes the records
+----------------
+Run with: python -m pytest tests, or python tests/test_async_mode.py
+"""
+
+
+
+class ListSink(Sink):
+    "Keeps the messages of the records"
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def emit(self, record: LogRecord) -> None:
+        self.messages.append(record.get_message())
+
+
+def test_message_built_on_the_caller_and_traceback_rendered_by_the_writer() -> None:
+    sink = ListSink()
+    Config.add_sink(sink)
+    Config.set_async(True)
+
+    render = Tracebacks.render
+    threads = []
+
+    def tracked(exception: BaseException) -> str:
+        threads.append(threading.current_thread())
+        return render(exception)
+
+    try:
+        values = ["before"]
+        with mock.patch.object(Tracebacks, "render", side_effect=tracked):
+            try:
+                raise ValueError("failed")
+            except ValueError:
+                Logger.error("value: %s", values, exc_info=True)
+            # Changed after the call, the message keeps the value it was logged with
+            values[0] = "after"
+            Logger.flush()
+    finally:
+        Config.set_async(False)
+        Logger.flush()
+        Config.remove_sink(sink)
+
+    assert sink.messages[0].startswith("value: ['before']\n")
+    assert "ValueError: failed" in sink.messages[0]
+    assert threads and threads[0] is not threading.current_thread()
+
+
+if __name__ == "__main__":
+    test_message_built_on_the_caller_and_traceback_rendered_by_the_writer()
+    print("ok")
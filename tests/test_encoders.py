@@ -0,0 +1,115 @@
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import reader
+from pylogger.colors import ColorCombo, Colors
+from pylogger.context import Fields
+from pylogger.encoders import FileFormats
+from pylogger.levels import LevelModel, Levels
+from pylogger.record import LogRecord
+from pylogger.sinks import FileSink
+
+
+
+"""
+Regression checks of the log file formats, written by a file sink and read back
+----------------
+Run with: python -m pytest tests, or python tests/test_encoders.py
+"""
+
+
+
+NOTICE = LevelModel(name="NOTICE", color=ColorCombo(fg=Colors.blue), value=1)
+
+
+def records() -> list[LogRecord]:
+    return [
+        LogRecord(message="hello %s", args=("world",), level=Levels.INFO, time=1741531996.25, path="app/main.py", lineno=12),
+        LogRecord(message="déjà vu\nsecond line", level=Levels.ERROR, prefix="db", time=1741531997.5, path="app/db.py", lineno=None),
+        LogRecord(message="custom", level=NOTICE, time=1741531998.0, path="app/main.py", lineno=40, fields=Fields({"user": "ana", "id": 7}))
+    ]
+
+
+def write_and_read(file_format: str, path: Path) -> list[LogRecord]:
+    sink = FileSink(path, file_format=file_format)
+    sink.emit_many(records())
+    sink.close()
+    return list(reader.read(path))
+
+
+def check_round_trip(read: list[LogRecord], fields: dict) -> None:
+    assert [record.get_message() for record in read] == ["hello world", "déjà vu\nsecond line", "custom"]
+    assert [(record.level.name, record.level.value) for record in read] == [("INFO", 1), ("ERROR", 3), ("NOTICE", 1)]
+    assert read[0].level is Levels.INFO
+    assert [record.prefix for record in read] == [None, "db", None]
+    assert [(record.path, record.lineno) for record in read] == [("app/main.py", 12), ("app/db.py", None), ("app/main.py", 40)]
+    assert [record.time for record in read] == [1741531996.25, 1741531997.5, 1741531998.0]
+    assert read[0].fields is None and read[2].fields.values == fields
+
+
+def test_json_round_trip() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        check_round_trip(write_and_read(FileFormats.JSON, path), {"user": "ana", "id": 7})
+        assert reader.detect_format(path) == FileFormats.JSON
+
+
+def test_binary_round_trip() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        # The values of the fields are kept as strings
+        check_round_trip(write_and_read(FileFormats.BINARY, path), {"user": "ana", "id": "7"})
+        assert reader.detect_format(path) == FileFormats.BINARY
+
+
+def test_binary_string_table_starts_over() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        sink = FileSink(path, file_format=FileFormats.BINARY)
+        sink.encoder.MAX_STRINGS = 4
+
+        # A new path per record, the table fills up and starts over with a new header
+        for index in range(10):
+            sink.emit(LogRecord(message=f"record {index}", level=Levels.INFO, time=float(index), path=f"module{index}.py", lineno=index))
+        sink.close()
+
+        read = list(reader.read(path))
+    assert [(record.path, record.get_message()) for record in read] == [(f"module{index}.py", f"record {index}") for index in range(10)]
+
+
+def test_binary_file_reopened_gets_a_new_header() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        for message in ("first", "second"):
+            sink = FileSink(path, file_format=FileFormats.BINARY)
+            sink.emit(LogRecord(message=message, level=Levels.INFO, path="app/main.py", lineno=1))
+            sink.close()
+
+        assert [record.get_message() for record in reader.read(path)] == ["first", "second"]
+
+
+def test_convert_to_text() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        destination = Path(directory) / "app.txt"
+        write_and_read(FileFormats.BINARY, path)
+
+        # One per record, the message spanning two lines is followed by its continuation line
+        assert reader.convert(path, destination) == 3
+        lines = destination.read_text().splitlines()
+        assert lines[0].endswith("INFO >>> hello world")
+        assert lines[1].startswith("db || ") and lines[1].endswith("ERROR >>> déjà vu")
+        assert lines[2] == "second line"
+        assert reader.detect_format(destination) == FileFormats.TEXT
+
+
+if __name__ == "__main__":
+    test_json_round_trip()
+    test_binary_round_trip()
+    test_binary_string_table_starts_over()
+    test_binary_file_reopened_gets_a_new_header()
+    test_convert_to_text()
+    print("ok")
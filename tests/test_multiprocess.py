@@ -0,0 +1,55 @@
+import multiprocessing
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import Logger, Config, PrefixLogger
+
+
+
+"""
+Regression checks of the multiprocess mode
+----------------
+Run with: python -m pytest tests, or python tests/test_multiprocess.py
+"""
+
+
+
+RECORDS = 100
+
+
+def work(index: int, prefix_file: str) -> int:
+    for line in range(RECORDS):
+        Logger.info("worker %d line %d", index, line)
+    PrefixLogger("worker", log_file=prefix_file).warning("worker %d done", index)
+    return index
+
+
+def test_spawned_workers_write_to_the_log_file_of_the_main_process() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = Path(directory) / "app.log"
+        prefix_file = Path(directory) / "worker.log"
+
+        # Set in the main process only, the spawned workers never run this
+        Config.set_log_file(log_file)
+        context = multiprocessing.get_context("spawn")
+        Config.set_multiprocess(True, context=context)
+        try:
+            with ProcessPoolExecutor(2, mp_context=context, initializer=Logger.init_worker, initargs=(Logger.process_queue(),)) as executor:
+                list(executor.map(work, range(4), [str(prefix_file)] * 4))
+            Logger.shutdown()
+        finally:
+            Config.set_multiprocess(False)
+            Config.LOG_FILE = None
+
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 4 * (RECORDS + 1)
+        assert len(prefix_file.read_text().splitlines()) == 4
+
+
+if __name__ == "__main__":
+    test_spawned_workers_write_to_the_log_file_of_the_main_process()
+    print("ok")
@@ -0,0 +1,242 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger.encoders import FileFormats
+from pylogger.levels import Levels
+from pylogger.network import Protocols, SocketSink
+from pylogger.record import LogRecord
+
+
+
+"""
+Regression checks of the network sink, against local servers standing in for a collector
+----------------
+Run with: python -m pytest tests, or python tests/test_network.py
+"""
+
+
+
+def record(message: str) -> LogRecord:
+    return LogRecord(message=message, level=Levels.WARNING, time=time.time(), path="test_network.py", lineno=1)
+
+
+def receive_datagrams(server: socket.socket) -> list[bytes]:
+    "Reads the datagrams until none arrive for a while"
+    datagrams = []
+    server.settimeout(0.5)
+    try:
+        while True:
+            datagrams.append(server.recv(65536))
+    except socket.timeout:
+        pass
+    return datagrams
+
+
+class StreamServer:
+    "Accepts the connections on a TCP port or a Unix socket, and keeps the bytes received on each"
+
+    def __init__(self, family: int = socket.AF_INET, address: str | tuple[str, int] = ("127.0.0.1", 0)) -> None:
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(address)
+        self.socket.listen()
+        self.address = self.socket.getsockname()
+        self.connections: list[bytearray] = []
+        self._accepted: list[socket.socket] = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                return
+            received = bytearray()
+            self.connections.append(received)
+            self._accepted.append(connection)
+            threading.Thread(target=self._read, args=(connection, received), daemon=True).start()
+
+    @staticmethod
+    def _read(connection: socket.socket, received: bytearray) -> None:
+        with connection:
+            while data := connection.recv(65536):
+                received += data
+
+    def wait_for(self, lines: int, timeout: float = 5.0) -> bytes:
+        "Waits until at least 'lines' line breaks were received over every connection"
+        deadline = time.monotonic() + timeout
+        while b"".join(self.connections).count(b"\n") < lines and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return b"".join(self.connections)
+
+    def drop(self) -> None:
+        "Closes the accepted connections, as a restarting collector would"
+        for connection in self._accepted:
+            connection.shutdown(socket.SHUT_RDWR)
+        self._accepted.clear()
+        self.connections.clear()
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+def test_udp_packs_whole_records_into_datagrams() -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+        server.bind(("127.0.0.1", 0))
+        sink = SocketSink(server.getsockname(), Protocols.UDP, file_format=FileFormats.JSON, datagram_size=1024)
+        sink.emit_many([record(f"udp {index}") for index in range(100)])
+        sink.close()
+
+        datagrams = receive_datagrams(server)
+
+    # Fewer datagrams than records, each holding whole lines
+    assert 1 < len(datagrams) < 100
+    assert all(len(datagram) <= 1024 and datagram.endswith(b"\n") for datagram in datagrams)
+    messages = [json.loads(line)["message"] for datagram in datagrams for line in datagram.splitlines()]
+    assert messages == [f"udp {index}" for index in range(100)]
+    assert sink.sent == 100 and sink.dropped == 0
+
+
+def test_syslog_over_udp_sends_one_message_per_datagram() -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+        server.bind(("127.0.0.1", 0))
+        sink = SocketSink(server.getsockname(), Protocols.UDP, file_format=FileFormats.JSON, facility=16, ident="app")
+        for index in range(5):
+            sink.emit(record(f"syslog {index}"))
+        sink.close()
+
+        datagrams = receive_datagrams(server)
+
+    # local0 (16) and warning (4): 16 * 8 + 4
+    assert len(datagrams) == 5
+    assert all(datagram.startswith(b"<132>app: {") and not datagram.endswith(b"\n") for datagram in datagrams)
+    assert [json.loads(datagram[len(b"<132>app: "):])["message"] for datagram in datagrams] == [f"syslog {index}" for index in range(5)]
+
+
+def test_syslog_over_tcp_uses_octet_counting() -> None:
+    server = StreamServer()
+    try:
+        sink = SocketSink(server.address, Protocols.TCP, file_format=FileFormats.JSON, facility=1)
+        sink.emit_many([record("first"), record("second\nline")])
+        sink.close()
+        # Without line breaks between the messages
+        time.sleep(0.2)
+        data = b"".join(server.connections)
+    finally:
+        server.close()
+
+    # Each message preceded by its length and a space, the line break inside the message doesn't split it
+    messages = []
+    while data:
+        length, _, rest = data.partition(b" ")
+        messages.append(rest[:int(length)])
+        data = rest[int(length):]
+    assert [json.loads(message[len(b"<12>"):])["message"] for message in messages] == ["first", "second\nline"]
+
+
+def test_unix_stream_ends_each_record_with_a_line_break() -> None:
+    # Unix domain sockets only
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "collector.sock")
+        server = StreamServer(socket.AF_UNIX, path)
+        try:
+            sink = SocketSink(path, Protocols.UNIX, file_format=FileFormats.JSON)
+            for index in range(20):
+                sink.emit(record(f"unix {index}"))
+            sink.close()
+            data = server.wait_for(20)
+        finally:
+            server.close()
+
+    assert [json.loads(line)["message"] for line in data.splitlines()] == [f"unix {index}" for index in range(20)]
+
+
+def test_tcp_reconnects_with_backoff_and_sends_the_spilled_records() -> None:
+    # A free port, the collector starts later
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        address = probe.getsockname()
+
+    sink = SocketSink(address, Protocols.TCP, file_format=FileFormats.JSON, backoff=0.05, max_backoff=0.2)
+    for index in range(10):
+        sink.emit(record(f"spilled {index}"))
+
+    # Down: the records are kept, and the delay before reconnecting grows
+    sink.flush()
+    deadline = time.monotonic() + 5
+    while sink._delay < 0.2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sink._delay == 0.2
+    assert len(sink._pending) == 10 and sink.sent == 0
+
+    server = StreamServer(address=address)
+    try:
+        data = server.wait_for(10)
+        sink.close()
+    finally:
+        server.close()
+
+    assert [json.loads(line)["message"] for line in data.splitlines()] == [f"spilled {index}" for index in range(10)]
+    assert sink.sent == 10 and sink.dropped == 0
+    assert sink._delay == sink.backoff
+
+
+def test_tcp_reconnects_after_the_collector_closed_the_connection() -> None:
+    server = StreamServer()
+    try:
+        sink = SocketSink(server.address, Protocols.TCP, file_format=FileFormats.JSON, backoff=0.01)
+        sink.emit(record("before"))
+        sink.flush()
+        server.wait_for(1)
+
+        # The collector drops the connection, the first write afterwards must not be lost
+        server.drop()
+        time.sleep(0.1)
+
+        sink.emit(record("after"))
+        sink.flush()
+        data = server.wait_for(1)
+        sink.close()
+    finally:
+        server.close()
+
+    assert [json.loads(line)["message"] for line in data.splitlines()] == ["after"]
+
+
+def test_spill_buffer_drops_the_oldest_records() -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        address = probe.getsockname()
+
+    sink = SocketSink(address, Protocols.TCP, file_format=FileFormats.JSON, spill_size=5, backoff=10, max_backoff=10)
+    for index in range(12):
+        sink.emit(record(f"record {index}"))
+    sink.flush()
+
+    assert sink.dropped == 7
+    assert [json.loads(data)["message"] for data in sink._pending] == [f"record {index}" for index in range(7, 12)]
+    sink.close()
+
+
+if __name__ == "__main__":
+    test_udp_packs_whole_records_into_datagrams()
+    test_syslog_over_udp_sends_one_message_per_datagram()
+    test_syslog_over_tcp_uses_octet_counting()
+    test_unix_stream_ends_each_record_with_a_line_break()
+    test_tcp_reconnects_with_backoff_and_sends_the_spilled_records()
+    test_tcp_reconnects_after_the_collector_closed_the_connection()
+    test_spill_buffer_drops_the_oldest_records()
+    print("ok")
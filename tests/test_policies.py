@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import Logger, Config, PrefixLogger
+from pylogger.policies import Deduplicate, RateLimit, Sample
+from pylogger.record import LogRecord
+from pylogger.sinks import Sink
+
+
+
+"""
+Regression checks of the call site policies
+----------------
+Run with: python -m pytest tests, or python tests/test_policies.py
+"""
+
+
+
+class ListSink(Sink):
+    "Keeps the messages of the records"
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def emit(self, record: LogRecord) -> None:
+        self.messages.append(record.get_message())
+
+
+def capture() -> ListSink:
+    sink = ListSink()
+    Config.add_sink(sink)
+    return sink
+
+
+def release(sink: ListSink) -> None:
+    Config.remove_sink(sink)
+    Config.set_call_site_policy(None)
+
+
+def test_sample_keeps_one_record_out_of_every_k() -> None:
+    sink = capture()
+    try:
+        Config.set_call_site_policy(Sample(3))
+        for index in range(9):
+            Logger.info("sampled %d", index)
+    finally:
+        release(sink)
+
+    assert sink.messages == ["sampled 0", "sampled 3", "sampled 6"]
+
+
+def test_rate_limit_drops_the_records_above_the_burst() -> None:
+    sink = capture()
+    try:
+        Config.set_call_site_policy(RateLimit(per_second=0.001, burst=2))
+        for index in range(5):
+            Logger.info("limited %d", index)
+    finally:
+        release(sink)
+
+    assert sink.messages == ["limited 0", "limited 1"]
+
+
+def test_deduplicate_summarizes_the_repeats() -> None:
+    sink = capture()
+    try:
+        Config.set_call_site_policy(Deduplicate())
+        for _ in range(5):
+            Logger.info("same")
+        Logger.flush()
+    finally:
+        release(sink)
+
+    assert sink.messages == ["same", "Last message repeated 4 times"]
+
+
+def test_replacing_the_policy_logs_its_pending_repeats() -> None:
+    sink = capture()
+    try:
+        Config.set_call_site_policy(Deduplicate())
+        for _ in range(5):
+            Logger.info("same")
+        Config.set_call_site_policy(Sample(3))
+        Logger.flush()
+    finally:
+        release(sink)
+
+    assert sink.messages == ["same", "Last message repeated 4 times"]
+
+
+def test_replacing_the_policy_of_a_prefix_logger_logs_its_pending_repeats() -> None:
+    sink = capture()
+    try:
+        logger = PrefixLogger("test", policy=Deduplicate())
+        for _ in range(3):
+            logger.info("same")
+        logger.policy = None
+    finally:
+        release(sink)
+
+    assert sink.messages == ["same", "Last message repeated 2 times"]
+
+
+if __name__ == "__main__":
+    test_sample_keeps_one_record_out_of_every_k()
+    test_rate_limit_drops_the_records_above_the_burst()
+    test_deduplicate_summarizes_the_repeats()
+    test_replacing_the_policy_logs_its_pending_repeats()
+    test_replacing_the_policy_of_a_prefix_logger_logs_its_pending_repeats()
+    print("ok")
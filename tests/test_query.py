@@ -0,0 +1,100 @@
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger.levels import Levels
+from pylogger.query import INDEX_SUFFIX, LogIndex, query
+from pylogger.record import LogRecord
+from pylogger.sinks import FileSink
+
+
+
+"""
+Regression checks of the indexed queries on the text log files
+----------------
+Run with: python -m pytest tests, or python tests/test_query.py
+"""
+
+
+
+START = datetime(2025, 3, 9, 15, 0, 0)
+LEVELS = (Levels.INFO, Levels.WARNING, Levels.ERROR)
+PATHS = ("app/db.py", "app/web.py")
+
+
+def write(path: Path, first: int, count: int) -> None:
+    "Writes a record every 30 seconds from START, cycling through the levels and the paths"
+    sink = FileSink(path)
+    sink.emit_many([
+        LogRecord(
+            message=f"record {index}" + ("\ncontinuation" if index == 5 else ""),
+            level=LEVELS[index % 3], time=(START + timedelta(seconds=30 * index)).timestamp(),
+            path=PATHS[index % 2], lineno=index
+        )
+        for index in range(first, first + count)
+    ])
+    sink.close()
+
+
+def expected(indexes) -> list[str]:
+    return [f"record {index}" + ("\ncontinuation" if index == 5 else "") for index in indexes]
+
+
+def messages(results) -> list[str]:
+    return [result.decode().split(">>> ", 1)[1].rstrip("\n") for result in results]
+
+
+def test_filters() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        write(path, 0, 20)
+
+        assert len(messages(query(path))) == 20
+
+        # From 15:02:00 to 15:04:30 included
+        since = START + timedelta(minutes=2)
+        until = START + timedelta(minutes=4, seconds=30)
+        assert messages(query(path, since=since, until=until)) == expected(range(4, 10))
+
+        assert messages(query(path, level=Levels.ERROR)) == expected(range(2, 20, 3))
+        assert messages(query(path, level="WARNING", paths=["app/db*"])) == expected(index for index in range(20) if index % 2 == 0 and index % 3)
+        assert messages(query(path, paths=["nothing.py"])) == []
+
+
+def test_index_is_updated_with_the_new_records() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        write(path, 0, 10)
+        assert len(messages(query(path))) == 10
+
+        index_path = path.with_name(path.name + INDEX_SUFFIX)
+        assert index_path.exists()
+        indexed = LogIndex.open(path)
+        assert indexed.size == path.stat().st_size and len(indexed.blocks) == 5
+
+        # Appended afterwards, only the new records get indexed
+        write(path, 10, 10)
+        assert messages(query(path, since=START + timedelta(minutes=5))) == expected(range(10, 20))
+        assert len(LogIndex.open(path).blocks) == 10
+
+
+def test_index_is_rebuilt_when_the_file_gets_replaced() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        write(path, 0, 20)
+        assert len(messages(query(path))) == 20
+
+        # Rotated: a new, shorter file with the same name
+        path.unlink()
+        write(path, 100, 2)
+        assert messages(query(path)) == ["record 100", "record 101"]
+
+
+if __name__ == "__main__":
+    test_filters()
+    test_index_is_updated_with_the_new_records()
+    test_index_is_rebuilt_when_the_file_gets_replaced()
+    print("ok")
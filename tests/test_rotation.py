@@ -0,0 +1,81 @@
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pylogger import reader
+from pylogger.encoders import FileFormats
+from pylogger.format import Formatting
+from pylogger.levels import Levels
+from pylogger.rotation import Compressor, RotationPolicy
+from pylogger.sinks import FileSink
+
+
+
+"""
+Regression checks of the rotation of the log files
+----------------
+Run with: python -m pytest tests, or python tests/test_rotation.py
+"""
+
+
+
+def test_segments_rotated_within_a_second_are_ordered_by_count() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        policy = RotationPolicy(max_bytes=1, keep=2, compress=False)
+
+        # More than 10 segments within the same second, '-10' and above must come after '-9'
+        created = []
+        for index in range(15):
+            segment = policy.segment_path(path)
+            segment.write_text(str(index))
+            created.append(segment)
+
+        segments = Compressor.segments(path)
+        assert [segment.read_text() for segment in segments] == [str(index) for index in range(15)]
+
+        # The newest ones are kept
+        Compressor._prune(path, keep=2)
+        assert [segment.read_text() for segment in Compressor.segments(path)] == ["13", "14"]
+
+
+def test_text_files_rotate_on_their_size_in_bytes() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        sink = FileSink(path, rotation=RotationPolicy.by_size(2000, keep=None, compress=False))
+
+        # Multi-byte characters, twice as large as their length once encoded
+        for _ in range(50):
+            sink.emit(Formatting.create_record(message="é" * 50, level=Levels.INFO))
+        sink.close()
+
+        files = [path] + Compressor.segments(path)
+        assert len(files) > 1
+        assert all(file.stat().st_size <= 2000 for file in files)
+
+
+def test_binary_records_are_encoded_for_the_file_they_are_written_to() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        sink = FileSink(path, file_format=FileFormats.BINARY, rotation=RotationPolicy.hourly(keep=None, compress=False))
+        sink.emit(Formatting.create_record(message="before", level=Levels.INFO))
+
+        # The rollover time passes while the second record is being written
+        record = Formatting.create_record(message="after", level=Levels.INFO)
+        times = iter([sink._rollover_at - 1, sink._rollover_at + 1])
+        with mock.patch("time.time", side_effect=lambda: next(times, sink._rollover_at + 1)):
+            sink.emit(record)
+        sink.close()
+
+        messages = [record.message for file in Compressor.segments(path) + [path] for record in reader.read(file)]
+        assert messages == ["before", "after"]
+
+
+if __name__ == "__main__":
+    test_segments_rotated_within_a_second_are_ordered_by_count()
+    test_text_files_rotate_on_their_size_in_bytes()
+    test_binary_records_are_encoded_for_the_file_they_are_written_to()
+    print("ok")